@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+# 根目录的 conftest 使 pytest 把项目根目录加入 sys.path, 测试中可以直接 import src
@@ -4,6 +4,8 @@ import sys
 
 from loguru import logger
 
+# 启动追踪需要在其他模块之前导入
+from src.Core.StartupTracer import tracer
 from src.Core import stdout
 
 NAPCATQQ_DESKTOP_LOGO = r"""
@@ -16,35 +18,57 @@ NAPCATQQ_DESKTOP_LOGO = r"""
 
 if __name__ == "__main__":
     # 调整程序 log 输出
-    stdout()
+    with tracer.phase("stdout"):
+        stdout()
     # 检查是否以管理员模式启动, 非管理员模式尝试获取管理员权限
     if not ctypes.windll.shell32.IsUserAnAdmin():
         logger.warning("非管理员模式启动, 尝试获取管理员权限")
         ctypes.windll.shell32.ShellExecuteW(None, "runas", sys.executable, " ".join(sys.argv), None, 1)
 
     # 启动主程序
-    from src.Core.Config import cfg
-    from src.Ui.MainWindow import MainWindow
+    with tracer.phase("import src.Core.Config"):
+        from src.Core.Config import cfg
+    with tracer.phase("import src.Ui.MainWindow"):
+        from src.Ui.MainWindow import MainWindow
     from qfluentwidgets import FluentTranslator
     from PySide6.QtCore import QTranslator, QLocale
     from PySide6.QtWidgets import QApplication
     from creart import it
+    from src.Ui.ResourceBundle import ResourceBundle
     from loguru import logger
 
     logger.opt(colors=True).info(f"<blue>{NAPCATQQ_DESKTOP_LOGO}</>")
     # 创建app实例
-    app = QApplication(sys.argv)
+    with tracer.phase("QApplication"):
+        app = QApplication(sys.argv)
+    # 退出前写入尚未保存的配置
+    app.aboutToQuit.connect(cfg.flush)
+
+    # 注册启动所需的资源包
+    with tracer.phase("register resources"):
+        ResourceBundle.CORE.register()
 
     # 加载翻译文件
-    locale: QLocale = cfg.get(cfg.language).value
-    translator = FluentTranslator(locale)
-    NCDTranslator = QTranslator()
-    NCDTranslator.load(locale, f":i18n/i18n/translation.{locale.name()}.qm")
-    app.installTranslator(translator)
-    app.installTranslator(NCDTranslator)
+    with tracer.phase("load translators"):
+        locale: QLocale = cfg.get(cfg.language).value
+        translator = FluentTranslator(locale)
+        NCDTranslator = QTranslator()
+        NCDTranslator.load(locale, f":i18n/i18n/translation.{locale.name()}.qm")
+        app.installTranslator(translator)
+        app.installTranslator(NCDTranslator)
+
+    # 检测界面线程卡顿
+    from src.Core.StallWatchdog import StallWatchdog
+    it(StallWatchdog).start()
 
     # 显示窗体
-    it(MainWindow).initialize()
+    with tracer.phase("MainWindow.initialize"):
+        it(MainWindow).initialize()
+
+    # 初始化产物缓存, 开启分享时同时启动局域网分享服务
+    with tracer.phase("ArtifactCache"):
+        from src.Core.ArtifactCache import ArtifactCache
+        it(ArtifactCache)
 
     # 进入循环
     sys.exit(app.exec())
@@ -19,7 +19,6 @@ SOURCES += src/Core/BeginnerGuidance.py \
            src/Ui/AddPage/ConfigTopCard.py \
            src/Ui/AddPage/Connect.py \
            src/Ui/AddPage/__init__.py \
-           src/Ui/BotListPage/BotCard.py \
            src/Ui/BotListPage/BotList.py \
            src/Ui/BotListPage/BotListWidget.py \
            src/Ui/BotListPage/BotTopCard.py \
@@ -28,6 +27,7 @@ SOURCES += src/Core/BeginnerGuidance.py \
            src/Ui/BotListPage/BotWidget/BotSetupPage.py \
            src/Ui/BotListPage/BotWidget/__init__.py \
            src/Ui/common/CodeEditor.py \
+           src/Ui/common/LogHighlighter.py \
            src/Ui/common/__init__.py \
            src/Ui/common/InfoCard/BotListCard.py \
            src/Ui/common/InfoCard/SystemInfoCard.py \
@@ -59,10 +59,14 @@ SOURCES += src/Core/BeginnerGuidance.py \
            src/Ui/MainWindow/Window.py \
            src/Ui/MainWindow/__init__.py \
            src/Ui/SetupPage/Setup.py \
+           src/Ui/SetupPage/StallReportView.py \
            src/Ui/SetupPage/__init__.py
 
 # 包含的资源文件（如果需要处理 Qt 资源文件）
-RESOURCES += src/Ui/resource/resources.qrc
+RESOURCES += src/Ui/resource/core.qrc \
+             src/Ui/resource/light.qrc \
+             src/Ui/resource/dark.qrc \
+             src/Ui/resource/banner.qrc
 
 # 包含翻译文件
 TRANSLATIONS += src/Ui/resource/i18n/translation.zh_CN.ts \
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+## 下载产物缓存
+    - 下载成功的 NapCat.Shell.zip / dbghelp_x64.dll / QQ 安装包会连同 sha256 一起保存在缓存目录
+    - 可以开启局域网分享, 通过 HTTP 把缓存提供给其他 NapCat Desktop, 这样整个集群升级只需一次外网下载
+    - latest 地址的产物 (如 NapCat.Shell.zip) 文件名不带版本, 条目中同时记录版本, 使用方只接受版本一致的条目
+    - 分享的内容:
+        - GET /manifest.json  -> {文件名: {"sha256": ..., "size": ..., "version": ...}}
+        - GET /<文件名>        -> 文件内容, 响应头 X-Content-SHA256 为文件哈希
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from abc import ABC
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import unquote, urlsplit
+
+from PySide6.QtCore import QObject
+from creart import AbstractCreator, CreateTargetInfo, add_creator, exists_module, it
+from loguru import logger
+
+from src.Core.PathFunc import PathFunc
+
+
+def sha256File(path: Path, bufferSize: int = 1024 * 1024) -> str:
+    """
+    ## 计算文件的 sha256
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(bufferSize):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactCache(QObject):
+    """
+    ## 本地产物缓存, 以文件名为键, 记录 sha256、大小和版本 (未知时为 None)
+    """
+    INDEX_NAME = "index.json"
+
+    def __init__(self) -> None:
+        super().__init__()
+        from src.Core.Config import cfg
+
+        self.path = it(PathFunc).base_path / "cache" / "artifacts"
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict] = self._loadIndex()
+        self.server: Optional[ArtifactServer] = None
+
+        # 分享开关和端口修改后立即生效
+        cfg.ServeArtifacts.valueChanged.connect(self.applyConfig)
+        cfg.ArtifactServerPort.valueChanged.connect(self.applyConfig)
+        self.applyConfig()
+
+    def _loadIndex(self) -> Dict[str, Dict]:
+        """
+        ## 读取索引, 丢弃已经不存在或大小不符的条目
+        """
+        try:
+            index = json.loads((self.path / self.INDEX_NAME).read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+        return {
+            name: entry for name, entry in index.items()
+            if (self.path / name).is_file() and (self.path / name).stat().st_size == entry.get("size")
+        }
+
+    def _saveIndex(self) -> None:
+        tmp = self.path / f"{self.INDEX_NAME}.tmp"
+        tmp.write_text(json.dumps(self._index, indent=4), encoding="utf-8")
+        os.replace(tmp, self.path / self.INDEX_NAME)
+
+    def store(
+            self, file: Path, name: Optional[str] = None, sha256: Optional[str] = None, version: Optional[str] = None
+    ) -> str:
+        """
+        ## 把下载好的文件放进缓存, 返回 sha256
+            - 先复制到临时文件再替换, 分享中的旧文件不会被读到一半
+            - version: 产物的版本, 文件名相同但版本不同的产物会替换旧的条目
+        """
+        name = name or file.name
+        sha256 = sha256 or sha256File(file)
+        with self._lock:
+            entry = self._index.get(name, {})
+            if entry.get("sha256") == sha256 and entry.get("version") == version:
+                return sha256
+            if entry.get("sha256") != sha256:
+                tmp = self.path / f"{name}.tmp"
+                shutil.copyfile(file, tmp)
+                os.replace(tmp, self.path / name)
+            self._index[name] = {"sha256": sha256, "size": (self.path / name).stat().st_size, "version": version}
+            self._saveIndex()
+        logger.info(f"已缓存 {name} (版本: {version}, sha256: {sha256})")
+        return sha256
+
+    def get(self, name: str) -> Optional[Path]:
+        """
+        ## 获取缓存的文件路径, 不存在返回 None
+        """
+        with self._lock:
+            return self.path / name if name in self._index else None
+
+    def manifest(self) -> Dict[str, Dict]:
+        """
+        ## 缓存清单的副本
+        """
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._index.items()}
+
+    def applyConfig(self, *_) -> None:
+        """
+        ## 按配置启动/停止局域网分享
+        """
+        from src.Core.Config import cfg
+
+        port = cfg.get(cfg.ArtifactServerPort)
+        if self.server is not None and (not cfg.get(cfg.ServeArtifacts) or self.server.server_port != port):
+            self.server.stop()
+            self.server = None
+
+        if cfg.get(cfg.ServeArtifacts) and self.server is None:
+            try:
+                self.server = ArtifactServer(self, port)
+                self.server.start()
+            except OSError as e:
+                logger.error(f"启动产物分享服务失败, 端口 {port}: {e}")
+                self.server = None
+
+
+class ArtifactRequestHandler(BaseHTTPRequestHandler):
+    """
+    ## 只读地提供缓存中的文件和清单
+    """
+    server: "ArtifactServer"
+
+    def do_GET(self) -> None:
+        self._respond(withBody=True)
+
+    def do_HEAD(self) -> None:
+        self._respond(withBody=False)
+
+    def _respond(self, withBody: bool) -> None:
+        name = unquote(urlsplit(self.path).path).lstrip("/")
+
+        if name == "manifest.json":
+            body = json.dumps(self.server.cache.manifest()).encode("utf-8")
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if withBody:
+                self.wfile.write(body)
+            return
+
+        # 只允许访问清单中的文件名, 杜绝路径穿越
+        entry = self.server.cache.manifest().get(name)
+        if entry is None or (path := self.server.cache.get(name)) is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        try:
+            file = open(path, "rb")
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        with file:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(os.fstat(file.fileno()).st_size))
+            self.send_header("X-Content-SHA256", entry["sha256"])
+            self.send_header("ETag", f'"{entry["sha256"]}"')
+            self.end_headers()
+            if withBody:
+                shutil.copyfileobj(file, self.wfile, 1024 * 1024)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(f"产物分享 {self.address_string()} {format % args}")
+
+
+class ArtifactServer(ThreadingHTTPServer):
+    """
+    ## 局域网产物分享服务, 在后台线程中运行
+    """
+    daemon_threads = True
+
+    def __init__(self, cache: ArtifactCache, port: int) -> None:
+        super().__init__(("0.0.0.0", port), ArtifactRequestHandler)
+        self.cache = cache
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.serve_forever, name="ArtifactServer", daemon=True)
+        self._thread.start()
+        logger.info(f"产物分享服务已启动, 端口 {self.server_port}")
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        logger.info("产物分享服务已停止")
+
+
+class ArtifactCacheClassCreator(AbstractCreator, ABC):
+    # 定义类方法targets，该方法返回一个元组，元组中包含了一个CreateTargetInfo对象，
+    # 该对象描述了创建目标的相关信息，包括应用程序名称和类名。
+    targets = (CreateTargetInfo("src.Core.ArtifactCache", "ArtifactCache"),)
+
+    # 静态方法available()，用于检查模块"ArtifactCache"是否存在，返回值为布尔型。
+    @staticmethod
+    def available() -> bool:
+        return exists_module("src.Core.ArtifactCache")
+
+    # 静态方法create()，用于创建ArtifactCache类的实例，返回值为ArtifactCache对象。
+    @staticmethod
+    def create(create_type: [ArtifactCache]) -> ArtifactCache:
+        return ArtifactCache()
+
+
+add_creator(ArtifactCacheClassCreator)
@@ -7,15 +7,18 @@ import shutil
 import textwrap
 from string import Template
 
-import httpx
-import psutil
 from PySide6.QtCore import QObject, QThread, Signal
 from creart import it
 from loguru import logger
 
-from src.Core.NetworkFunc import Urls
+from src.Core.LazyImport import lazyImport
+from src.Core.NetworkFunc import Urls, downloadArtifact
 from src.Core.PathFunc import PathFunc
 
+# 只在修补 QQ 时才需要, 延迟到第一次使用时导入
+httpx = lazyImport("httpx")
+psutil = lazyImport("psutil")
+
 
 class BootWayUtils(QObject):
 
@@ -34,7 +37,7 @@ class BootWayUtils(QObject):
             "const hasNapcatParam = process.argv.includes('--enable-logging');\n"
             "if (hasNapcatParam) {\n"
             "    (async () => {\n"
-            "        await import('$NapCatPath');\n"
+            "        await import(process.env.NCD_NAPCAT_MAIN || '$NapCatPath');\n"
             "    })();\n"
             "} else {\n"
             "    require('./launcher.node').load('external_index', module);\n"
@@ -56,7 +59,7 @@ class BootWayUtils(QObject):
         template = Template(
             "// Generated by NapCat Desktop BootWay05\n"
             "(async () => {\n"
-            f"    await import('$NapCatPath');\n);"
+            "    await import(process.env.NCD_NAPCAT_MAIN || '$NapCatPath');\n"
             "})();"
         )
         path = "file://{}".format(str(it(PathFunc).getNapCatPath() / 'napcat.mjs').replace('\\', '//'))
@@ -118,9 +121,12 @@ class Way03(QThread):
 
             # 下载修补文件 DLLHijackMethod
             # 仓库地址: https://github.com/LiteLoaderQQNT/QQNTFileVerifyPatch/
-            with open(str(it(PathFunc).getQQPath() / "dbghelp.dll"), "wb") as f:
-                f.write(httpx.get(Urls.QQ_FIX_64.value.url()).content)
-                logger.info(f"下载并写入 dbghelp.dll 成功")
+            # 优先从局域网镜像获取, 下载后写入 QQ 目录
+            dllPath = it(PathFunc).tmp_path / Urls.QQ_FIX_64.value.fileName()
+            if not downloadArtifact(Urls.QQ_FIX_64.value, dllPath):
+                raise httpx.RequestError(f"无法下载 {Urls.QQ_FIX_64.value.fileName()}")
+            shutil.copyfile(dllPath, it(PathFunc).getQQPath() / "dbghelp.dll")
+            logger.info(f"下载并写入 dbghelp.dll 成功")
 
             self.fixFinish.emit()
 
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+## 机器人运行状态中心
+    - 以 QQID 为键保存每个机器人的运行状态, 由 BotWidget 在启动/登录/停止/进程退出时写入
+    - 只有状态真正发生变化时才发出 stateChanged, 首页和列表只需订阅该信号, 空闲时没有任何开销
+    - 查询和更新都是 O(1), 不需要遍历机器人页面
+"""
+from abc import ABC
+from enum import Enum
+from typing import Dict, List
+
+from PySide6.QtCore import QObject, Signal
+from creart import AbstractCreator, CreateTargetInfo, add_creator, exists_module, it
+from loguru import logger
+
+from src.Core.Config.BotConfigStore import BotConfigStore
+
+
+class BotState(Enum):
+    """机器人运行状态"""
+    # 未运行
+    STOPPED = "stopped"
+    # 进程已启动, NapCat 尚未输出登录二维码或登录结果
+    STARTING = "starting"
+    # NapCat 已就绪 (已输出登录二维码), 等待扫码登录
+    RUNNING = "running"
+    # 已登录
+    LOGGED_IN = "logged_in"
+    # 进程意外退出
+    CRASHED = "crashed"
+
+    @property
+    def isRunning(self) -> bool:
+        return self in (BotState.STARTING, BotState.RUNNING, BotState.LOGGED_IN)
+
+
+class BotStateRegistry(QObject):
+    """
+    ## 机器人状态注册表, 没有记录的机器人视为 STOPPED
+    """
+    # 状态发生变化, 参数为 (QQID, 新状态)
+    stateChanged = Signal(str, object)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._states: Dict[str, BotState] = {}
+
+        # 删除机器人时移除对应的状态
+        it(BotConfigStore).botRemoved.connect(self.remove)
+
+    def state(self, qqid: str) -> BotState:
+        return self._states.get(qqid, BotState.STOPPED)
+
+    def isRunning(self, qqid: str) -> bool:
+        return self.state(qqid).isRunning
+
+    def isLoggedIn(self, qqid: str) -> bool:
+        return self.state(qqid) == BotState.LOGGED_IN
+
+    def runningBots(self) -> List[str]:
+        """
+        ## 正在运行的机器人的 QQID
+        """
+        return [qqid for qqid, state in self._states.items() if state.isRunning]
+
+    def anyRunning(self) -> bool:
+        return any(state.isRunning for state in self._states.values())
+
+    def setState(self, qqid: str, state: BotState) -> None:
+        """
+        ## 更新机器人状态, 与当前状态相同时不发出信号
+        """
+        if self.state(qqid) == state:
+            return
+        if state == BotState.STOPPED:
+            self._states.pop(qqid, None)
+        else:
+            self._states[qqid] = state
+        logger.debug(f"机器人 {qqid} 状态变为 {state.value}")
+        self.stateChanged.emit(qqid, state)
+
+    def remove(self, qqid: str) -> None:
+        """
+        ## 移除机器人状态
+        """
+        self.setState(qqid, BotState.STOPPED)
+
+
+class BotStateRegistryClassCreator(AbstractCreator, ABC):
+    # 定义类方法targets，该方法返回一个元组，元组中包含了一个CreateTargetInfo对象，
+    # 该对象描述了创建目标的相关信息，包括应用程序名称和类名。
+    targets = (CreateTargetInfo("src.Core.BotStateRegistry", "BotStateRegistry"),)
+
+    # 静态方法available()，用于检查模块"BotStateRegistry"是否存在，返回值为布尔型。
+    @staticmethod
+    def available() -> bool:
+        return exists_module("src.Core.BotStateRegistry")
+
+    # 静态方法create()，用于创建BotStateRegistry类的实例，返回值为BotStateRegistry对象。
+    @staticmethod
+    def create(create_type: [BotStateRegistry]) -> BotStateRegistry:
+        return BotStateRegistry()
+
+
+add_creator(BotStateRegistryClassCreator)
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+## 机器人配置的内存存储
+    - 启动时从 BotRepository 读取并验证一次, 之后所有读取都直接使用内存中的配置
+    - 增删改先写入仓库再更新内存, 并发出 botAdded / botUpdated / botRemoved 信号
+    - 监听配置数据库, 其他进程修改后重新读取, 只对有差异的机器人发出信号
+"""
+from abc import ABC
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+from creart import AbstractCreator, CreateTargetInfo, add_creator, exists_module, it
+from loguru import logger
+
+from src.Core.Config.BotRepository import BotRepository, dumpConfig
+from src.Core.Config.ConfigModel import Config
+
+
+class BotConfigStore(QObject):
+    """
+    ## 可观察的机器人配置存储, 以 QQID 为键, 保持添加顺序
+    """
+    # 新增机器人, 参数为配置
+    botAdded = Signal(object)
+    # 机器人配置被修改, 参数为新配置
+    botUpdated = Signal(object)
+    # 删除机器人, 参数为 QQID
+    botRemoved = Signal(str)
+
+    # 文件事件合并时间 (毫秒)
+    DEBOUNCE_INTERVAL = 300
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.repository = it(BotRepository)
+        self._configs: Dict[str, Config] = {config.bot.QQID: config for config in self.repository.list()}
+        self._dataVersion = self.repository.dataVersion()
+
+        # 监听数据库文件和所在目录 (WAL 文件会被创建和删除)
+        self.watcher = QFileSystemWatcher(self)
+        self.debounceTimer = QTimer(self)
+        self.debounceTimer.setSingleShot(True)
+        self.debounceTimer.setInterval(self.DEBOUNCE_INTERVAL)
+        self.debounceTimer.timeout.connect(self._externalChangedSlot)
+        self.watcher.fileChanged.connect(self.debounceTimer.start)
+        self.watcher.directoryChanged.connect(self.debounceTimer.start)
+        self._updateWatchPaths()
+
+    def configs(self) -> List[Config]:
+        """
+        ## 按添加顺序返回所有机器人配置
+        """
+        return list(self._configs.values())
+
+    def get(self, qqid: str) -> Optional[Config]:
+        return self._configs.get(qqid)
+
+    def contains(self, qqid: str) -> bool:
+        return qqid in self._configs
+
+    def isEmpty(self) -> bool:
+        return not self._configs
+
+    def add(self, config: Config) -> None:
+        """
+        ## 新增机器人, 已存在时按更新处理
+        """
+        if self.contains(config.bot.QQID):
+            self.update(config)
+            return
+        self.repository.upsert(config)
+        self._configs[config.bot.QQID] = config
+        self._dataVersion = self.repository.dataVersion()
+        self.botAdded.emit(config)
+
+    def addMany(self, configs: List[Config]) -> None:
+        """
+        ## 批量新增或更新机器人, 在一个事务中写入仓库
+        """
+        self.repository.upsertMany(configs)
+        self._dataVersion = self.repository.dataVersion()
+        for config in configs:
+            exists = config.bot.QQID in self._configs
+            self._configs[config.bot.QQID] = config
+            (self.botUpdated if exists else self.botAdded).emit(config)
+
+    def update(self, config: Config) -> None:
+        """
+        ## 更新机器人配置
+        """
+        self.repository.upsert(config)
+        self._configs[config.bot.QQID] = config
+        self._dataVersion = self.repository.dataVersion()
+        self.botUpdated.emit(config)
+
+    def remove(self, qqid: str) -> None:
+        """
+        ## 删除机器人
+        """
+        self.repository.delete(qqid)
+        self._dataVersion = self.repository.dataVersion()
+        if self._configs.pop(qqid, None) is not None:
+            self.botRemoved.emit(qqid)
+
+    def reload(self) -> None:
+        """
+        ## 从仓库重新读取, 与内存中的配置比较后只对差异发出信号
+        """
+        self._dataVersion = self.repository.dataVersion()
+        configs = {config.bot.QQID: config for config in self.repository.list()}
+
+        for qqid in [qqid for qqid in self._configs if qqid not in configs]:
+            del self._configs[qqid]
+            self.botRemoved.emit(qqid)
+
+        for qqid, config in configs.items():
+            if (current := self._configs.get(qqid)) is None:
+                self._configs[qqid] = config
+                self.botAdded.emit(config)
+            elif dumpConfig(current) != dumpConfig(config):
+                self._configs[qqid] = config
+                self.botUpdated.emit(config)
+
+    def _externalChangedSlot(self) -> None:
+        """
+        ## 文件变化时检查数据库是否被其他连接修改
+            - data_version 只在其他连接提交后变化, 目录中其他文件的变化不会触发重新读取
+        """
+        self._updateWatchPaths()
+        if self.repository.dataVersion() != self._dataVersion:
+            logger.info("机器人配置被外部修改, 重新读取")
+            self.reload()
+
+    def _updateWatchPaths(self) -> None:
+        path = self.repository.path
+        paths = {str(item) for item in (path, path.with_name(f"{path.name}-wal"), path.parent) if item.exists()}
+        watched = set(self.watcher.files() + self.watcher.directories())
+        if stale := watched - paths:
+            self.watcher.removePaths(list(stale))
+        if new := paths - watched:
+            self.watcher.addPaths(list(new))
+
+
+class BotConfigStoreClassCreator(AbstractCreator, ABC):
+    # 定义类方法targets，该方法返回一个元组，元组中包含了一个CreateTargetInfo对象，
+    # 该对象描述了创建目标的相关信息，包括应用程序名称和类名。
+    targets = (CreateTargetInfo("src.Core.Config.BotConfigStore", "BotConfigStore"),)
+
+    # 静态方法available()，用于检查模块"BotConfigStore"是否存在，返回值为布尔型。
+    @staticmethod
+    def available() -> bool:
+        return exists_module("src.Core.Config.BotConfigStore")
+
+    # 静态方法create()，用于创建BotConfigStore类的实例，返回值为BotConfigStore对象。
+    @staticmethod
+    def create(create_type: [BotConfigStore]) -> BotConfigStore:
+        return BotConfigStore()
+
+
+add_creator(BotConfigStoreClassCreator)
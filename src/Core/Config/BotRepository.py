@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+## 机器人配置仓库
+    - 配置保存在 config/bot.db (SQLite, WAL 模式), 每个机器人一行, 以 QQID 为主键
+    - 增删改都是单行事务, 修改一个机器人不需要读写其他机器人的配置
+    - 通过 PRAGMA user_version 记录表结构版本, 按 MIGRATIONS 逐级升级
+    - 还没有任何机器人且尚未成功导入过时, 自动导入旧版的 bot.json, 同时提供 JSON 导入/导出
+"""
+import json
+import sqlite3
+import threading
+from abc import ABC
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from creart import AbstractCreator, CreateTargetInfo, add_creator, exists_module, it
+from loguru import logger
+
+from src.Core.Config.ConfigModel import Config, DEFAULT_CONFIG
+from src.Core.PathFunc import PathFunc
+
+# 表结构升级脚本, 第 n 项将 user_version 从 n 升级到 n + 1
+MIGRATIONS = (
+    """
+    CREATE TABLE bots (
+        qqid     TEXT PRIMARY KEY,
+        position INTEGER NOT NULL,
+        config   TEXT NOT NULL
+    );
+    CREATE INDEX bots_position ON bots (position);
+    """,
+    """
+    CREATE TABLE meta (
+        key   TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+    INSERT INTO meta (key, value) SELECT 'legacy_imported', '1' WHERE EXISTS (SELECT 1 FROM bots);
+    """,
+)
+# meta 表中记录旧版 bot.json 已导入的键
+LEGACY_IMPORTED_KEY = "legacy_imported"
+
+
+def mergeDefaults(userConfig: dict, defaultConfig: dict) -> dict:
+    """
+    ## 检查是否有新版参数并填入默认值
+    """
+    for key, value in defaultConfig.items():
+        if isinstance(value, dict):
+            # 如果值是字典，则递归调用
+            userConfig[key] = mergeDefaults(userConfig.get(key, {}), value)
+        elif key not in userConfig:
+            userConfig[key] = value
+    return userConfig
+
+
+def dumpConfig(config: Config) -> str:
+    """
+    ## 序列化机器人配置
+        - 不可以直接使用 dict 方法, 内部 WebsocketUrl 和 HttpUrl 不会自动转为 str
+    """
+    return config.json()
+
+
+class BotRepository:
+    """
+    ## 基于 SQLite 的机器人配置仓库
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or it(PathFunc).config_dir_path / "bot.db"
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+
+        self._migrate()
+        if self.isEmpty() and not self._legacyImported():
+            # 还没有机器人, 导入旧版 bot.json, 失败时下次启动重试
+            self._importLegacy()
+
+    def _migrate(self) -> int:
+        """
+        ## 升级表结构, 返回升级前的版本
+        """
+        with self._lock:
+            version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            for index in range(version, len(MIGRATIONS)):
+                self._connection.executescript(
+                    f"BEGIN;{MIGRATIONS[index]}PRAGMA user_version={index + 1};COMMIT;"
+                )
+                logger.info(f"机器人配置数据库升级到版本 {index + 1}")
+            return version
+
+    def _legacyImported(self) -> bool:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT 1 FROM meta WHERE key = ?", (LEGACY_IMPORTED_KEY,)
+            ).fetchone() is not None
+
+    def _importLegacy(self) -> None:
+        """
+        ## 导入旧版 bot.json, 原文件保留不动
+            - 逐项验证, 无效的项记录日志后跳过, 不影响其他机器人
+            - 至少导入一个机器人后才记录为已导入, 否则下次启动时重试
+        """
+        if not (legacy := it(PathFunc).bot_config_path).is_file():
+            return
+        try:
+            count, errors = self.importJson(legacy)
+        except (OSError, ValueError) as e:
+            logger.error(f"导入 {legacy.name} 失败: {e}")
+            return
+
+        for error in errors:
+            logger.error(f"导入 {legacy.name} 时跳过无效配置: {error}")
+        logger.info(f"已从 {legacy.name} 导入 {count} 个机器人配置, 跳过 {len(errors)} 个")
+        if count:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, '1')", (LEGACY_IMPORTED_KEY,)
+                )
+
+    @staticmethod
+    def _parse(data: str) -> Config:
+        return Config(**mergeDefaults(json.loads(data), DEFAULT_CONFIG))
+
+    def list(self) -> List[Config]:
+        """
+        ## 按添加顺序返回所有机器人配置
+            - 解析失败的行会被跳过并记录日志, 不影响其他机器人
+        """
+        with self._lock:
+            rows = self._connection.execute("SELECT qqid, config FROM bots ORDER BY position").fetchall()
+
+        configs = []
+        for qqid, data in rows:
+            try:
+                configs.append(self._parse(data))
+            except ValueError as e:
+                logger.error(f"机器人 {qqid} 的配置无法解析, 已跳过: {e}")
+        return configs
+
+    def get(self, qqid: str) -> Optional[Config]:
+        with self._lock:
+            row = self._connection.execute("SELECT config FROM bots WHERE qqid = ?", (qqid,)).fetchone()
+        return self._parse(row[0]) if row is not None else None
+
+    def isEmpty(self) -> bool:
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM bots LIMIT 1").fetchone() is None
+
+    def exists(self, qqid: str) -> bool:
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM bots WHERE qqid = ?", (qqid,)).fetchone() is not None
+
+    def upsert(self, config: Config) -> None:
+        """
+        ## 新增或更新一个机器人, 更新时保留原来的位置
+        """
+        with self._lock, self._connection:
+            self._upsert(config)
+
+    def upsertMany(self, configs: List[Config]) -> None:
+        """
+        ## 在一个事务中新增或更新多个机器人
+        """
+        with self._lock, self._connection:
+            for config in configs:
+                self._upsert(config)
+
+    def _upsert(self, config: Config) -> None:
+        self._connection.execute(
+            "INSERT INTO bots (qqid, position, config) "
+            "VALUES (?, (SELECT COALESCE(MAX(position), -1) + 1 FROM bots), ?) "
+            "ON CONFLICT (qqid) DO UPDATE SET config = excluded.config",
+            (config.bot.QQID, dumpConfig(config))
+        )
+
+    def delete(self, qqid: str) -> bool:
+        """
+        ## 删除一个机器人, 返回是否删除了数据
+        """
+        with self._lock, self._connection:
+            return self._connection.execute("DELETE FROM bots WHERE qqid = ?", (qqid,)).rowcount > 0
+
+    def importJson(self, path: Path, replace: bool = False) -> Tuple[int, List[str]]:
+        """
+        ## 从 bot.json 格式的文件导入, 返回 (导入数量, 无效项的错误信息)
+            - 逐项验证, 无效的项跳过, 有效的项在一个事务中写入
+            - 文件无法解析或根元素不是数组时抛出 ValueError
+            - replace 为 True 时清空现有配置
+        """
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(data, list):
+            raise ValueError(f"根元素应为数组, 实际为 {type(data).__name__}")
+
+        configs: List[Config] = []
+        errors: List[str] = []
+        for index, item in enumerate(data, 1):
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError(f"应为对象, 实际为 {type(item).__name__}")
+                configs.append(Config(**mergeDefaults(item, DEFAULT_CONFIG)))
+            except (TypeError, ValueError) as e:
+                bot = item.get("bot") if isinstance(item, dict) else None
+                qqid = bot.get("QQID") if isinstance(bot, dict) else None
+                errors.append(f"第 {index} 项 ({qqid or '未知 QQID'}): {e}")
+
+        with self._lock, self._connection:
+            if replace:
+                self._connection.execute("DELETE FROM bots")
+            for config in configs:
+                self._upsert(config)
+        return len(configs), errors
+
+    def exportJson(self, path: Path) -> int:
+        """
+        ## 导出为 bot.json 格式的文件, 返回导出数量
+        """
+        configs: List[Dict] = [json.loads(dumpConfig(config)) for config in self.list()]
+        tmp = path.with_name(f"{path.name}.tmp")
+        tmp.write_text(json.dumps(configs, indent=4), encoding="utf-8")
+        tmp.replace(path)
+        return len(configs)
+
+    def dataVersion(self) -> int:
+        """
+        ## 数据版本, 只在其他连接 (例如其他进程) 提交修改后变化
+        """
+        with self._lock:
+            return self._connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class BotRepositoryClassCreator(AbstractCreator, ABC):
+    # 定义类方法targets，该方法返回一个元组，元组中包含了一个CreateTargetInfo对象，
+    # 该对象描述了创建目标的相关信息，包括应用程序名称和类名。
+    targets = (CreateTargetInfo("src.Core.Config.BotRepository", "BotRepository"),)
+
+    # 静态方法available()，用于检查模块"BotRepository"是否存在，返回值为布尔型。
+    @staticmethod
+    def available() -> bool:
+        return exists_module("src.Core.Config.BotRepository")
+
+    # 静态方法create()，用于创建BotRepository类的实例，返回值为BotRepository对象。
+    @staticmethod
+    def create(create_type: [BotRepository]) -> BotRepository:
+        return BotRepository()
+
+
+add_creator(BotRepositoryClassCreator)
@@ -25,6 +25,8 @@ class BotConfig(BaseModel):
     musicSignUrl: str
     heartInterval: str
     accessToken: Optional[str]
+    # 使用的 NapCat 版本, 为空时使用当前安装的版本
+    napcatVersion: str = ""
 
     @field_validator("name")
     @staticmethod
@@ -125,6 +127,7 @@ DEFAULT_CONFIG = {
         "musicSignUrl": "",
         "heartInterval": "30000",
         "accessToken": "",
+        "napcatVersion": "",
     },
     "connect": {
         "http": {
@@ -139,7 +142,7 @@ DEFAULT_CONFIG = {
         "ws": {
             "enable": False,
             "host": "",
-            "port": 3001
+            "port": "3001"
         },
         "reverseWs": {
             "enable": False,
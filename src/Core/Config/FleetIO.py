@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""
+## 机器人批量导入/导出
+    - 支持 CSV / JSON / JSONL 三种格式, 按文件后缀区分
+    - 每条记录与 bot.json 中的元素结构相同 ({"bot": ..., "connect": ..., "advanced": ...}), 缺少的字段使用默认值
+    - CSV 的列名为点分隔的字段路径 (例如 bot.QQID, connect.http.port), 列表等值以 JSON 表示
+    - 导入时逐条读取, 分批交给线程池验证, 每条记录的错误单独报告
+    - 导出时逐条写出, 不在内存中拼接整个文件
+"""
+import csv
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from PySide6.QtCore import QThread, Signal
+from loguru import logger
+
+from src.Core.Config.BotRepository import dumpConfig, mergeDefaults
+from src.Core.Config.ConfigModel import Config, DEFAULT_CONFIG
+
+# 支持的文件格式
+FORMATS = (".csv", ".json", ".jsonl")
+# 每批交给线程池验证的记录数
+BATCH_SIZE = 256
+# 流式解析 JSON 数组时每次读取的字符数
+READ_SIZE = 64 * 1024
+# 单个元素的最大长度, 超过后仍找不到结尾时跳到下一条记录
+MAX_ELEMENT_SIZE = 1024 * 1024
+# 下一条记录的开头, 找不到元素结尾时用于重新同步
+NEXT_RECORD = re.compile(r",\s*\{")
+
+
+class FleetFormatError(ValueError):
+    """文件格式错误"""
+
+
+@dataclass
+class RowError:
+    """
+    ## 导入失败的记录, row 从 1 开始 (CSV 不计表头)
+    """
+    row: int
+    qqid: Optional[str]
+    message: str
+
+
+@dataclass
+class ImportReport:
+    """
+    ## 导入结果
+    """
+    configs: List[Config] = field(default_factory=list)
+    errors: List[RowError] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return len(self.configs) + len(self.errors)
+
+
+def checkFormat(path: Path) -> str:
+    if (suffix := path.suffix.lower()) not in FORMATS:
+        raise FleetFormatError(f"不支持的文件格式: {path.suffix}")
+    return suffix
+
+
+def flatten(data: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """
+    ## 将嵌套字典展开为 {点分隔路径: 值}
+    """
+    result = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            result.update(flatten(value, f"{prefix}{key}."))
+        else:
+            result[f"{prefix}{key}"] = value
+    return result
+
+
+def unflatten(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    ## flatten 的逆操作
+    """
+    result: Dict[str, Any] = {}
+    for path, value in data.items():
+        *parents, key = path.split(".")
+        node = result
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[key] = value
+    return result
+
+
+def encodeCell(value: Any) -> str:
+    """
+    ## CSV 单元格编码: 字符串原样输出, 其他值使用 JSON
+    """
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+def decodeCell(value: str) -> Any:
+    """
+    ## CSV 单元格解码
+        - 只有 JSON 列表/对象/布尔/null 会被解析, 数字保持字符串 (QQID 和端口都是字符串字段)
+    """
+    if value in ("true", "false", "null") or value[:1] in ("[", "{"):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _elementEnd(buffer: str) -> Optional[int]:
+    """
+    ## 查找 buffer 开头的元素的结束位置 (不含之后的逗号), 元素不完整时返回 None
+        - 只跟踪括号层级和字符串, 不检查内容, 用于跳过无法解析的元素
+    """
+    depth, inString, escaped = 0, False, False
+    for index, char in enumerate(buffer):
+        if inString:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                inString = False
+        elif char == '"':
+            inString = True
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            if depth == 0:
+                # 多余的右括号本身作为元素跳过, 数组的结尾留给调用方处理
+                return index + 1 if char == "}" else index
+            depth -= 1
+            if depth == 0:
+                return index + 1
+        elif char == "," and depth == 0:
+            return index
+    return None
+
+
+def _iterJsonArray(file: TextIO) -> Iterator[Any]:
+    """
+    ## 流式解析 JSON 数组, 每次只在内存中保留一个元素和一块读取缓冲
+        - 无法解析的元素以 FleetFormatError 实例返回, 跳到下一个元素后继续解析
+    """
+    decoder = json.JSONDecoder()
+    buffer, started = "", False
+    while True:
+        chunk = file.read(READ_SIZE)
+        buffer += chunk
+        while True:
+            buffer = buffer.lstrip()
+            if not buffer:
+                break
+            if not started:
+                if buffer[0] != "[":
+                    raise FleetFormatError("JSON 文件的顶层必须是数组")
+                buffer, started = buffer[1:], True
+                continue
+            if buffer[:1] == "]":
+                return
+            if buffer[:1] == ",":
+                buffer = buffer[1:]
+                continue
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except ValueError as e:
+                if (end := _elementEnd(buffer)) is None:
+                    if chunk and len(buffer) < MAX_ELEMENT_SIZE:
+                        # 元素不完整, 继续读取
+                        break
+                    # 文件已经读完或元素过长, 跳到下一条记录的开头
+                    match = NEXT_RECORD.search(buffer, 1)
+                    end = match.start() if match else len(buffer)
+                buffer = buffer[end:]
+                yield FleetFormatError(f"JSON 解析失败: {e}")
+                continue
+            buffer = buffer[end:]
+            yield item
+        if not chunk:
+            raise FleetFormatError("JSON 数组不完整")
+
+
+def iterRecords(path: Path) -> Iterator[Tuple[int, Any]]:
+    """
+    ## 逐条读取文件中的记录, 返回 (行号, 记录)
+        - JSONL 中无法解析的行以 FleetFormatError 实例作为记录返回, 由调用方记为该行的错误
+    """
+    suffix = checkFormat(path)
+    with open(path, "r", encoding="utf-8-sig", newline="") as file:
+        if suffix == ".csv":
+            for row, record in enumerate(csv.DictReader(file), 1):
+                yield row, unflatten({key: decodeCell(value) for key, value in record.items() if value != ""})
+        elif suffix == ".jsonl":
+            row = 0
+            for line in file:
+                if not line.strip():
+                    continue
+                row += 1
+                try:
+                    yield row, json.loads(line)
+                except ValueError as e:
+                    yield row, FleetFormatError(f"JSON 解析失败: {e}")
+        else:
+            yield from enumerate(_iterJsonArray(file), 1)
+
+
+def _checkSections(record: Dict[str, Any], defaults: Dict[str, Any], prefix: str = "") -> Optional[str]:
+    """
+    ## 检查记录中与默认配置对应的分组都是对象, 否则 mergeDefaults 无法合并
+    """
+    for key, value in defaults.items():
+        if not isinstance(value, dict) or key not in record:
+            continue
+        if not isinstance(record[key], dict):
+            return f"{prefix}{key} 必须是对象"
+        if (error := _checkSections(record[key], value, f"{prefix}{key}.")) is not None:
+            return error
+    return None
+
+
+def _validate(row: int, record: Any) -> Tuple[int, Optional[Config], Optional[str], Optional[str]]:
+    """
+    ## 验证一条记录, 返回 (行号, 配置, QQID, 错误信息)
+        - 任何异常都只记为该条记录的错误, 不影响其他记录
+    """
+    if isinstance(record, Exception):
+        return row, None, None, str(record)
+    if not isinstance(record, dict):
+        return row, None, None, "记录必须是对象"
+    qqid = record["bot"].get("QQID") if isinstance(record.get("bot"), dict) else None
+    qqid = None if qqid is None else str(qqid)
+    if (error := _checkSections(record, DEFAULT_CONFIG)) is not None:
+        return row, None, qqid, error
+    try:
+        return row, Config(**mergeDefaults(record, DEFAULT_CONFIG)), qqid, None
+    except ValueError as e:
+        return row, None, qqid, str(e)
+    except Exception as e:
+        return row, None, qqid, f"{type(e).__name__}: {e}"
+
+
+def importFleet(
+        path: Path, workers: Optional[int] = None, onProgress: Optional[Callable[[int], None]] = None,
+        isStopped: Optional[Callable[[], bool]] = None
+) -> ImportReport:
+    """
+    ## 从文件读取并验证机器人配置
+        - 只负责解析和验证, 写入由调用方在一个事务中完成
+        - 同一文件中重复的 QQID 以第一条为准, 之后的记为错误
+        - onProgress(已处理条数) 每批调用一次
+    """
+    report = ImportReport()
+    seen = set()
+    records = iterRecords(path)
+    with ThreadPoolExecutor(workers, thread_name_prefix="FleetValidate") as pool:
+        while batch := list(islice(records, BATCH_SIZE)):
+            if isStopped is not None and isStopped():
+                break
+            for row, config, qqid, error in pool.map(lambda item: _validate(*item), batch):
+                if error is None and config.bot.QQID in seen:
+                    error = "QQID 在文件中重复"
+                if error is not None:
+                    report.errors.append(RowError(row, qqid, error))
+                    continue
+                seen.add(config.bot.QQID)
+                report.configs.append(config)
+            if onProgress is not None:
+                onProgress(report.total)
+    return report
+
+
+def exportFleet(configs: Iterable[Config], path: Path) -> int:
+    """
+    ## 逐条导出机器人配置, 返回导出数量
+    """
+    suffix = checkFormat(path)
+    count = 0
+    tmp = path.with_name(f"{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8", newline="") as file:
+        if suffix == ".csv":
+            # 列固定为默认配置的全部字段, 保证每行结构一致
+            writer = csv.DictWriter(file, fieldnames=list(flatten(DEFAULT_CONFIG)), extrasaction="ignore")
+            writer.writeheader()
+            for config in configs:
+                record = flatten(json.loads(dumpConfig(config)))
+                writer.writerow({key: encodeCell(value) for key, value in record.items()})
+                count += 1
+        elif suffix == ".jsonl":
+            for config in configs:
+                file.write(dumpConfig(config) + "\n")
+                count += 1
+        else:
+            file.write("[")
+            for config in configs:
+                file.write(("," if count else "") + "\n    " + dumpConfig(config))
+                count += 1
+            file.write("\n]\n")
+    tmp.replace(path)
+    return count
+
+
+class FleetImportWorker(QThread):
+    """
+    ## 在后台线程中解析并验证导入文件
+        - 验证通过的配置由界面线程写入 BotConfigStore
+    """
+    # 已处理的记录数
+    progress = Signal(int)
+    # 导入结束, 参数为 ImportReport
+    importFinish = Signal(object)
+    # 文件无法读取, 参数为错误信息
+    errorFinish = Signal(str)
+
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+        self.path = path
+
+    def run(self) -> None:
+        logger.info(f"{'-' * 10} 开始导入机器人 {self.path} {'-' * 10}")
+        try:
+            report = importFleet(self.path, onProgress=self.progress.emit, isStopped=self.isInterruptionRequested)
+        except (OSError, UnicodeDecodeError, csv.Error, FleetFormatError) as e:
+            logger.error(f"导入机器人时引发 {type(e).__name__}: {e}")
+            self.errorFinish.emit(str(e))
+            return
+        except Exception as e:
+            # 意外错误也要通知界面, 否则导入对话框会一直等待
+            logger.error(f"导入机器人时引发意外的 {type(e).__name__}: {e}")
+            self.errorFinish.emit(f"{type(e).__name__}: {e}")
+            return
+
+        for error in report.errors:
+            logger.warning(f"第 {error.row} 条记录 ({error.qqid}) 导入失败: {error.message}")
+        logger.info(f"{'-' * 10} 导入完成: 有效 {len(report.configs)}, 失败 {len(report.errors)} {'-' * 10}")
+        self.importFinish.emit(report)
@@ -1,13 +1,20 @@
 # -*- coding: utf-8 -*-
+import atexit
+import json
+import os
 import platform
+import threading
 import time
 from enum import Enum
+from typing import Optional
 
-from PySide6.QtCore import QLocale
+from PySide6.QtCore import QCoreApplication, QLocale, QTimer, Signal
 from creart import it
+from loguru import logger
 from qfluentwidgets.common import (
     qconfig, QConfig, ConfigItem, BoolValidator, FolderValidator,
-    OptionsConfigItem, OptionsValidator, EnumSerializer, ConfigSerializer
+    OptionsConfigItem, OptionsValidator, EnumSerializer, ConfigSerializer,
+    RangeConfigItem, RangeValidator
 )
 
 from src.Core.PathFunc import PathFunc
@@ -33,6 +40,13 @@ class BootWayEnum(Enum):
         return [value.value for value in BootWayEnum]
 
 
+class RateLimitModeEnum(Enum):
+    """下载限速模式枚举"""
+    OFF = "Off"
+    MANUAL = "Manual"
+    AUTO = "Auto"
+
+
 class Language(Enum):
     """语言枚举"""
 
@@ -57,7 +71,20 @@ class LanguageSerializer(ConfigSerializer):
 
 
 class Config(QConfig):
-    """程序配置"""
+    """
+    程序配置
+
+    ## 写入策略
+        - save() 只标记为脏, 合并 SAVE_DELAY 毫秒内的多次修改后再写入
+        - 内容与上次写入的一致时跳过写入
+        - 先写临时文件并 fsync, 再原子替换 config.json, 崩溃不会留下半个文件
+        - 退出时调用 flush() 写入尚未落盘的修改
+    """
+
+    # 合并写入的延迟 (毫秒)
+    SAVE_DELAY = 500
+    # 请求保存 (跨线程时排队到配置所在线程启动计时器)
+    _saveRequested = Signal()
 
     # 信息项
     NCDVersion = ConfigItem(
@@ -115,6 +142,47 @@ class Config(QConfig):
         validator=FolderValidator()
     )
 
+    # 网络项 (限速单位为 KB/s)
+    DownloadRateLimitMode = OptionsConfigItem(
+        group="Network",
+        name="DownloadRateLimitMode",
+        default=RateLimitModeEnum.OFF,
+        validator=OptionsValidator(RateLimitModeEnum),
+        serializer=EnumSerializer(RateLimitModeEnum),
+    )
+    GlobalDownloadRateLimit = RangeConfigItem(
+        group="Network",
+        name="GlobalDownloadRateLimit",
+        default=4096,
+        validator=RangeValidator(64, 102400)
+    )
+    PerDownloadRateLimit = RangeConfigItem(
+        group="Network",
+        name="PerDownloadRateLimit",
+        default=2048,
+        validator=RangeValidator(64, 102400)
+    )
+
+    # 产物来源, 为空时直接从官方地址下载, 例如 http://192.168.1.10:8086
+    ArtifactMirror = ConfigItem(
+        group="Network",
+        name="ArtifactMirror",
+        default="",
+    )
+    # 是否在局域网分享已下载的产物
+    ServeArtifacts = ConfigItem(
+        group="Network",
+        name="ServeArtifacts",
+        default=False,
+        validator=BoolValidator()
+    )
+    ArtifactServerPort = RangeConfigItem(
+        group="Network",
+        name="ArtifactServerPort",
+        default=8086,
+        validator=RangeValidator(1024, 65535)
+    )
+
     # 启动项
     StartOpenHomePageView = OptionsConfigItem(
         group="StartupItem",
@@ -151,10 +219,78 @@ class Config(QConfig):
         validator=BoolValidator()
     )
 
+    def __init__(self) -> None:
+        super().__init__()
+        self._dirty = False
+        # 配置文件当前的内容, 内容相同时不重写
+        self._persisted: Optional[bytes] = None
+        self._saveLock = threading.Lock()
+        self._saveTimer = QTimer(self)
+        self._saveTimer.setSingleShot(True)
+        self._saveTimer.setInterval(self.SAVE_DELAY)
+        self._saveTimer.timeout.connect(self.flush)
+        self._saveRequested.connect(self._saveTimer.start)
+
+    def save(self) -> None:
+        """
+        ## 标记配置需要保存, 稍后统一写入
+            - 没有事件循环 (QApplication 创建前或退出后) 时立即写入
+        """
+        self._dirty = True
+        if QCoreApplication.instance() is None:
+            self.flush()
+        else:
+            self._saveRequested.emit()
+
+    def seedPersisted(self) -> None:
+        """
+        ## 记录启动时读取的配置文件内容, 没有实际修改时第一次 flush 不重写 config.json
+        """
+        try:
+            self._persisted = self._cfg.file.read_bytes()
+        except OSError:
+            self._persisted = None
+
+    def flush(self) -> None:
+        """
+        ## 立即写入尚未落盘的修改
+        """
+        with self._saveLock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            data = json.dumps(self.toDict(), ensure_ascii=False, indent=4).encode("utf-8")
+            if data == self._persisted:
+                return
+
+            file = self._cfg.file
+            tmp = file.with_name(f"{file.name}.tmp")
+            try:
+                file.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, file)
+            except OSError as e:
+                # 写入失败保留脏标记, 下次保存时重试
+                self._dirty = True
+                logger.error(f"保存配置文件时引发 {type(e).__name__}: {e}")
+                return
+            self._persisted = data
+
 
 cfg = Config()
 qconfig.load(it(PathFunc).config_path, cfg)
-cfg.set(cfg.StartTime, time.time(), True)
+cfg.seedPersisted()
+# 主题等由 qconfig.set 保存的配置也走合并写入
+qconfig.save = cfg.save
+atexit.register(cfg.flush)
+# 路径配置变化时使路径快照失效
+for _pathItem in (cfg.QQPath, cfg.NapCatPath, cfg.StartScriptPath):
+    _pathItem.valueChanged.connect(it(PathFunc).invalidate)
+# 启动时间只在本次运行中使用, 不写入配置文件, 否则每次启动都会重写 config.json
+cfg.set(cfg.StartTime, time.time(), False)
 cfg.set(cfg.NCDVersion, "beta 1.0.7", True)
 cfg.set(cfg.SystemType, platform.system(), True)
 cfg.set(cfg.PlatformType, platform.machine(), True)
@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import json
 import textwrap
 from pathlib import Path
 from typing import Tuple
@@ -10,6 +9,8 @@ from creart import it
 from qfluentwidgets import InfoBar, InfoBarPosition, MessageBox, TransparentPushButton, FluentIcon
 
 from src.Core.Config.ConfigModel import Config, ScriptType
+from src.Core.NapCatConfigSync import renderFiles, writeAtomic
+from src.Core.NapCatStore import NapCatStore
 from src.Core.PathFunc import PathFunc
 
 
@@ -152,7 +153,7 @@ class CreateScript:
         if self.config.advanced.ffmpegPath else ''
         }
         export ELECTRON_RUN_AS_NODE=1
-        {self.config.advanced.QQPath} {it(PathFunc).getNapCatPath() / "napcat.mjs"} -q {self.config.bot.QQID}
+        {self.config.advanced.QQPath} {it(NapCatStore).resolve(self.config.bot.napcatVersion) / "napcat.mjs"} -q {self.config.bot.QQID}
         """
 
         # 创建配置文件
@@ -202,59 +203,18 @@ class CreateScript:
         """
         创建 napcat 的配置文件
         """
-        # 如果 bot 配置文件或者 napcat 配置文件已经存在
+        files = renderFiles(self.config)
+        # 如果 bot 配置文件或者 napcat 配置文件已经存在且内容不同
         # 询问用户是否需要覆盖, 不覆盖则直接返回
-        if bot_config_path.exists():
-            if self._showOverlayPrompts(bot_config_path) is None:
-                return
-        if napcat_config_path.exists():
-            if self._showOverlayPrompts(napcat_config_path) is None:
-                return
-
-        bot_config = {
-            "http": {
-                "enable": self.config.connect.http.enable,
-                "host": self.config.connect.http.host,
-                "port": self.config.connect.http.port,
-                "secret": self.config.connect.http.secret,
-                "enableHeart": self.config.connect.http.enableHeart,
-                "enablePost": self.config.connect.http.enablePost,
-                "postUrls": [str(url) for url in self.config.connect.http.postUrls],
-            },
-            "ws": {
-                "enable": self.config.connect.ws.enable,
-                "host": self.config.connect.ws.host,
-                "port": self.config.connect.ws.port,
-            },
-            "reverseWs": {
-                "enable": self.config.connect.reverseWs.enable,
-                "urls": [str(url) for url in self.config.connect.reverseWs.urls],
-            },
-            "GroupLocalTime": {
-                "Record": self.config.advanced.GroupLocalTime.Record,
-                "RecordList": self.config.advanced.GroupLocalTime.RecordList
-            },
-            "debug": self.config.advanced.debug,
-            "heartInterval": self.config.bot.heartInterval,
-            "messagePostFormat": self.config.bot.messagePostFormat,
-            "enableLocalFile2Url": self.config.advanced.localFile2url,
-            "musicSignUrl": self.config.bot.musicSignUrl,
-            "reportSelfMessage": self.config.bot.reportSelfMsg,
-            "token": self.config.bot.accessToken,
-        }
-
-        napcat_config = {
-            "fileLog": self.config.advanced.fileLog,
-            "consoleLog": self.config.advanced.consoleLog,
-            "fileLogLevel": self.config.advanced.fileLogLevel,
-            "consoleLogLevel": self.config.advanced.consoleLogLevel,
-        }
-
-        # 写入配置文件
-        with open(str(bot_config_path), "w", encoding="utf-8") as f:
-            json.dump(bot_config, f, indent=4)
-        with open(str(napcat_config_path), "w", encoding="utf-8") as f:
-            json.dump(napcat_config, f, indent=4)
+        for path in (bot_config_path, napcat_config_path):
+            if path.exists() and path.read_bytes() != files[path.name]:
+                if self._showOverlayPrompts(path) is None:
+                    return
+
+        # 只写入有变化的配置文件
+        for path in (bot_config_path, napcat_config_path):
+            if not path.exists() or path.read_bytes() != files[path.name]:
+                writeAtomic(path, files[path.name])
 
     def _showOverlayPrompts(self, path: str | Path) -> int:
         """
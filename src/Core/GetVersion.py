@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
 import json
+import os
 from abc import ABC
+from contextlib import contextmanager
 from json import JSONDecodeError
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
 from loguru import logger
 
-from PySide6.QtCore import QObject, QEventLoop, QRegularExpression, QUrl
+from PySide6.QtCore import QObject, QEventLoop, QFileSystemWatcher, QRegularExpression, QTimer, QUrl, Signal
 from creart import it, AbstractCreator, CreateTargetInfo, exists_module, add_creator
 
 from src.Core import timer
@@ -15,10 +20,24 @@ from src.Core.PathFunc import PathFunc
 class GetVersion(QObject):
     """
     ## 提供两个方法, 分别获取本地的 NapCat 和 QQ 的版本
+        - 本地版本由文件系统通知驱动: 监听 package.json 及其上级目录, 变化时才重新读取
+        - 不支持通知的文件系统由 stat 轮询兜底, 只比较 mtime/大小, 不解析文件
+        - 版本变化通过信号发布, 界面无需轮询
     """
+    # 本地版本变化信号, 参数为新版本 (未安装为 None)
+    napcatLocalVersionChanged = Signal(object)
+    QQLocalVersionChanged = Signal(object)
+    # 远程 NapCat 版本变化信号
+    napcatRemoteVersionChanged = Signal(object)
+
+    # 文件事件合并时间和 stat 兜底轮询间隔 (毫秒)
+    DEBOUNCE_INTERVAL = 200
+    STAT_INTERVAL = 3000
 
     def __init__(self) -> None:
         super().__init__()
+        from src.Core.Config import cfg
+
         # 创建属性
         self.napcatLocalVersion: None | str = None
         self.QQLocalVersion: None | str = None
@@ -27,13 +46,37 @@ class GetVersion(QObject):
         self.QQRemoteDownloadUrls: None | dict = None
         self.napcatUpdateLog: None | str = None
 
+        # 本地 package.json 的路径和上次读取时的 stat 签名
+        self.napcatPackagePath: Optional[Path] = None
+        self.QQPackagePath: Optional[Path] = None
+        self._signatures: Dict[str, Optional[Tuple[int, int, int]]] = {}
+
+        # 文件系统监听, 事件先合并再刷新, 避免解压时连续触发
+        self.watcher = QFileSystemWatcher(self)
+        self.debounceTimer = QTimer(self)
+        self.debounceTimer.setSingleShot(True)
+        self.debounceTimer.setInterval(self.DEBOUNCE_INTERVAL)
+        self.debounceTimer.timeout.connect(self.refreshLocalVersions)
+        self.watcher.fileChanged.connect(self.debounceTimer.start)
+        self.watcher.directoryChanged.connect(self._directoryChangedSlot)
+        self._pathsStale = False
+
+        # stat 兜底
+        self.statTimer = QTimer(self)
+        self.statTimer.setInterval(self.STAT_INTERVAL)
+        self.statTimer.timeout.connect(self.refreshLocalVersions)
+        self.statTimer.start()
+
+        # 路径只在配置变化时重新解析, 不在刷新时调用 PathFunc
+        cfg.NapCatPath.valueChanged.connect(self.updateLocalPaths)
+        cfg.QQPath.valueChanged.connect(self.updateLocalPaths)
+
         # 调用方法
         self.getRemoteNapCatUpdate()
         self.getQQDownloadUrl()
         self.getRemoteQQVersion()
 
-        self.getLocalNapCatVersion()
-        self.getLocalQQVersion()
+        self.updateLocalPaths()
 
     def checkUpdate(self) -> dict | None:
         """
@@ -45,7 +88,7 @@ class GetVersion(QObject):
 
         return {
             "result": self.napcatRemoteVersion != self.napcatLocalVersion,
-            "localVersion": self.getLocalNapCatVersion,
+            "localVersion": self.napcatLocalVersion,
             "remoteVersion": self.napcatRemoteVersion
         }
 
@@ -61,12 +104,16 @@ class GetVersion(QObject):
             return
         try:
             reply_dict = json.loads(reply)
-            self.napcatRemoteVersion = reply_dict.get("tag_name", None)
+            version = reply_dict.get("tag_name", None)
             self.napcatUpdateLog = reply_dict.get("body", None)
         except JSONDecodeError:
             logger.error(f"Parsing Json errors, Sending the wrong string:[{reply}]")
             return
 
+        if version != self.napcatRemoteVersion:
+            self.napcatRemoteVersion = version
+            self.napcatRemoteVersionChanged.emit(version)
+
     @timer(180_000)
     @async_request(Urls.QQ_WIN_DOWNLOAD.value)
     def getRemoteQQVersion(self, reply) -> None:
@@ -105,45 +152,131 @@ class GetVersion(QObject):
             "aarch64": QUrl(match_arm)
         }
 
-    @timer(3000)
+    def updateLocalPaths(self, *_) -> None:
+        """
+        ## 重新解析 NapCat 和 QQ 的 package.json 路径并刷新
+        """
+        self.napcatPackagePath = it(PathFunc).getNapCatPath() / "package.json"
+        qqPath = it(PathFunc).getQQPath()
+        self.QQPackagePath = qqPath / "resources/app/package.json" if qqPath is not None else None
+        self._signatures.clear()
+        self.refreshLocalVersions()
+
+    def _directoryChangedSlot(self, *_) -> None:
+        """
+        ## 安装目录发生变化 (安装/卸载/移动), 路径快照可能已经过期
+        """
+        self._pathsStale = True
+        self.debounceTimer.start()
+
+    def refreshLocalVersions(self) -> None:
+        """
+        ## 检查 package.json 是否变化, 变化时重新读取版本并发出信号
+        """
+        if self._pathsStale:
+            self._pathsStale = False
+            it(PathFunc).invalidate()
+            self.updateLocalPaths()
+            return
+        if self._changed(self.napcatPackagePath):
+            self.getLocalNapCatVersion()
+        if self._changed(self.QQPackagePath):
+            self.getLocalQQVersion()
+        self._updateWatchPaths()
+
+    def _changed(self, path: Optional[Path]) -> bool:
+        """
+        ## 比较文件的 stat 签名, 与上次不同返回 True
+        """
+        try:
+            stat = os.stat(path) if path is not None else None
+            signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino) if stat is not None else None
+        except OSError:
+            signature = None
+        key = str(path)
+        if key in self._signatures and self._signatures[key] == signature:
+            return False
+        self._signatures[key] = signature
+        return True
+
+    def _updateWatchPaths(self) -> None:
+        """
+        ## 监听 package.json 以及从它到安装目录上一级的每一级目录
+            - 文件被替换或目录被重命名 (安装/回滚) 后, 原来的监听会失效, 所以每次刷新后都重新同步
+            - 只能监听已经存在的路径
+        """
+        paths = set()
+        for package, depth in ((self.napcatPackagePath, 1), (self.QQPackagePath, 3)):
+            if package is None:
+                continue
+            paths.add(package)
+            # depth 为 package.json 相对安装目录的层数
+            paths.update(package.parents[:depth + 1])
+        paths = {str(path) for path in paths if path.exists()}
+
+        watched = set(self.watcher.files() + self.watcher.directories())
+        if stale := watched - paths:
+            self.watcher.removePaths(list(stale))
+        if new := paths - watched:
+            self.watcher.addPaths(list(new))
+
+    @contextmanager
+    def unwatched(self, root: Path) -> Iterator[None]:
+        """
+        ## 暂时移除 root 及其内部路径的监听, 结束后重新同步并刷新版本
+            - 被监听的目录持有句柄, Windows 上无法重命名, 安装/回滚切换目录前需要先释放
+            - 用法: with it(GetVersion).unwatched(path): ...
+        """
+        released = [
+            path for path in self.watcher.files() + self.watcher.directories()
+            if Path(path) == root or root in Path(path).parents
+        ]
+        if released:
+            self.watcher.removePaths(released)
+        try:
+            yield
+        finally:
+            self._updateWatchPaths()
+            self.debounceTimer.start()
+
     def getLocalNapCatVersion(self) -> None:
         """
         ## 获取本地 NapCat 的版本信息
-            - 每 3 秒读取一次并保存到变量中
+            - 读取并保存到变量中, 版本变化时发出 napcatLocalVersionChanged
         """
         try:
-            # 获取 package.json 路径并读取
-            package_file_path = it(PathFunc).getNapCatPath() / "package.json"
-            with open(str(package_file_path), "r", encoding="utf-8") as f:
-                # 读取到参数返回版本信息
-                self.napcatLocalVersion = f"v{json.loads(f.read())['version']}"
+            # 读取 package.json 获取版本信息
+            with open(str(self.napcatPackagePath), "r", encoding="utf-8") as f:
+                version = f"v{json.loads(f.read())['version']}"
+        except (OSError, JSONDecodeError, KeyError):
+            # 文件不存在或正在写入时视为未安装
+            version = None
 
-        except FileNotFoundError:
-            # 文件不存在则返回 None
-            self.napcatLocalVersion = None
+        if version != self.napcatLocalVersion:
+            self.napcatLocalVersion = version
+            self.napcatLocalVersionChanged.emit(version)
 
-    @timer(3000)
     def getLocalQQVersion(self) -> None:
         """
         ## 获取本地 QQ 的版本信息
-            - 每 3 秒读取一次并保存到变量中
+            - 读取并保存到变量中, 版本变化时发出 QQLocalVersionChanged
         """
         try:
-            # 检查 QQPath
-            if (qqPath := it(PathFunc).getQQPath()) is None:
-                return None
-            # 获取 package.json 路径并读取
-            package_file_path = qqPath / "resources/app/package.json"
-            with open(str(package_file_path), "r", encoding="utf-8") as f:
-                # 读取参数并返回版本信息
+            if self.QQPackagePath is None:
+                raise FileNotFoundError
+            # 读取 package.json 获取版本信息
+            with open(str(self.QQPackagePath), "r", encoding="utf-8") as f:
                 package = json.loads(f.read())
             # 拼接字符串返回版本信息
             platform = "Windows" if package["platform"] == "win32" else "Linux"
-            self.QQLocalVersion = f"{platform} {package['version']}"
-
-        except FileNotFoundError:
+            version = f"{platform} {package['version']}"
+        except (OSError, JSONDecodeError, KeyError):
             # 文件不存在则返回 None
-            self.QQLocalVersion = None
+            version = None
+
+        if version != self.QQLocalVersion:
+            self.QQLocalVersion = version
+            self.QQLocalVersionChanged.emit(version)
 
 
 class GetVersionClassCreator(AbstractCreator, ABC):
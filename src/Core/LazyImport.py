@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+## 延迟导入
+    - httpx / psutil 等较重的依赖只在第一次访问属性时才真正导入, 不占用启动时间
+    - 用法: httpx = lazyImport("httpx"), 之后与普通模块一样使用
+    - 注意: 在函数签名等定义时就会求值的位置访问属性会立即触发导入, 类型注解请使用字符串
+"""
+import importlib
+import threading
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule(ModuleType):
+    """
+    ## 模块代理, 第一次访问属性时导入真正的模块
+        - 导入过程加锁, 多个线程同时访问只会导入一次
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.__dict__["_lazyModule"] = None
+        self.__dict__["_lazyLock"] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        if (module := self.__dict__["_lazyModule"]) is None:
+            with self.__dict__["_lazyLock"]:
+                if (module := self.__dict__["_lazyModule"]) is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazyModule"] = module
+        return module
+
+    def isLoaded(self) -> bool:
+        return self.__dict__["_lazyModule"] is not None
+
+    def __getattr__(self, name: str):
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self.__name__!r}{' (loaded)' if self.isLoaded() else ''}>"
+
+
+# 已创建的代理, 同一个模块只创建一个代理
+_modules: dict = {}
+_lock = threading.Lock()
+
+
+def lazyImport(name: str) -> LazyModule:
+    """
+    ## 返回模块的延迟导入代理
+    """
+    with _lock:
+        module: Optional[LazyModule] = _modules.get(name)
+        if module is None:
+            module = _modules[name] = LazyModule(name)
+        return module
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+## 批量生成 NapCat 配置文件
+    - 根据每个机器人的 Config 渲染 onebot11_<QQID>.json 和 napcat_<QQID>.json
+    - 渲染结果与磁盘上的文件按 sha256 比较, 只写入有差异的文件
+    - 写入先落到临时文件再原子替换, NapCat 不会读到写了一半的配置
+    - dryRun 只生成差异报告 (每个有变化的文件一段 unified diff), 不写入任何文件
+    - 通过 it(NapCatConfigSync) 使用单例, 多次同步之间复用哈希缓存
+"""
+import difflib
+import hashlib
+import json
+import os
+from abc import ABC
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from creart import AbstractCreator, CreateTargetInfo, add_creator, exists_module, it
+from loguru import logger
+
+from src.Core.Config.ConfigModel import Config
+from src.Core.PathFunc import PathFunc
+
+
+def renderOneBotConfig(config: Config) -> dict:
+    """
+    ## 渲染 onebot11_<QQID>.json
+    """
+    return {
+        "http": {
+            "enable": config.connect.http.enable,
+            "host": config.connect.http.host,
+            "port": config.connect.http.port,
+            "secret": config.connect.http.secret,
+            "enableHeart": config.connect.http.enableHeart,
+            "enablePost": config.connect.http.enablePost,
+            "postUrls": [str(url) for url in config.connect.http.postUrls],
+        },
+        "ws": {
+            "enable": config.connect.ws.enable,
+            "host": config.connect.ws.host,
+            "port": config.connect.ws.port,
+        },
+        "reverseWs": {
+            "enable": config.connect.reverseWs.enable,
+            "urls": [str(url) for url in config.connect.reverseWs.urls],
+        },
+        "GroupLocalTime": {
+            "Record": config.advanced.GroupLocalTime.Record,
+            "RecordList": config.advanced.GroupLocalTime.RecordList
+        },
+        "debug": config.advanced.debug,
+        "heartInterval": config.bot.heartInterval,
+        "messagePostFormat": config.bot.messagePostFormat,
+        "enableLocalFile2Url": config.advanced.localFile2url,
+        "musicSignUrl": config.bot.musicSignUrl,
+        "reportSelfMessage": config.bot.reportSelfMsg,
+        "token": config.bot.accessToken,
+    }
+
+
+def renderNapCatConfig(config: Config) -> dict:
+    """
+    ## 渲染 napcat_<QQID>.json
+    """
+    return {
+        "fileLog": config.advanced.fileLog,
+        "consoleLog": config.advanced.consoleLog,
+        "fileLogLevel": config.advanced.fileLogLevel,
+        "consoleLogLevel": config.advanced.consoleLogLevel,
+    }
+
+
+def renderFiles(config: Config) -> Dict[str, bytes]:
+    """
+    ## 渲染一个机器人的全部配置文件 {文件名: 内容}
+    """
+    return {
+        f"onebot11_{config.bot.QQID}.json": json.dumps(renderOneBotConfig(config), indent=4).encode("utf-8"),
+        f"napcat_{config.bot.QQID}.json": json.dumps(renderNapCatConfig(config), indent=4).encode("utf-8"),
+    }
+
+
+def writeAtomic(path: Path, data: bytes) -> None:
+    """
+    ## 写入临时文件后原子替换
+    """
+    tmp = path.with_name(f"{path.name}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class SyncAction(Enum):
+    """配置文件的同步动作"""
+    CREATE = "create"
+    UPDATE = "update"
+    UNCHANGED = "unchanged"
+
+
+@dataclass
+class SyncEntry:
+    """
+    ## 一个配置文件的同步动作
+        - old/new: 有变化的文件同步前后的内容, 新建的文件 old 为空
+    """
+    qqid: str
+    path: Path
+    action: SyncAction
+    old: bytes = b""
+    new: bytes = b""
+
+
+@dataclass
+class SyncReport:
+    """
+    ## 同步结果, dryRun 时为将要执行的动作
+    """
+    dryRun: bool
+    entries: List[SyncEntry] = field(default_factory=list)
+
+    def filter(self, action: SyncAction) -> List[SyncEntry]:
+        return [entry for entry in self.entries if entry.action == action]
+
+    @property
+    def changed(self) -> List[SyncEntry]:
+        return [entry for entry in self.entries if entry.action != SyncAction.UNCHANGED]
+
+    def summary(self) -> str:
+        return (
+            f"新建 {len(self.filter(SyncAction.CREATE))}, "
+            f"更新 {len(self.filter(SyncAction.UPDATE))}, "
+            f"未变化 {len(self.filter(SyncAction.UNCHANGED))}"
+        )
+
+    def diff(self) -> str:
+        """
+        ## 差异报告, 每个有变化的文件一段 unified diff
+        """
+        lines = []
+        for entry in self.changed:
+            lines.extend(difflib.unified_diff(
+                entry.old.decode("utf-8", "replace").splitlines(),
+                entry.new.decode("utf-8", "replace").splitlines(),
+                fromfile="/dev/null" if entry.action == SyncAction.CREATE else str(entry.path),
+                tofile=str(entry.path),
+                lineterm="",
+            ))
+        return "\n".join(lines)
+
+
+class NapCatConfigSync:
+    """
+    ## NapCat 配置同步
+        - 记住每个文件上次的 stat 签名和哈希, 文件未被改动时不需要重新读取
+    """
+
+    def __init__(self, configPath: Optional[Path] = None) -> None:
+        self.configPath = configPath
+        self._hashCache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+    def _diskHash(self, path: Path) -> Optional[str]:
+        """
+        ## 磁盘上文件的 sha256, 不存在返回 None
+        """
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._hashCache.pop(str(path), None)
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if (cached := self._hashCache.get(str(path))) is not None and cached[0] == signature:
+            return cached[1]
+        sha256 = hashlib.sha256(path.read_bytes()).hexdigest()
+        self._hashCache[str(path)] = (signature, sha256)
+        return sha256
+
+    def _remember(self, path: Path, sha256: str) -> None:
+        """
+        ## 记录刚写入的文件的 stat 签名和哈希, 下次同步时不需要重新读取
+        """
+        stat = path.stat()
+        self._hashCache[str(path)] = ((stat.st_mtime_ns, stat.st_size), sha256)
+
+    def sync(self, configs: Iterable[Config], dryRun: bool = False) -> SyncReport:
+        """
+        ## 同步所有机器人的配置文件
+        """
+        configPath = self.configPath or it(PathFunc).getNapCatPath() / "config"
+        if not dryRun:
+            configPath.mkdir(parents=True, exist_ok=True)
+
+        report = SyncReport(dryRun)
+        for config in configs:
+            for name, data in renderFiles(config).items():
+                path = configPath / name
+                current, sha256 = self._diskHash(path), hashlib.sha256(data).hexdigest()
+                if current == sha256:
+                    report.entries.append(SyncEntry(config.bot.QQID, path, SyncAction.UNCHANGED))
+                    continue
+
+                report.entries.append(SyncEntry(
+                    config.bot.QQID, path, SyncAction.CREATE if current is None else SyncAction.UPDATE,
+                    b"" if current is None else path.read_bytes(), data
+                ))
+                if not dryRun:
+                    writeAtomic(path, data)
+                    self._remember(path, sha256)
+
+        logger.info(f"{'(预览) ' if dryRun else ''}同步 NapCat 配置: {report.summary()}")
+        return report
+
+
+class NapCatConfigSyncClassCreator(AbstractCreator, ABC):
+    # 定义类方法targets，该方法返回一个元组，元组中包含了一个CreateTargetInfo对象，
+    # 该对象描述了创建目标的相关信息，包括应用程序名称和类名。
+    targets = (CreateTargetInfo("src.Core.NapCatConfigSync", "NapCatConfigSync"),)
+
+    # 静态方法available()，用于检查模块"NapCatConfigSync"是否存在，返回值为布尔型。
+    @staticmethod
+    def available() -> bool:
+        return exists_module("src.Core.NapCatConfigSync")
+
+    # 静态方法create()，用于创建NapCatConfigSync类的实例，返回值为NapCatConfigSync对象。
+    @staticmethod
+    def create(create_type: [NapCatConfigSync]) -> NapCatConfigSync:
+        return NapCatConfigSync()
+
+
+add_creator(NapCatConfigSyncClassCreator)
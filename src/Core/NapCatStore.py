@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+## 多版本 NapCat 仓库
+    - objects/<sha256 前两位>/<sha256>: 按内容寻址的文件, 相同内容在所有版本中只保存一份
+    - versions/<版本号>/: 由指向 objects 的硬链接组成的完整 NapCat 目录
+    - 每个版本的 config 链接到 NapCat 安装目录下的 config, 所有版本共用同一份 bot 配置
+    - bot 启动时按 BotConfig.napcatVersion 选择目录, 切换版本不需要下载和解压
+"""
+import json
+import os
+import re
+import shutil
+import threading
+from abc import ABC
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, Signal
+from creart import AbstractCreator, CreateTargetInfo, add_creator, exists_module, it
+from loguru import logger
+
+from src.Core.ArtifactCache import sha256File
+from src.Core.PathFunc import PathFunc
+
+
+def versionKey(version: str) -> Tuple[Tuple[int, ...], bool, str]:
+    """
+    ## 版本号的排序键
+        - 按数字逐段比较, v4.10.0 高于 v4.9.0
+        - 带后缀的预发布版本 (例如 v4.10.0-beta.1) 低于同号的正式版, 无法解析的名称排在最后
+    """
+    if (match := re.match(r"v?(\d+(?:\.\d+)*)(.*)", version)) is None:
+        return (), False, version
+    return tuple(map(int, match[1].split("."))), not match[2], version
+
+
+class NapCatStore(QObject):
+    """
+    ## 本地 NapCat 版本仓库
+    """
+    # 仓库中的版本发生变化
+    versionsChanged = Signal()
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.path = it(PathFunc).base_path / "NapCatStore"
+        self.objectsPath = self.path / "objects"
+        self.versionsPath = self.path / "versions"
+        self.objectsPath.mkdir(parents=True, exist_ok=True)
+        self.versionsPath.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        # 在后台收录当前安装的版本
+        self.importTreeAsync(it(PathFunc).getNapCatPath())
+
+    def versions(self) -> List[str]:
+        """
+        ## 仓库中已有的版本
+        """
+        return sorted(
+            (item.name for item in self.versionsPath.iterdir() if item.is_dir() and not item.name.endswith(".tmp")),
+            key=versionKey, reverse=True
+        )
+
+    def versionPath(self, version: str) -> Path:
+        return self.versionsPath / version
+
+    def resolve(self, version: Optional[str]) -> Path:
+        """
+        ## 获取 bot 应使用的 NapCat 目录
+            - version 为空或仓库中没有该版本时使用 NapCat 安装目录
+        """
+        if version and (path := self.versionPath(version)).is_dir():
+            return path
+        if version:
+            logger.warning(f"仓库中没有 NapCat {version}, 使用当前安装的版本")
+        return it(PathFunc).getNapCatPath()
+
+    @staticmethod
+    def readVersion(root: Path) -> Optional[str]:
+        """
+        ## 从 package.json 读取 NapCat 目录的版本号
+        """
+        try:
+            return json.loads((root / "package.json").read_text(encoding="utf-8"))["version"]
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    def importTreeAsync(self, root: Path) -> None:
+        threading.Thread(target=self.importTree, args=(root,), name="NapCatStoreImport", daemon=True).start()
+
+    def importTree(self, root: Path, version: Optional[str] = None) -> Optional[str]:
+        """
+        ## 将 NapCat 目录收录为一个版本, 返回版本号
+            - 文件以硬链接存入 objects, 不复制数据; 已有的相同内容直接复用
+            - 先在临时目录组装, 完成后重命名, 中途失败不会留下不完整的版本
+        """
+        version = version or self.readVersion(root)
+        if version is None:
+            return None
+
+        with self._lock:
+            target = self.versionPath(version)
+            if target.is_dir():
+                return version
+
+            tmp = self.versionsPath / f"{version}.tmp"
+            self._removeTree(tmp)
+            tmp.mkdir()
+            # 安装时已经计算过的 sha256 无需重新计算
+            hashes = self._manifestHashes(root)
+            try:
+                for item in sorted(root.rglob("*")):
+                    relative = item.relative_to(root)
+                    # bot 配置由所有版本共用, 不收录
+                    if relative.parts[0] == "config":
+                        continue
+                    if item.is_dir():
+                        (tmp / relative).mkdir(parents=True, exist_ok=True)
+                        continue
+                    self._link(self._storeObject(item, hashes.get(relative.as_posix())), tmp / relative)
+
+                self._linkConfig(tmp)
+                tmp.rename(target)
+            except OSError as e:
+                logger.error(f"收录 NapCat {version} 时引发 {type(e).__name__}: {e}")
+                self._removeTree(tmp)
+                return None
+
+        logger.info(f"已收录 NapCat {version} 到版本仓库")
+        self.versionsChanged.emit()
+        return version
+
+    def remove(self, version: str) -> None:
+        """
+        ## 删除一个版本, 并清理不再被任何版本引用的文件
+        """
+        with self._lock:
+            self._removeTree(self.versionPath(version))
+            self._collectGarbage()
+        self.versionsChanged.emit()
+
+    @staticmethod
+    def _manifestHashes(root: Path) -> Dict[str, str]:
+        """
+        ## 读取安装清单中记录的 sha256 {相对路径: sha256}
+        """
+        try:
+            manifest = json.loads((root / ".ncd_manifest.json").read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+        return {name: entry["sha256"] for name, entry in manifest.items() if "sha256" in entry}
+
+    def _storeObject(self, file: Path, sha256: Optional[str] = None) -> Path:
+        """
+        ## 将文件存入 objects, 返回对象路径
+        """
+        sha256 = sha256 or sha256File(file)
+        obj = self.objectsPath / sha256[:2] / sha256
+        if not obj.exists():
+            obj.parent.mkdir(exist_ok=True)
+            self._link(file, obj)
+        return obj
+
+    @staticmethod
+    def _link(source: Path, target: Path) -> None:
+        """
+        ## 创建硬链接, 跨卷等不支持的情况退化为复制
+        """
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copy2(source, target)
+
+    @staticmethod
+    def _linkConfig(tree: Path) -> None:
+        """
+        ## 将版本目录的 config 链接到安装目录的 config
+            - 优先使用目录符号链接, Windows 下失败时使用目录联接 (junction)
+        """
+        config = it(PathFunc).getNapCatPath() / "config"
+        config.mkdir(parents=True, exist_ok=True)
+        try:
+            os.symlink(config, tree / "config", target_is_directory=True)
+        except OSError:
+            if os.name != "nt":
+                raise
+            import _winapi
+            _winapi.CreateJunction(str(config), str(tree / "config"))
+
+    @staticmethod
+    def _removeTree(tree: Path) -> None:
+        """
+        ## 删除版本目录, 先移除 config 链接以免删到共用的配置
+        """
+        config = tree / "config"
+        if config.is_symlink() or (hasattr(os.path, "isjunction") and os.path.isjunction(config)):
+            os.unlink(config)
+        shutil.rmtree(tree, ignore_errors=True)
+
+    def _collectGarbage(self) -> None:
+        """
+        ## 删除只剩仓库自身引用的对象
+            - 对象与 NapCat 安装目录中的文件也可能是同一个硬链接, 此时链接数大于 1, 不会被删除
+        """
+        for obj in self.objectsPath.glob("*/*"):
+            if obj.stat().st_nlink <= 1:
+                obj.unlink()
+
+
+class NapCatStoreClassCreator(AbstractCreator, ABC):
+    # 定义类方法targets，该方法返回一个元组，元组中包含了一个CreateTargetInfo对象，
+    # 该对象描述了创建目标的相关信息，包括应用程序名称和类名。
+    targets = (CreateTargetInfo("src.Core.NapCatStore", "NapCatStore"),)
+
+    # 静态方法available()，用于检查模块"NapCatStore"是否存在，返回值为布尔型。
+    @staticmethod
+    def available() -> bool:
+        return exists_module("src.Core.NapCatStore")
+
+    # 静态方法create()，用于创建NapCatStore类的实例，返回值为NapCatStore对象。
+    @staticmethod
+    def create(create_type: [NapCatStore]) -> NapCatStore:
+        return NapCatStore()
+
+
+add_creator(NapCatStoreClassCreator)
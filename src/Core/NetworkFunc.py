@@ -1,15 +1,28 @@
 # -*- coding: utf-8 -*-
+import hashlib
+import json
+import random
+import time
 from abc import ABC
+from bisect import bisect_left
+from collections import deque
 from enum import Enum
 from pathlib import Path
-from typing import Callable, Any
+from typing import Callable, Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import quote
 
-import httpx
-from PySide6.QtCore import QUrl, Signal, QObject, QThread
+from PySide6.QtCore import QUrl, Signal, QObject, QThread, QTimer
 from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
 from creart import exists_module, AbstractCreator, CreateTargetInfo, add_creator, it
 from loguru import logger
 
+from src.Core import timer
+from src.Core.LazyImport import lazyImport
+from src.Core.RateLimiter import BandwidthShaper
+
+# 只在后台线程下载和检测网络时使用, 延迟到第一次使用时导入
+httpx = lazyImport("httpx")
+
 
 class Urls(Enum):
     """
@@ -69,10 +82,297 @@ class NetworkFuncClassCreator(AbstractCreator, ABC):
 add_creator(NetworkFuncClassCreator)
 
 
-def async_request(url: QUrl, _bytes: bool = False) -> Callable[[Callable[..., None]], Callable[..., None]]:
+class RequestPriority(Enum):
+    """
+    ## 请求的优先级分类
+        - INTERACTIVE: 用户触发的请求, 优先调度
+        - BACKGROUND: 后台轮询(版本检查等)
+        - BULK: 头像等批量请求, 最后调度
+    """
+    INTERACTIVE = 0
+    BACKGROUND = 1
+    BULK = 2
+
+
+class RequestTask:
+    """
+    ## RequestScheduler 内部的一个请求任务
+    """
+
+    def __init__(
+            self, url: QUrl, callback: Callable[[QNetworkReply], None], priority: RequestPriority,
+            timeout: int, retries: int, ownerKey: Optional[int]
+    ) -> None:
+        self.url = url
+        self.callback = callback
+        self.priority = priority
+        self.timeout = timeout  # 单次请求的截止时间(毫秒)
+        self.retries = retries  # 剩余可重试次数
+        self.ownerKey = ownerKey
+        self.attempt = 0
+        self.cancelled = False
+        self.enqueueTime = time.monotonic()
+        self.reply: Optional[QNetworkReply] = None
+        self.deadlineTimer: Optional[QTimer] = None
+
+    def cancel(self) -> None:
+        """
+        ## 取消任务, 回调不会再被调用
+        """
+        it(RequestScheduler).cancel(self)
+
+
+class RequestScheduler(QObject):
+    """
+    ## 网络请求调度器
+        - 按优先级分类排队, 每个分类有独立的并发上限
+        - 每个请求都有截止时间, 超时后中断并按抖动退避重试
+        - 请求的发起者(owner)销毁时自动取消其所有请求
+        - 统计队列深度和延迟直方图, 定期导出到 log 目录
+    """
+    # 每个分类的并发上限
+    CONCURRENCY = {
+        RequestPriority.INTERACTIVE: 6,
+        RequestPriority.BACKGROUND: 2,
+        RequestPriority.BULK: 4,
+    }
+    # 延迟直方图的桶(毫秒), 最后一个桶为 +inf
+    LATENCY_BUCKETS = [50, 100, 250, 500, 1000, 2500, 5000, 10000]
+    # 退避基数与上限(毫秒)
+    BACKOFF_BASE = 500
+    BACKOFF_MAX = 30_000
+    # 可重试的错误
+    RETRYABLE_ERRORS = {
+        QNetworkReply.NetworkError.OperationCanceledError,
+        QNetworkReply.NetworkError.TimeoutError,
+        QNetworkReply.NetworkError.RemoteHostClosedError,
+        QNetworkReply.NetworkError.TemporaryNetworkFailureError,
+        QNetworkReply.NetworkError.NetworkSessionFailedError,
+        QNetworkReply.NetworkError.ProxyTimeoutError,
+        QNetworkReply.NetworkError.HostNotFoundError,
+        QNetworkReply.NetworkError.InternalServerError,
+        QNetworkReply.NetworkError.ServiceUnavailableError,
+        QNetworkReply.NetworkError.UnknownServerError,
+    }
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.queues: Dict[RequestPriority, Deque[RequestTask]] = {p: deque() for p in RequestPriority}
+        self.running: Dict[RequestPriority, List[RequestTask]] = {p: [] for p in RequestPriority}
+        self.owners: Dict[int, List[RequestTask]] = {}
+
+        # 统计数据
+        self.histogram: Dict[RequestPriority, List[int]] = {
+            p: [0] * (len(self.LATENCY_BUCKETS) + 1) for p in RequestPriority
+        }
+        self.counters: Dict[str, int] = {
+            "submitted": 0, "succeeded": 0, "failed": 0, "retried": 0, "cancelled": 0, "timedOut": 0
+        }
+        self.exportMetrics()
+
+    def submit(
+            self, url: QUrl, callback: Callable[[QNetworkReply], None], owner: Optional[QObject] = None,
+            priority: RequestPriority = RequestPriority.BACKGROUND, timeout: int = 15_000, retries: int = 2
+    ) -> RequestTask:
+        """
+        ## 提交一个 GET 请求
+            - url: 请求地址
+            - callback: 请求最终完成(成功或放弃重试)后调用, 参数为 QNetworkReply, 回调结束后 reply 会被释放
+            - owner: 请求的发起者, 销毁时取消请求
+            - priority: 请求的优先级分类
+            - timeout: 单次请求的截止时间(毫秒)
+            - retries: 最多重试次数
+        """
+        ownerKey = None
+        if owner is not None:
+            ownerKey = id(owner)
+            if ownerKey not in self.owners:
+                self.owners[ownerKey] = []
+                # 发起者销毁时取消其所有请求
+                owner.destroyed.connect(lambda *_, key=ownerKey: self.cancelOwner(key))
+
+        task = RequestTask(QUrl(url), callback, priority, timeout, retries, ownerKey)
+        if ownerKey is not None:
+            self.owners[ownerKey].append(task)
+
+        self.counters["submitted"] += 1
+        self.queues[priority].append(task)
+        self._dispatch()
+        return task
+
+    def cancel(self, task: RequestTask) -> None:
+        """
+        ## 取消一个请求任务
+        """
+        if task.cancelled:
+            return
+        task.cancelled = True
+        self.counters["cancelled"] += 1
+
+        if task in self.queues[task.priority]:
+            self.queues[task.priority].remove(task)
+        if task.reply is not None:
+            # 中断正在进行的请求, finished 信号中会进行清理
+            task.reply.abort()
+        self._forget(task)
+
+    def cancelOwner(self, ownerKey: int) -> None:
+        """
+        ## 取消某个发起者的所有请求
+        """
+        for task in list(self.owners.pop(ownerKey, [])):
+            self.cancel(task)
+
+    def queueDepth(self) -> Dict[str, int]:
+        """
+        ## 返回每个分类的排队数量
+        """
+        return {p.name: len(queue) for p, queue in self.queues.items()}
+
+    def metrics(self) -> dict:
+        """
+        ## 返回调度器的统计数据
+        """
+        buckets = [f"<={bucket}ms" for bucket in self.LATENCY_BUCKETS] + ["+inf"]
+        return {
+            "queueDepth": self.queueDepth(),
+            "running": {p.name: len(tasks) for p, tasks in self.running.items()},
+            "latency": {p.name: dict(zip(buckets, counts)) for p, counts in self.histogram.items()},
+            "counters": dict(self.counters),
+        }
+
+    @timer(60_000)
+    def exportMetrics(self) -> None:
+        """
+        ## 每分钟将统计数据导出到 log/network_metrics.json
+        """
+        try:
+            with open(Path.cwd() / "log" / "network_metrics.json", "w", encoding="utf-8") as f:
+                json.dump(self.metrics(), f, indent=4)
+        except OSError as e:
+            logger.warning(f"导出网络请求统计数据失败: {e}")
+
+    def _dispatch(self) -> None:
+        """
+        ## 按优先级顺序, 在并发上限内启动排队中的请求
+        """
+        for priority in RequestPriority:
+            queue = self.queues[priority]
+            while queue and len(self.running[priority]) < self.CONCURRENCY[priority]:
+                self._start(queue.popleft())
+
+    def _start(self, task: RequestTask) -> None:
+        """
+        ## 发起请求并设置截止时间
+        """
+        task.attempt += 1
+        request = QNetworkRequest(task.url)
+        request.setAttribute(QNetworkRequest.Attribute.RedirectPolicyAttribute,
+                             QNetworkRequest.RedirectPolicy.NoLessSafeRedirectPolicy)
+        task.reply = it(NetworkFunc).manager.get(request)
+        task.reply.finished.connect(lambda: self._onFinished(task))
+        self.running[task.priority].append(task)
+
+        # 截止时间到了就中断请求
+        task.deadlineTimer = QTimer(self)
+        task.deadlineTimer.setSingleShot(True)
+        task.deadlineTimer.timeout.connect(lambda: self._onDeadline(task))
+        task.deadlineTimer.start(task.timeout)
+
+    def _onDeadline(self, task: RequestTask) -> None:
+        """
+        ## 请求超过截止时间
+        """
+        if task.reply is not None and task.reply.isRunning():
+            logger.warning(f"请求 {task.url.toString()} 超过截止时间 {task.timeout}ms, 已中断")
+            self.counters["timedOut"] += 1
+            task.reply.abort()
+
+    def _onFinished(self, task: RequestTask) -> None:
+        """
+        ## 请求完成的处理, 包括重试, 统计和回调
+        """
+        reply, task.reply = task.reply, None
+        if task.deadlineTimer is not None:
+            task.deadlineTimer.stop()
+            task.deadlineTimer.deleteLater()
+            task.deadlineTimer = None
+        if task in self.running[task.priority]:
+            self.running[task.priority].remove(task)
+
+        try:
+            if task.cancelled:
+                return
+
+            error = reply.error()
+            if error != QNetworkReply.NetworkError.NoError and error in self.RETRYABLE_ERRORS and task.retries > 0:
+                # 按抖动的指数退避重新排队
+                task.retries -= 1
+                self.counters["retried"] += 1
+                delay = min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** (task.attempt - 1))
+                delay = int(delay * random.uniform(0.5, 1.5))
+                logger.info(f"请求 {task.url.toString()} 失败({reply.errorString()}), {delay}ms 后重试")
+                QTimer.singleShot(delay, lambda: self._requeue(task))
+                return
+
+            # 记录延迟
+            latency = (time.monotonic() - task.enqueueTime) * 1000
+            self.histogram[task.priority][bisect_left(self.LATENCY_BUCKETS, latency)] += 1
+            self.counters["succeeded" if error == QNetworkReply.NetworkError.NoError else "failed"] += 1
+
+            self._forget(task)
+            task.callback(reply)
+        finally:
+            reply.deleteLater()
+            self._dispatch()
+
+    def _requeue(self, task: RequestTask) -> None:
+        """
+        ## 退避结束后重新排队
+        """
+        if task.cancelled:
+            return
+        self.queues[task.priority].append(task)
+        self._dispatch()
+
+    def _forget(self, task: RequestTask) -> None:
+        """
+        ## 从发起者的请求列表中移除任务
+        """
+        if task.ownerKey is not None and task in self.owners.get(task.ownerKey, []):
+            self.owners[task.ownerKey].remove(task)
+
+
+class RequestSchedulerClassCreator(AbstractCreator, ABC):
+    # 定义类方法targets，该方法返回一个元组，元组中包含了一个CreateTargetInfo对象，
+    # 该对象描述了创建目标的相关信息，包括应用程序名称和类名。
+    targets = (CreateTargetInfo("src.Core.NetworkFunc", "RequestScheduler"),)
+
+    # 静态方法available()，用于检查模块"NetworkFunc"是否存在，返回值为布尔型。
+    @staticmethod
+    def available() -> bool:
+        return exists_module("src.Core.NetworkFunc")
+
+    # 静态方法create()，用于创建RequestScheduler类的实例，返回值为RequestScheduler对象。
+    @staticmethod
+    def create(create_type: [RequestScheduler]) -> RequestScheduler:
+        return RequestScheduler()
+
+
+add_creator(RequestSchedulerClassCreator)
+
+
+def async_request(
+        url: QUrl, _bytes: bool = False, priority: RequestPriority = RequestPriority.BACKGROUND,
+        timeout: int = 15_000, retries: int = 2
+) -> Callable[[Callable[..., None]], Callable[..., None]]:
     """
     装饰器函数，用于装饰其他函数，使其在QUrl请求完成后执行
         - url (QUrl): 用于进行网络请求的QUrl对象。
+        - _bytes (bool): 是否直接返回字节
+        - priority (RequestPriority): 请求的优先级分类
+        - timeout (int): 单次请求的截止时间(毫秒)
+        - retries (int): 失败后的最多重试次数
     """
     def decorator(func: Callable[..., None]) -> Callable[..., None]:
         """
@@ -81,132 +381,199 @@ def async_request(url: QUrl, _bytes: bool = False) -> Callable[[Callable[..., No
         """
         def wrapper(*args: Any, **kwargs: Any) -> None:
             """
-            包装函数，用于执行网络请求并在请求完成后调用被装饰的函数。
+            包装函数，通过 RequestScheduler 执行网络请求并在请求完成后调用被装饰的函数。
                 - *args: 传递给被装饰函数的位置参数
                 - **kwargs: 传递给被装饰函数的关键字参数
             """
             def on_finished(_reply: QNetworkReply) -> None:
                 """
                 请求完成后的回调函数，读取响应并调用被装饰的函数。
-                    - _reply (QNetworkReply): 网络响应对象
-                    - _bytes (bool): 是否直接返回字节
+                    - _reply (QNetworkReply): 网络响应对象, 由调度器负责清理
                 """
                 if _reply.error() == QNetworkReply.NetworkError.NoError:
                     # 调用被装饰的函数并传递响应数据
                     if _bytes:
-                        func(*args, reply=_reply.readAll().data(), *kwargs)
+                        func(*args, reply=_reply.readAll().data(), **kwargs)
                     else:
-                        func(*args, reply=_reply.readAll().data().decode().strip(), *kwargs)
+                        func(*args, reply=_reply.readAll().data().decode().strip(), **kwargs)
                 else:
-                    func(*args, reply=None, *kwargs)
+                    func(*args, reply=None, **kwargs)
                     logger.error(f"Error: {_reply.errorString()}")
-                # 清理回复对象
-                _reply.deleteLater()
 
-            # 创建并发送网络请求
-            request = QNetworkRequest(url)
-            reply = it(NetworkFunc).manager.get(request)
-            # 连接请求完成信号到回调函数
-            reply.finished.connect(lambda: on_finished(reply))
+            # 如果被装饰的是 QObject 的方法, 则以实例作为发起者, 实例销毁时取消请求
+            owner = args[0] if args and isinstance(args[0], QObject) else None
+            it(RequestScheduler).submit(url, on_finished, owner, priority, timeout, retries)
 
         return wrapper
     return decorator
 
 
-class NapCatDownloader(QThread):
+# 每次读取的块大小, 块越小限速越平滑
+DOWNLOAD_CHUNK_SIZE = 16 * 1024
+
+
+def githubReachable() -> bool:
+    """
+    ## 检查网络能否正常访问 Github
+    """
+    try:
+        logger.info(f"{'-' * 10} 检查网络环境 {'-' * 10}")
+        # 如果 5 秒内能访问到 Github 表示网络环境非常奈斯
+        response = httpx.head(r"https://github.com", timeout=5)
+        logger.info("网络环境非常奈斯")
+        return response.status_code == 200
+    except httpx.RequestError as e:
+        # 引发错误返回 False
+        return False
+
+
+def artifactSources(
+        url: QUrl, version: Optional[str] = None, useMirror: bool = True
+) -> List[Tuple[str, Optional[str]]]:
+    """
+    ## 获取产物的下载来源 [(下载地址, 期望的 sha256)], 按优先级排列
+        - 配置了局域网镜像时优先使用镜像, 期望的 sha256 取自镜像的 manifest.json
+        - 镜像的清单无法读取或没有该文件时不使用镜像, 未经校验的文件 (如注入 QQ 的 dll) 不能来自局域网
+        - version 不为 None 时只使用版本一致的镜像条目, 用于文件名不带版本的 latest 地址
+        - useMirror 为 False 时 (如无法确定需要的版本) 直接使用原地址
+        - 最后回退到原地址
+    """
+    from src.Core.Config import cfg
+
+    sources = []
+    if useMirror and (mirror := cfg.get(cfg.ArtifactMirror).strip().rstrip("/")):
+        name = url.fileName()
+        try:
+            response = httpx.get(f"{mirror}/manifest.json", timeout=3)
+            response.raise_for_status()
+            manifest = response.json()
+            if name not in manifest:
+                logger.info(f"镜像 {mirror} 中没有 {name}, 使用原地址下载")
+            elif version is not None and manifest[name].get("version") != version:
+                logger.info(
+                    f"镜像 {mirror} 中的 {name} 版本为 {manifest[name].get('version')}, 需要 {version}, 使用原地址下载"
+                )
+            else:
+                sources.append((f"{mirror}/{quote(name)}", manifest[name]["sha256"]))
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            logger.warning(f"读取镜像 {mirror} 的清单失败, 使用原地址下载, {type(e).__name__}: {e}")
+
+    sources.append((url.url(), None))
+    return sources
+
+
+def downloadArtifact(
+        url: QUrl, target: Path,
+        onProgress: Optional[Callable[[int, int], None]] = None,
+        isStopped: Optional[Callable[[], bool]] = None,
+        version: Optional[str] = None, useMirror: bool = True
+) -> bool:
     """
-    ## 执行下载 NapCat 的任务
+    ## 下载产物到 target, 返回是否成功
+        - 依次尝试 artifactSources 给出的来源, sha256 与清单不符时丢弃并尝试下一个
+        - 下载成功后连同 version 放入 ArtifactCache, 开启分享时其他实例即可从本机获取
+        - onProgress(已下载字节数, 总字节数) 报告进度, 总大小未知时为 0
+        - isStopped() 返回 True 时中止下载并返回 False
+    """
+    from src.Core.ArtifactCache import ArtifactCache
+
+    for source, sha256 in artifactSources(url, version, useMirror):
+        try:
+            digest = _streamDownload(source, target, onProgress, isStopped)
+        except (httpx.HTTPError, OSError) as e:
+            logger.warning(f"从 {source} 下载失败, {type(e).__name__}: {e}")
+            continue
+
+        if digest is None:
+            logger.info(f"下载 {url.fileName()} 已取消")
+            return False
+        if sha256 is not None and digest != sha256:
+            logger.warning(f"{source} 的 sha256 ({digest}) 与清单 ({sha256}) 不符, 已丢弃")
+            target.unlink(missing_ok=True)
+            continue
+
+        it(ArtifactCache).store(target, url.fileName(), digest, version)
+        return True
+
+    return False
+
+
+def _streamDownload(
+        url: str, target: Path,
+        onProgress: Optional[Callable[[int, int], None]],
+        isStopped: Optional[Callable[[], bool]]
+) -> Optional[str]:
+    """
+    ## 流式下载到 target, 边写边计算 sha256, 取消时返回 None
+    """
+    digest = hashlib.sha256()
+    # 限速器, 不限速时为 None
+    limiter = it(BandwidthShaper).createLimiter()
+
+    with httpx.stream("GET", url, follow_redirects=True) as response:
+        response.raise_for_status()
+        total = int(response.headers.get("content-length", 0))
+
+        with open(target, "wb") as file:
+            for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                if isStopped is not None and isStopped():
+                    return None
+                if limiter is not None:
+                    limiter.consume(len(chunk))
+                file.write(chunk)
+                digest.update(chunk)
+                if onProgress is not None:
+                    onProgress(file.tell(), total)
+
+    return digest.hexdigest()
+
+
+class Downloader(QThread):
+    """
+    ## 通用的文件下载任务 (QQ 安装包等)
+        - 下载到 path 目录下, 文件名取自 url
+        - 优先使用局域网镜像 (见 artifactSources), 并受 BandwidthShaper 限速
     """
-    # 进度条模式切换 (进度模式: 0 \ 未知进度模式: 1 \ 文字模式: 2)
-    progressBarToggle = Signal(int)
     # 下载进度
     downloadProgress = Signal(int)
-    # 下载完成
-    downloadFinish = Signal()
-    # 引发错误导致结束
-    errorFinsh = Signal()
+    # 下载结束, 参数表示是否成功
+    downloadFinish = Signal(bool)
 
-    def __init__(self, url: QUrl, path: Path):
+    def __init__(self, url: QUrl = None, path: Path = None):
         """
         ## 初始化下载器
             - url 下载连接
             - path 下载路径
         """
         super().__init__()
-        self.url: QUrl = url if url else None
-        self.path: Path = path if path else None
+        self.url: Optional[QUrl] = url
+        self.path: Optional[Path] = path
+        self._stop = False
 
     def run(self) -> None:
         """
-        ## 运行下载 NapCat 的任务
-            - 自动检查是否需要使用代理
-            - 尽可能下载成功
+        ## 执行下载
         """
-        # 调整按钮样式为禁用
-        self.progressBarToggle.emit(3)
-
-        # 检查网络环境
-        if not self.checkNetwork():
-            # 如果网络环境不好, 则调整下载链接
-            self.url = QUrl(f"https://gh.ddlc.top/{self.url.url()}")
-
-        # 开始下载
-        try:
-            logger.info(f"{'-' * 10} 开始下载 NapCat ~ {'-' * 10}")
-            with httpx.stream('GET', self.url.url(), follow_redirects=True) as response:
-
-                if (total_size := int(response.headers.get('content-length', 0))) == 0:
-                    print(response.headers, total_size)
-                    # 尝试获取文件大小
-                    logger.error("无法获取文件大小, Content-Length为空或无法连接到下载链接")
-                    self.progressBarToggle.emit(2)
-                    self.errorFinsh.emit()
-                    return
-
-                self.progressBarToggle.emit(0)  # 设置进度条为 进度模式
-
-                with open(f'{self.path}/{self.url.fileName()}', 'wb') as file:
-                    for chunk in response.iter_bytes():
-                        file.write(chunk)  # 写入字节
-                        self.downloadProgress.emit(int((file.tell() / total_size) * 100))  # 设置进度条
-
-            # 下载完成
-            self.downloadFinish.emit()  # 发送下载完成信号
-            logger.info(f"{'-' * 10} 下载 NapCat 结束 ~ {'-' * 10}")
-
-        except httpx.HTTPStatusError as e:
-            logger.error(
-                f"发送下载 NapCat 请求时引发 HTTPStatusError, "
-                f"响应码: {e.response.status_code}, 响应内容: {e.response.content}"
-            )
-            self.errorFinsh.emit()
-        except (httpx.RequestError, FileNotFoundError, PermissionError, Exception) as e:
-            logger.error(f"下载 NapCat 时引发 {type(e).__name__}: {e}")
-            self.errorFinsh.emit()
-
-        finally:
-            # 无论是否出错,都会重置
-            self.downloadProgress.emit(0)  # 重置进度条进度
-            self.progressBarToggle.emit(2)  # 设置进度条为 文字模式
-            self.progressBarToggle.emit(4)  # 解除禁用
-
-    def checkNetwork(self):
+        self._stop = False
+        logger.info(f"{'-' * 10} 开始下载 {self.url.fileName()} {'-' * 10}")
+        result = downloadArtifact(
+            self.url, self.path / self.url.fileName(), self._onProgress, lambda: self._stop
+        )
+        logger.info(f"{'-' * 10} 下载 {self.url.fileName()} 结束 {'-' * 10}")
+        self.downloadFinish.emit(result)
+
+    def _onProgress(self, received: int, total: int) -> None:
+        if total:
+            self.downloadProgress.emit(int((received / total) * 100))
+
+    def stop(self) -> None:
         """
-        ## 检查网络能否正常访问 Github
+        ## 停止下载, 在读取下一个块时生效
         """
-        try:
-            logger.info(f"{'-' * 10} 检查网络环境 {'-' * 10}")
-            self.progressBarToggle.emit(1)  # 设置进度条为 未知进度模式
-            # 如果 5 秒内能访问到 Github 表示网络环境非常奈斯
-            response = httpx.head(r"https://github.com", timeout=5)
-            logger.info("网络环境非常奈斯")
-            return response.status_code == 200
-        except httpx.RequestError as e:
-            # 引发错误返回 False
-            return False
+        self._stop = True
 
     def setUrl(self, url: QUrl):
         self.url = url
 
     def setPath(self, path: Path):
-        self.path = path
\ No newline at end of file
+        self.path = path
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
+import threading
 import winreg
 from abc import ABC
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 from PySide6.QtCore import QOperatingSystemVersion
 from creart import add_creator, exists_module
@@ -9,6 +12,16 @@ from creart.creator import AbstractCreator, CreateTargetInfo
 from loguru import logger
 
 
+@dataclass(frozen=True)
+class ResolvedPaths:
+    """
+    ## 解析后的路径快照, 不可变
+    """
+    qq: Optional[Path]
+    napcat: Path
+    startScript: Path
+
+
 class PathFunc:
 
     def __init__(self):
@@ -24,6 +37,10 @@ class PathFunc:
         self.napcat_path = self.base_path / "NapCat"
         self.start_script = self.base_path / "StartScript"
 
+        # 路径快照, 配置项或安装目录变化时失效, 下次访问时重新解析
+        self._snapshot: Optional[ResolvedPaths] = None
+        self._snapshotLock = threading.RLock()
+
         self.pathValidator()
 
     def pathValidator(self) -> None:
@@ -58,10 +75,61 @@ class PathFunc:
 
         logger.info(f"{'-' * 10}路径验证完成{'-' * 10}")
 
+    def paths(self) -> ResolvedPaths:
+        """
+        ## 获取路径快照
+            - 只在快照失效后解析一次, 之后直接返回, 不再访问注册表或写入配置
+        """
+        if (snapshot := self._snapshot) is not None:
+            return snapshot
+        with self._snapshotLock:
+            if self._snapshot is None:
+                # 解析过程中写入配置会触发 invalidate, 所以先解析完再赋值
+                snapshot = ResolvedPaths(
+                    qq=self._resolveQQPath(),
+                    napcat=self._resolveNapCatPath(),
+                    startScript=self._resolveStartScriptPath(),
+                )
+                self._snapshot = snapshot
+            return self._snapshot
+
+    def invalidate(self, *_) -> None:
+        """
+        ## 使路径快照失效
+            - 连接到路径配置项的 valueChanged, 以及安装目录的文件监听
+            - 与快照创建使用同一把锁, 否则其他线程正在解析的旧路径会在清除后被写回
+        """
+        with self._snapshotLock:
+            self._snapshot = None
+
     def getQQPath(self) -> Path | None:
         """
         获取QQ路径
         """
+        return self.paths().qq
+
+    def getQQIndexPath(self) -> Path:
+        """
+        ## 获取 QQ 的 index.js 文件路径
+        """
+        return self.getQQPath() / r"resources/app/app_launcher/index.js"
+
+    def getNapCatPath(self) -> Path:
+        """
+        ## 获取 NapCat 路径
+        """
+        return self.paths().napcat
+
+    def getStartScriptPath(self) -> Path:
+        """
+        ## 获取启动脚本路径
+        """
+        return self.paths().startScript
+
+    def _resolveQQPath(self) -> Path | None:
+        """
+        ## 解析 QQ 路径
+        """
         from src.Core.Config import cfg
 
         try:
@@ -87,15 +155,9 @@ class PathFunc:
         except FileNotFoundError:
             return None
 
-    def getQQIndexPath(self) -> Path:
-        """
-        ## 获取 QQ 的 index.js 文件路径
-        """
-        return self.getQQPath() / r"resources/app/app_launcher/index.js"
-
-    def getNapCatPath(self) -> Path:
+    def _resolveNapCatPath(self) -> Path:
         """
-        ## 获取 NapCat 路径
+        ## 解析 NapCat 路径
         会验证路径是否为 default
         """
         from src.Core.Config import cfg
@@ -107,9 +169,9 @@ class PathFunc:
             self.napcat_path = Path(cfg.get(item=cfg.NapCatPath))
         return self.napcat_path
 
-    def getStartScriptPath(self) -> Path:
+    def _resolveStartScriptPath(self) -> Path:
         """
-        ## 获取启动脚本路径
+        ## 解析启动脚本路径
         会验证路径是否为 default
         """
         from src.Core.Config import cfg
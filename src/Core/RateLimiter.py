@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+## 下载限速
+    - 令牌桶实现全局上限和单个下载的上限
+    - 自动模式下根据正在运行的 bot 的连接延迟调整全局上限
+"""
+import socket
+import threading
+import time
+import weakref
+from abc import ABC
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from PySide6.QtCore import QObject
+from creart import AbstractCreator, CreateTargetInfo, add_creator, exists_module
+from loguru import logger
+
+
+class TokenBucket:
+    """
+    ## 线程安全的令牌桶
+        - rate: 每秒补充的令牌(字节)数, 为 0 时表示不限速
+        - burst: 桶的容量, 决定了允许的瞬时突发量
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        self._lock = threading.Lock()
+        self._rate = float(rate)
+        self._burst = float(burst) if burst else self._defaultBurst(rate)
+        self._tokens = self._burst
+        self._last = time.monotonic()
+
+    @staticmethod
+    def _defaultBurst(rate: float) -> float:
+        """
+        ## 默认容量为 100ms 的流量, 但不小于 16KB, 保证整形足够平滑
+        """
+        return max(rate * 0.1, 16 * 1024)
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def setRate(self, rate: float) -> None:
+        """
+        ## 调整补充速度, 容量随之调整
+        """
+        with self._lock:
+            self._refill()
+            self._rate = float(rate)
+            self._burst = self._defaultBurst(rate)
+            self._tokens = min(self._tokens, self._burst)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._last) * self._rate)
+        self._last = now
+
+    def reserve(self, amount: int) -> float:
+        """
+        ## 预定 amount 个令牌, 返回需要等待的秒数
+            - 允许令牌变为负数(欠账), 之后的调用者会为此等待, 保证长期速率精确
+        """
+        with self._lock:
+            if self._rate <= 0:
+                return 0.0
+            self._refill()
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+
+    def consume(self, amount: int) -> None:
+        """
+        ## 阻塞直到可以发送 amount 字节
+        """
+        if (wait := self.reserve(amount)) > 0:
+            time.sleep(wait)
+
+
+class DownloadLimiter:
+    """
+    ## 单个下载使用的限速器, 同时受全局桶和自身桶约束
+    """
+
+    def __init__(self, globalBucket: TokenBucket, perDownloadRate: float) -> None:
+        self.globalBucket = globalBucket
+        self.bucket = TokenBucket(perDownloadRate)
+
+    def setRate(self, perDownloadRate: float) -> None:
+        """
+        ## 调整单个下载的上限, 正在进行的下载立即生效
+        """
+        self.bucket.setRate(perDownloadRate)
+
+    def consume(self, amount: int) -> None:
+        """
+        ## 两个桶都预定令牌, 等待两者中较长的时间
+        """
+        wait = max(self.globalBucket.reserve(amount), self.bucket.reserve(amount))
+        if wait > 0:
+            time.sleep(wait)
+
+
+class BandwidthShaper(QObject):
+    """
+    ## 下载带宽整形
+        - 所有下载共用一个全局令牌桶, 每个下载另有自己的令牌桶
+        - 限速配置来自设置页面, 修改后立即生效 (包括正在进行的下载)
+        - AUTO 模式下探测正在运行的 bot 的上报/反向 WS 地址的连接延迟,
+          延迟上升时乘性降低全局上限, 恢复后加性提高(AIMD)
+        - 探测线程只读取界面线程设置的地址快照 (不可变元组), 调整速率前在锁内确认仍处于 AUTO 模式
+    """
+    # 探测间隔(秒)
+    PROBE_INTERVAL = 2.0
+    # 延迟超过基线的倍数时判定为拥塞
+    CONGESTION_FACTOR = 1.5
+    # 自动模式的最低速率(字节/秒)
+    AUTO_FLOOR = 64 * 1024
+
+    def __init__(self) -> None:
+        super().__init__()
+        from src.Core.Config import cfg
+
+        self.globalBucket = TokenBucket(0)
+        # 正在运行的 bot 的连接地址, 由界面线程整体替换
+        self.endpoints: Tuple[Tuple[str, int], ...] = ()
+        self._baseline: Optional[float] = None
+        self._autoRate: float = 0
+        self._probeThread: Optional[threading.Thread] = None
+        # 当前探测线程的停止事件, 每个探测线程使用自己的事件
+        self._stopProbe = threading.Event()
+        # 保护模式切换和探测线程调整速率
+        self._lock = threading.Lock()
+        # 正在进行的下载的限速器
+        self._limiters: "weakref.WeakSet[DownloadLimiter]" = weakref.WeakSet()
+
+        # 配置修改后立即生效
+        cfg.DownloadRateLimitMode.valueChanged.connect(self.applyConfig)
+        cfg.GlobalDownloadRateLimit.valueChanged.connect(self.applyConfig)
+        cfg.PerDownloadRateLimit.valueChanged.connect(self.applyConfig)
+        self.applyConfig()
+
+    def applyConfig(self, *_) -> None:
+        """
+        ## 根据配置调整全局令牌桶, 并按需启动/停止延迟探测
+        """
+        from src.Core.Config import cfg, RateLimitModeEnum
+
+        mode = cfg.get(cfg.DownloadRateLimitMode)
+        globalRate = cfg.get(cfg.GlobalDownloadRateLimit) * 1024
+        perDownloadRate = 0 if mode == RateLimitModeEnum.OFF else cfg.get(cfg.PerDownloadRateLimit) * 1024
+
+        with self._lock:
+            # 先停止旧的探测线程, 它之后不会再修改速率
+            self._stopProbe.set()
+            self.globalBucket.setRate(0 if mode == RateLimitModeEnum.OFF else globalRate)
+            for limiter in list(self._limiters):
+                limiter.setRate(perDownloadRate)
+            if mode == RateLimitModeEnum.AUTO:
+                self._autoRate = globalRate
+                self._startProbe()
+
+    def createLimiter(self) -> Optional[DownloadLimiter]:
+        """
+        ## 为一个新的下载创建限速器, 不限速时返回 None
+        """
+        from src.Core.Config import cfg, RateLimitModeEnum
+
+        if cfg.get(cfg.DownloadRateLimitMode) == RateLimitModeEnum.OFF:
+            return None
+        limiter = DownloadLimiter(self.globalBucket, cfg.get(cfg.PerDownloadRateLimit) * 1024)
+        with self._lock:
+            self._limiters.add(limiter)
+        return limiter
+
+    def setEndpoints(self, endpoints: List[Tuple[str, int]]) -> None:
+        """
+        ## 设置正在运行的 bot 的连接地址 (host, port), 在界面线程调用
+            - 保存为不可变元组, 探测线程读取时不需要加锁
+        """
+        self.endpoints = tuple(endpoints)
+
+    def _startProbe(self) -> None:
+        """
+        ## 启动新的探测线程, 调用方持有 _lock 且已停止旧的线程
+            - 旧的线程可能还在测量延迟, 它持有自己的停止事件, 结束后不会再修改速率, 不需要等待
+        """
+        self._stopProbe = threading.Event()
+        self._baseline = None
+        self._probeThread = threading.Thread(
+            target=self._probeLoop, args=(self._stopProbe,), name="BandwidthProbe", daemon=True
+        )
+        self._probeThread.start()
+
+    def _probeLoop(self, stopEvent: threading.Event) -> None:
+        """
+        ## 定期探测延迟并调整全局上限, stopEvent 被设置后退出
+        """
+        while not stopEvent.wait(self.PROBE_INTERVAL):
+            try:
+                self._probeOnce(stopEvent)
+            except Exception as e:
+                # 不让单次探测的错误结束探测线程
+                logger.error(f"带宽探测失败: {e}")
+
+    def _probeOnce(self, stopEvent: threading.Event) -> None:
+        from src.Core.Config import cfg
+
+        if (latency := self._measureLatency()) is None:
+            return
+
+        with self._lock:
+            # 测量期间模式可能已经切换, 此时不再修改速率
+            if stopEvent.is_set():
+                return
+            cap = cfg.get(cfg.GlobalDownloadRateLimit) * 1024
+            if self._baseline is None:
+                self._baseline = latency
+            # 基线缓慢跟随最低延迟
+            self._baseline = min(latency, self._baseline * 0.95 + latency * 0.05)
+
+            if latency > self._baseline * self.CONGESTION_FACTOR + 0.005:
+                self._autoRate = max(self.AUTO_FLOOR, self._autoRate * 0.7)
+                logger.info(f"bot 连接延迟上升至 {latency * 1000:.1f}ms, 下载限速降至 {self._autoRate / 1024:.0f}KB/s")
+            else:
+                self._autoRate = min(cap, self._autoRate + cap * 0.05)
+            self.globalBucket.setRate(self._autoRate)
+
+    def _measureLatency(self) -> Optional[float]:
+        """
+        ## 测量到各个 bot 连接地址的 TCP 建连时间, 返回最大值(秒)
+        """
+        samples = []
+        for host, port in self.endpoints:
+            start = time.perf_counter()
+            try:
+                with socket.create_connection((host, port), timeout=1):
+                    samples.append(time.perf_counter() - start)
+            except OSError:
+                continue
+        return max(samples) if samples else None
+
+    @staticmethod
+    def endpointsFromUrls(urls: List[str]) -> List[Tuple[str, int]]:
+        """
+        ## 将 http/ws 地址转换为 (host, port)
+        """
+        endpoints = []
+        for url in urls:
+            parts = urlsplit(str(url))
+            if not parts.hostname:
+                continue
+            port = parts.port or (443 if parts.scheme in ("https", "wss") else 80)
+            endpoints.append((parts.hostname, port))
+        return endpoints
+
+
+class BandwidthShaperClassCreator(AbstractCreator, ABC):
+    # 定义类方法targets，该方法返回一个元组，元组中包含了一个CreateTargetInfo对象，
+    # 该对象描述了创建目标的相关信息，包括应用程序名称和类名。
+    targets = (CreateTargetInfo("src.Core.RateLimiter", "BandwidthShaper"),)
+
+    # 静态方法available()，用于检查模块"RateLimiter"是否存在，返回值为布尔型。
+    @staticmethod
+    def available() -> bool:
+        return exists_module("src.Core.RateLimiter")
+
+    # 静态方法create()，用于创建BandwidthShaper类的实例，返回值为BandwidthShaper对象。
+    @staticmethod
+    def create(create_type: [BandwidthShaper]) -> BandwidthShaper:
+        return BandwidthShaper()
+
+
+add_creator(BandwidthShaperClassCreator)
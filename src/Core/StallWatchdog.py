@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+## 界面线程卡顿检测
+    - 界面线程上的 QTimer 每 HEARTBEAT_INTERVAL 毫秒记录一次心跳, 后台线程检查心跳是否超时
+    - 心跳超过阈值未更新时, 抓取主线程当前的 Python 调用栈, 恢复后记录本次卡顿的时长
+    - 调用栈相同的卡顿合并为一组, 按总卡顿时间排序生成报告, 可在设置页面查看和导出
+    - 嵌套事件循环 (如 MessageBox.exec) 期间计时器仍会触发, 不会被当作卡顿
+    - 阈值 (毫秒) 通过环境变量 NCD_STALL_THRESHOLD 设置, 设置为 0 时关闭检测
+"""
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from abc import ABC
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QCoreApplication, QObject, QTimer, Signal
+from creart import AbstractCreator, CreateTargetInfo, add_creator, exists_module
+from loguru import logger
+
+# 阈值的环境变量
+ENV_THRESHOLD = "NCD_STALL_THRESHOLD"
+# 默认阈值 (毫秒)
+DEFAULT_THRESHOLD = 300
+# 心跳间隔 (毫秒)
+HEARTBEAT_INTERVAL = 50
+# 后台线程检查间隔 (毫秒)
+CHECK_INTERVAL = 50
+# 抓取的调用栈深度
+STACK_DEPTH = 40
+# 用于合并的调用栈帧数 (从最内层开始, 只计算项目内的帧)
+SIGNATURE_DEPTH = 6
+# 项目根目录, 用于区分项目代码和第三方库
+PROJECT_PATH = Path(__file__).resolve().parents[2]
+
+# (文件, 行号, 函数名)
+FrameKey = Tuple[str, int, str]
+
+
+@dataclass(frozen=True)
+class Stall:
+    """
+    ## 一次卡顿
+        - stack 从最外层到最内层, 每一项为 "文件:行号 函数名" 和对应的源码
+    """
+    timestamp: float
+    duration: float
+    stack: Tuple[str, ...]
+    signature: Tuple[FrameKey, ...]
+
+
+@dataclass
+class StallGroup:
+    """
+    ## 调用栈相同的一组卡顿, 时间单位为毫秒
+    """
+    stack: Tuple[str, ...]
+    count: int = 0
+    total: float = 0
+    longest: float = 0
+    lastSeen: float = 0
+    durations: List[float] = field(default_factory=list)
+
+    def add(self, stall: Stall) -> None:
+        self.count += 1
+        self.total += stall.duration
+        self.longest = max(self.longest, stall.duration)
+        self.lastSeen = stall.timestamp
+        self.durations.append(round(stall.duration, 1))
+
+
+def _isProjectFrame(filename: str) -> bool:
+    try:
+        return Path(filename).resolve().is_relative_to(PROJECT_PATH)
+    except (OSError, ValueError):
+        return False
+
+
+def captureStack(frame) -> Tuple[Tuple[str, ...], Tuple[FrameKey, ...]]:
+    """
+    ## 提取调用栈, 返回 (格式化的调用栈, 用于合并的签名)
+    """
+    summary = traceback.extract_stack(frame, limit=STACK_DEPTH)
+    stack = tuple(
+        f"{frame.filename}:{frame.lineno} {frame.name}" + (f"\n        {frame.line}" if frame.line else "")
+        for frame in summary
+    )
+    projectFrames = [frame for frame in summary if _isProjectFrame(frame.filename)] or list(summary)
+    signature = tuple(
+        (frame.filename, frame.lineno, frame.name) for frame in projectFrames[-SIGNATURE_DEPTH:]
+    )
+    return stack, signature
+
+
+class StallWatchdog(QObject):
+    """
+    ## 界面线程卡顿检测
+    """
+    # 检测到一次卡顿 (界面线程恢复后发出), 参数为 Stall
+    stallDetected = Signal(object)
+    # 报告被清空
+    reportCleared = Signal()
+
+    def __init__(self) -> None:
+        super().__init__()
+        threshold = os.environ.get(ENV_THRESHOLD)
+        self.threshold = int(threshold) if threshold else DEFAULT_THRESHOLD
+        self._lastBeat = time.monotonic()
+        self._groups: Dict[Tuple[FrameKey, ...], StallGroup] = {}
+        self._lock = threading.Lock()
+        self._stopEvent = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._mainThreadId = threading.main_thread().ident
+
+        # 心跳计时器, 运行在界面线程
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setInterval(HEARTBEAT_INTERVAL)
+        self.heartbeat.timeout.connect(self._beat)
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def start(self) -> None:
+        """
+        ## 开始检测, 需要在界面线程调用
+        """
+        if not self.enabled or self._thread is not None:
+            return
+        self._lastBeat = time.monotonic()
+        self.heartbeat.start()
+        self._stopEvent.clear()
+        self._thread = threading.Thread(target=self._watch, name="StallWatchdog", daemon=True)
+        self._thread.start()
+        if (app := QCoreApplication.instance()) is not None:
+            app.aboutToQuit.connect(self.stop)
+        logger.info(f"{'-' * 10} 卡顿检测已启动, 阈值 {self.threshold} ms {'-' * 10}")
+
+    def stop(self) -> None:
+        """
+        ## 停止检测, 有卡顿记录时写入 log/stall_report.txt
+        """
+        if self._thread is None:
+            return
+        self._stopEvent.set()
+        self._thread.join()
+        self._thread = None
+        self.heartbeat.stop()
+        if self._groups:
+            try:
+                self.exportReport(Path.cwd() / "log" / "stall_report.txt")
+            except OSError as e:
+                logger.error(f"写入卡顿报告失败: {e}")
+
+    def _beat(self) -> None:
+        self._lastBeat = time.monotonic()
+
+    def _watch(self) -> None:
+        """
+        ## 后台线程, 检查心跳是否超时
+        """
+        threshold = self.threshold / 1000
+        stallBeat: Optional[float] = None
+        stack: Tuple[str, ...] = ()
+        signature: Tuple[FrameKey, ...] = ()
+        while not self._stopEvent.wait(CHECK_INTERVAL / 1000):
+            lastBeat = self._lastBeat
+            if stallBeat is None:
+                if time.monotonic() - lastBeat < threshold:
+                    continue
+                # 心跳超时, 抓取界面线程此刻的调用栈
+                if (frame := sys._current_frames().get(self._mainThreadId)) is None:
+                    continue
+                stallBeat = lastBeat
+                stack, signature = captureStack(frame)
+                del frame
+            elif lastBeat != stallBeat:
+                # 心跳恢复, 卡顿时长为两次心跳之间的间隔减去正常的心跳间隔
+                duration = (lastBeat - stallBeat) * 1000 - HEARTBEAT_INTERVAL
+                self._record(Stall(time.time(), max(duration, self.threshold), stack, signature))
+                stallBeat = None
+
+    def _record(self, stall: Stall) -> None:
+        with self._lock:
+            if (group := self._groups.get(stall.signature)) is None:
+                group = self._groups[stall.signature] = StallGroup(stall.stack)
+            group.add(stall)
+        location = stall.stack[-1].splitlines()[0] if stall.stack else "unknown"
+        logger.warning(f"界面线程卡顿 {stall.duration:.0f} ms, 位置: {location}")
+        self.stallDetected.emit(stall)
+
+    def groups(self) -> List[StallGroup]:
+        """
+        ## 按总卡顿时间从高到低排序的卡顿分组
+        """
+        with self._lock:
+            return sorted(self._groups.values(), key=lambda group: group.total, reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._groups.clear()
+        self.reportCleared.emit()
+
+    def formatReport(self) -> str:
+        """
+        ## 生成文本报告
+        """
+        groups = self.groups()
+        if not groups:
+            return f"没有检测到超过 {self.threshold} ms 的卡顿"
+        lines = [
+            f"卡顿阈值: {self.threshold} ms",
+            f"卡顿次数: {sum(group.count for group in groups)}, "
+            f"总时长: {sum(group.total for group in groups):.0f} ms",
+            "",
+        ]
+        for rank, group in enumerate(groups, 1):
+            lines.append(
+                f"#{rank}  总计 {group.total:.0f} ms  次数 {group.count}  最长 {group.longest:.0f} ms  "
+                f"最近 {time.strftime('%H:%M:%S', time.localtime(group.lastSeen))}"
+            )
+            lines.extend(f"    {line}" for line in group.stack)
+            lines.append("")
+        return "\n".join(lines)
+
+    def exportReport(self, path: Path) -> None:
+        """
+        ## 导出报告, 后缀为 .json 时导出为 JSON, 否则导出为文本
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix.lower() == ".json":
+            data = {"threshold": self.threshold, "groups": [asdict(group) for group in self.groups()]}
+            path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        else:
+            path.write_text(self.formatReport(), encoding="utf-8")
+        logger.info(f"卡顿报告已导出到 {path}")
+
+
+class StallWatchdogClassCreator(AbstractCreator, ABC):
+    # 定义类方法targets，该方法返回一个元组，元组中包含了一个CreateTargetInfo对象，
+    # 该对象描述了创建目标的相关信息，包括应用程序名称和类名。
+    targets = (CreateTargetInfo("src.Core.StallWatchdog", "StallWatchdog"),)
+
+    # 静态方法available()，用于检查模块"StallWatchdog"是否存在，返回值为布尔型。
+    @staticmethod
+    def available() -> bool:
+        return exists_module("src.Core.StallWatchdog")
+
+    # 静态方法create()，用于创建StallWatchdog类的实例，返回值为StallWatchdog对象。
+    @staticmethod
+    def create(create_type: [StallWatchdog]) -> StallWatchdog:
+        return StallWatchdog()
+
+
+add_creator(StallWatchdogClassCreator)
@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""
+## 启动过程追踪
+    - 设置环境变量 NCD_TRACE_STARTUP=1 或使用 --trace-startup 参数启用
+    - 记录每个模块的导入耗时、各个初始化阶段的耗时、首次绘制 (启动画面) 和可交互的时间
+    - 可交互时间为启动画面结束后主窗体的第一次绘制, 此时主页和侧边栏已经构建完成
+    - 结束后在 log/ 下写入 startup_trace.json (Chrome trace 格式, 可用 chrome://tracing 或 Perfetto 打开)
+      和 startup_summary.txt (汇总表)
+    - 设置 NCD_STARTUP_BUDGET (毫秒) 或 --startup-budget=<毫秒> 时检查可交互时间是否超出预算
+    - 设置 NCD_STARTUP_IMPORT_BUDGET 或 --startup-import-budget=<数量> 时检查启动画面结束时已导入的模块数量
+    - 使用 --exit-after-startup 参数时, 追踪结束后退出程序, 超出预算时退出码为 1, 供 CI 使用
+
+    - 本模块只依赖标准库, 需要在其他模块之前导入 (src.Core 包本身的导入不在记录范围内)
+"""
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from importlib.abc import MetaPathFinder
+from pathlib import Path
+from typing import Any, ContextManager, Iterator, List, Optional
+
+# 启用追踪的环境变量和参数
+ENV_ENABLE = "NCD_TRACE_STARTUP"
+ENV_BUDGET = "NCD_STARTUP_BUDGET"
+ARG_ENABLE = "--trace-startup"
+ENV_IMPORT_BUDGET = "NCD_STARTUP_IMPORT_BUDGET"
+ARG_BUDGET = "--startup-budget="
+ARG_IMPORT_BUDGET = "--startup-import-budget="
+ARG_EXIT = "--exit-after-startup"
+# 汇总表中列出的最慢模块数量
+SUMMARY_IMPORTS = 30
+
+
+@dataclass
+class TraceEvent:
+    """
+    ## 一段耗时或一个时间点, 时间单位为纳秒 (相对于追踪开始)
+    """
+    name: str
+    category: str
+    start: int
+    duration: Optional[int]
+    thread: int
+
+    def toChrome(self, pid: int) -> dict:
+        event = {
+            "name": self.name, "cat": self.category, "pid": pid, "tid": self.thread, "ts": self.start / 1000
+        }
+        if self.duration is None:
+            event.update(ph="i", s="g")
+        else:
+            event.update(ph="X", dur=self.duration / 1000)
+        return event
+
+
+class _TimedLoader:
+    """
+    ## 包装模块的 loader, 记录 exec_module 的耗时
+        - 执行结束后还原 __loader__ 和 __spec__.loader, 不影响之后使用 loader 的代码
+    """
+
+    def __init__(self, loader: Any, tracer: "StartupTracer") -> None:
+        self._loader = loader
+        self._tracer = tracer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        spec.loader = self._loader
+        try:
+            return self._loader.create_module(spec)
+        finally:
+            spec.loader = self
+
+    def exec_module(self, module) -> None:
+        start = self._tracer.now()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._tracer.addSpan(module.__name__, "import", start)
+            module.__loader__ = self._loader
+            if module.__spec__ is not None:
+                module.__spec__.loader = self._loader
+
+
+class _ImportFinder(MetaPathFinder):
+    """
+    ## 放在 sys.meta_path 最前面, 由其他 finder 找到模块后替换 loader
+    """
+
+    def __init__(self, tracer: "StartupTracer") -> None:
+        self.tracer = tracer
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                if (spec := finder.find_spec(fullname, path, target)) is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self.tracer)
+        return spec
+
+
+class StartupTracer:
+    """
+    ## 启动追踪器, 未启用时所有方法都是空操作
+    """
+
+    def __init__(
+            self, enabled: bool, budget: Optional[int] = None, importBudget: Optional[int] = None,
+            exitAfter: bool = False
+    ) -> None:
+        self.enabled = enabled
+        self.budget = budget
+        self.importBudget = importBudget
+        self.exitAfter = exitAfter
+        self.events: List[TraceEvent] = []
+        self.firstPaint: Optional[int] = None
+        # 启动画面结束后第一次绘制的时间
+        self.interactive: Optional[int] = None
+        # 启动画面结束时 sys.modules 中的模块数量
+        self.modulesAtInteractive: Optional[int] = None
+        self.finished = False
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._finder: Optional[_ImportFinder] = None
+        self._paintFilter = None
+        self._interactiveFilter = None
+
+    @classmethod
+    def fromEnvironment(cls) -> "StartupTracer":
+        """
+        ## 从环境变量和命令行参数读取配置
+        """
+        budget, importBudget = os.environ.get(ENV_BUDGET), os.environ.get(ENV_IMPORT_BUDGET)
+        for arg in sys.argv[1:]:
+            if arg.startswith(ARG_BUDGET):
+                budget = arg[len(ARG_BUDGET):]
+            elif arg.startswith(ARG_IMPORT_BUDGET):
+                importBudget = arg[len(ARG_IMPORT_BUDGET):]
+        enabled = os.environ.get(ENV_ENABLE, "") not in ("", "0") or ARG_ENABLE in sys.argv
+        return cls(
+            enabled, int(budget) if budget else None, int(importBudget) if importBudget else None,
+            ARG_EXIT in sys.argv
+        )
+
+    def now(self) -> int:
+        return time.perf_counter_ns() - self._origin
+
+    def install(self) -> None:
+        """
+        ## 开始记录模块导入
+        """
+        if not self.enabled or self._finder is not None:
+            return
+        self._finder = _ImportFinder(self)
+        sys.meta_path.insert(0, self._finder)
+        atexit.register(self.finish)
+
+    def addSpan(self, name: str, category: str, start: int) -> None:
+        with self._lock:
+            self.events.append(TraceEvent(name, category, start, self.now() - start, threading.get_ident()))
+
+    def mark(self, name: str) -> None:
+        """
+        ## 记录一个时间点
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.events.append(TraceEvent(name, "mark", self.now(), None, threading.get_ident()))
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.addSpan(name, "phase", start)
+
+    def phase(self, name: str) -> ContextManager[None]:
+        """
+        ## 记录一个阶段的耗时, 用法: with tracer.phase("name"): ...
+        """
+        return self._phase(name) if self.enabled else nullcontext()
+
+    def watchFirstPaint(self, widget) -> None:
+        """
+        ## 监听窗体的第一次绘制
+        """
+        if not self.enabled:
+            return
+        from PySide6.QtCore import QEvent, QObject
+
+        tracer = self
+
+        class PaintFilter(QObject):
+            def eventFilter(self, obj, event) -> bool:
+                if event.type() == QEvent.Type.Paint and tracer.firstPaint is None:
+                    tracer.firstPaint = tracer.now()
+                    tracer.mark("firstPaint")
+                    obj.removeEventFilter(self)
+                return False
+
+        self._paintFilter = PaintFilter(widget)
+        widget.installEventFilter(self._paintFilter)
+
+    def watchInteractive(self, widget) -> None:
+        """
+        ## 启动画面结束后调用, 记录窗体接下来的第一次绘制作为可交互时间
+        """
+        if not self.enabled:
+            return
+        from PySide6.QtCore import QEvent, QObject
+
+        tracer = self
+        self.mark("splashFinished")
+        # 主页和侧边栏已经构建, 其余页面尚未构建
+        self.modulesAtInteractive = len(sys.modules)
+
+        class InteractiveFilter(QObject):
+            def eventFilter(self, obj, event) -> bool:
+                if event.type() == QEvent.Type.Paint and tracer.interactive is None:
+                    tracer.interactive = tracer.now()
+                    tracer.mark("interactive")
+                    obj.removeEventFilter(self)
+                return False
+
+        self._interactiveFilter = InteractiveFilter(widget)
+        widget.installEventFilter(self._interactiveFilter)
+
+    def overBudget(self) -> bool:
+        return self.overTimeBudget() or self.overImportBudget()
+
+    def overTimeBudget(self) -> bool:
+        if self.budget is None:
+            return False
+        return self.interactive is None or self.interactive / 1_000_000 > self.budget
+
+    def overImportBudget(self) -> bool:
+        if self.importBudget is None:
+            return False
+        return self.modulesAtInteractive is None or self.modulesAtInteractive > self.importBudget
+
+    def finish(self) -> None:
+        """
+        ## 停止追踪并写入结果
+        """
+        if not self.enabled or self.finished:
+            return
+        self.finished = True
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+        logPath = Path.cwd() / "log"
+        logPath.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            events = sorted(self.events, key=lambda item: item.start)
+        pid = os.getpid()
+        (logPath / "startup_trace.json").write_text(
+            json.dumps({"traceEvents": [event.toChrome(pid) for event in events], "displayTimeUnit": "ms"}),
+            encoding="utf-8"
+        )
+        (logPath / "startup_summary.txt").write_text(self.summary(events), encoding="utf-8")
+
+        from loguru import logger
+        interactive = "未记录" if self.interactive is None else f"{self.interactive / 1_000_000:.1f} ms"
+        logger.info(f"{'-' * 10} 启动追踪已写入 {logPath}, 可交互时间: {interactive} {'-' * 10}")
+        if self.overTimeBudget():
+            logger.error(f"可交互时间超出预算 {self.budget} ms")
+        if self.overImportBudget():
+            logger.error(f"启动画面结束时已导入 {self.modulesAtInteractive} 个模块, 超出预算 {self.importBudget}")
+
+        if self.exitAfter:
+            from PySide6.QtWidgets import QApplication
+            QApplication.exit(1 if self.overBudget() else 0)
+
+    def summary(self, events: List[TraceEvent]) -> str:
+        """
+        ## 生成汇总表
+        """
+        def ms(value: int) -> str:
+            return f"{value / 1_000_000:10.1f}"
+
+        imports = [event for event in events if event.category == "import"]
+        lines = [
+            "NapCat Desktop startup summary",
+            f"first paint     : {'-' if self.firstPaint is None else ms(self.firstPaint).strip()} ms",
+            f"interactive     : {'-' if self.interactive is None else ms(self.interactive).strip()} ms",
+            f"budget          : {'-' if self.budget is None else self.budget} ms"
+            f"{' (exceeded)' if self.overTimeBudget() else ''}",
+            f"modules imported: {len(imports)}",
+            f"modules at ready: {'-' if self.modulesAtInteractive is None else self.modulesAtInteractive}"
+            f" (budget {'-' if self.importBudget is None else self.importBudget})"
+            f"{' (exceeded)' if self.overImportBudget() else ''}",
+            "",
+            f"{'phase':<48}{'start ms':>10}{'wall ms':>10}",
+        ]
+        for event in events:
+            if event.category == "phase":
+                lines.append(f"{event.name:<48}{ms(event.start)}{ms(event.duration)}")
+            elif event.category == "mark":
+                lines.append(f"{'@ ' + event.name:<48}{ms(event.start)}{'':>10}")
+
+        lines += ["", f"{'slowest imports (cumulative)':<48}{'start ms':>10}{'wall ms':>10}"]
+        for event in sorted(imports, key=lambda item: item.duration, reverse=True)[:SUMMARY_IMPORTS]:
+            lines.append(f"{event.name:<48}{ms(event.start)}{ms(event.duration)}")
+        return "\n".join(lines) + "\n"
+
+
+# 全局追踪器, 导入本模块时即开始计时
+tracer = StartupTracer.fromEnvironment()
+tracer.install()
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+## 系统资源采样
+    - 单个后台线程按固定间隔调用 psutil, 界面线程不再执行任何采样
+    - 每次采样生成一个不可变的 SystemSnapshot, 通过 snapshotFinish 发出, 仪表盘只在可见时使用
+    - 最近 HISTORY_SIZE 次的数值保存在基于 array 的环形缓冲区中, 绘制历史曲线时不需要额外采样
+"""
+import threading
+import time
+from abc import ABC
+from array import array
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QCoreApplication, QThread, Signal
+from creart import AbstractCreator, CreateTargetInfo, add_creator, exists_module
+from loguru import logger
+
+from src.Core.LazyImport import lazyImport
+
+# 在采样线程中第一次采样时才导入
+psutil = lazyImport("psutil")
+
+# 默认采样间隔 (毫秒)
+DEFAULT_INTERVAL = 1000
+# 最小采样间隔 (毫秒), 过于频繁的采样本身就会占用 CPU
+MIN_INTERVAL = 250
+# 保存的历史采样数量
+HISTORY_SIZE = 120
+
+
+@dataclass(frozen=True)
+class SystemSnapshot:
+    """
+    ## 一次采样的结果
+        - 内存单位为字节
+    """
+    timestamp: float
+    cpuPercent: float
+    cpuPerCore: Tuple[float, ...]
+    memoryPercent: float
+    memoryUsed: int
+    memoryTotal: int
+    processRss: int
+
+
+class Metric(Enum):
+    """保存历史的数值"""
+    CPU = "cpuPercent"
+    MEMORY = "memoryPercent"
+    PROCESS_RSS = "processRss"
+
+
+class RingBuffer:
+    """
+    ## 固定长度的浮点数环形缓冲区, 写满后覆盖最旧的值
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._data = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value: float) -> None:
+        self._data[(self._start + self._size) % self.capacity] = value
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def latest(self) -> Optional[float]:
+        if not self._size:
+            return None
+        return self._data[(self._start + self._size - 1) % self.capacity]
+
+    def values(self) -> List[float]:
+        """
+        ## 按时间顺序返回所有值, 最旧的在前
+        """
+        end = self._start + self._size
+        if end <= self.capacity:
+            return self._data[self._start:end].tolist()
+        return self._data[self._start:].tolist() + self._data[:end - self.capacity].tolist()
+
+
+class SystemMonitor(QThread):
+    """
+    ## 系统资源采样线程
+        - 第一次调用 subscribe 时启动, 程序退出时停止
+    """
+    # 采样完成, 参数为 SystemSnapshot
+    snapshotFinish = Signal(object)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._interval = DEFAULT_INTERVAL
+        self._stopEvent = threading.Event()
+        self._lock = threading.Lock()
+        self._latest: Optional[SystemSnapshot] = None
+        self._process = None
+        self._history: Dict[Metric, RingBuffer] = {metric: RingBuffer(HISTORY_SIZE) for metric in Metric}
+
+        if (app := QCoreApplication.instance()) is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    @property
+    def interval(self) -> int:
+        return self._interval
+
+    def setInterval(self, interval: int) -> None:
+        """
+        ## 设置采样间隔 (毫秒), 下一次采样开始生效
+        """
+        self._interval = max(MIN_INTERVAL, interval)
+
+    def subscribe(self, slot) -> Optional[SystemSnapshot]:
+        """
+        ## 订阅采样结果, 返回最近一次采样 (还没有采样时为 None)
+        """
+        self.snapshotFinish.connect(slot)
+        if not self.isRunning():
+            self._stopEvent.clear()
+            self.start(QThread.Priority.LowPriority)
+        return self.latest()
+
+    def latest(self) -> Optional[SystemSnapshot]:
+        with self._lock:
+            return self._latest
+
+    def history(self, metric: Metric) -> List[float]:
+        """
+        ## 获取某个数值的历史, 最旧的在前
+        """
+        with self._lock:
+            return self._history[metric].values()
+
+    def stop(self) -> None:
+        """
+        ## 停止采样并等待线程结束
+        """
+        self._stopEvent.set()
+        self.wait()
+
+    def sample(self) -> SystemSnapshot:
+        """
+        ## 采样一次
+        """
+        memory = psutil.virtual_memory()
+        return SystemSnapshot(
+            timestamp=time.time(),
+            cpuPercent=psutil.cpu_percent(interval=0),
+            cpuPerCore=tuple(psutil.cpu_percent(interval=0, percpu=True)),
+            memoryPercent=memory.percent,
+            memoryUsed=memory.used,
+            memoryTotal=memory.total,
+            processRss=self._process.memory_info().rss,
+        )
+
+    def run(self) -> None:
+        if self._process is None:
+            self._process = psutil.Process()
+        # interval=0 返回距上次调用的使用率, 第一次调用总是 0.0, 先调用一次作为起点
+        psutil.cpu_percent(interval=0)
+        psutil.cpu_percent(interval=0, percpu=True)
+        self._stopEvent.wait(MIN_INTERVAL / 1000)
+        while not self._stopEvent.is_set():
+            try:
+                snapshot = self.sample()
+            except psutil.Error as e:
+                logger.warning(f"系统资源采样失败: {e}")
+            else:
+                with self._lock:
+                    self._latest = snapshot
+                    for metric, buffer in self._history.items():
+                        buffer.append(getattr(snapshot, metric.value))
+                self.snapshotFinish.emit(snapshot)
+            self._stopEvent.wait(self._interval / 1000)
+
+
+class SystemMonitorClassCreator(AbstractCreator, ABC):
+    # 定义类方法targets，该方法返回一个元组，元组中包含了一个CreateTargetInfo对象，
+    # 该对象描述了创建目标的相关信息，包括应用程序名称和类名。
+    targets = (CreateTargetInfo("src.Core.SystemMonitor", "SystemMonitor"),)
+
+    # 静态方法available()，用于检查模块"SystemMonitor"是否存在，返回值为布尔型。
+    @staticmethod
+    def available() -> bool:
+        return exists_module("src.Core.SystemMonitor")
+
+    # 静态方法create()，用于创建SystemMonitor类的实例，返回值为SystemMonitor对象。
+    @staticmethod
+    def create(create_type: [SystemMonitor]) -> SystemMonitor:
+        return SystemMonitor()
+
+
+add_creator(SystemMonitorClassCreator)
@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+"""
+## 流式解压 zip
+    - 先解析中央目录 (只需要文件尾部的几十 KB), 得到每个成员的偏移、大小和 CRC
+    - 之后按偏移顺序读取字节流, 每个成员的数据一到达就立即解压写入, 无需等待整个文件下载完成
+    - 只支持 STORED 和 DEFLATED 两种压缩方式, 其他方式请回退到 zipfile
+    - 已经完整下载的 zip 使用 ParallelExtractor 多线程解压
+    - 基准测试: python -m src.Core.ZipStream [文件数], 默认 5000 个小文件, 对比 ParallelExtractor 和 extractall
+"""
+import hashlib
+import os
+import struct
+import threading
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 各类记录的签名和结构
+EOCD_SIGNATURE = b"PK\x05\x06"
+EOCD_STRUCT = struct.Struct("<4s4H2LH")
+ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+ZIP64_LOCATOR_STRUCT = struct.Struct("<4sLQL")
+ZIP64_EOCD_SIGNATURE = b"PK\x06\x06"
+ZIP64_EOCD_STRUCT = struct.Struct("<4sQ2H2L4Q")
+CENTRAL_SIGNATURE = b"PK\x01\x02"
+CENTRAL_STRUCT = struct.Struct("<4s6H3L5H2L")
+LOCAL_SIGNATURE = b"PK\x03\x04"
+LOCAL_STRUCT = struct.Struct("<4s5H3L2H")
+
+# EOCD 最大为 22 字节加 65535 字节的注释
+EOCD_SEARCH_SIZE = EOCD_STRUCT.size + 0xFFFF + ZIP64_LOCATOR_STRUCT.size
+
+# 支持的压缩方式
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+SUPPORTED_METHODS = (ZIP_STORED, ZIP_DEFLATED)
+
+
+class ZipStreamError(Exception):
+    """
+    ## 无法以流式方式处理该 zip
+    """
+
+
+@dataclass(frozen=True)
+class ZipEntry:
+    """
+    ## 中央目录中的一个成员
+    """
+    name: str
+    method: int
+    crc: int
+    compressSize: int
+    fileSize: int
+    headerOffset: int
+
+    @property
+    def isDir(self) -> bool:
+        return self.name.endswith("/")
+
+
+@dataclass(frozen=True)
+class CentralDirectory:
+    """
+    ## 解析后的中央目录
+        - offset: 中央目录在文件中的起始位置, 成员数据全部位于它之前
+    """
+    entries: List[ZipEntry]
+    offset: int
+    size: int
+
+
+def locateCentralDirectory(tail: bytes, tailOffset: int) -> Tuple[int, int, int]:
+    """
+    ## 在文件尾部查找 EOCD, 返回 (中央目录偏移, 中央目录大小, 成员数)
+        - tail: 文件尾部的字节
+        - tailOffset: tail 在文件中的起始位置
+    """
+    position = tail.rfind(EOCD_SIGNATURE)
+    if position < 0 or position + EOCD_STRUCT.size > len(tail):
+        raise ZipStreamError("未找到 EOCD, 不是有效的 zip 文件")
+
+    _, _, _, _, count, cdSize, cdOffset, _ = EOCD_STRUCT.unpack_from(tail, position)
+
+    # ZIP64: EOCD 之前是 ZIP64 定位记录
+    locatorPosition = position - ZIP64_LOCATOR_STRUCT.size
+    if locatorPosition >= 0 and tail[locatorPosition:locatorPosition + 4] == ZIP64_LOCATOR_SIGNATURE:
+        _, _, eocd64Offset, _ = ZIP64_LOCATOR_STRUCT.unpack_from(tail, locatorPosition)
+        eocd64Position = eocd64Offset - tailOffset
+        if eocd64Position < 0 or tail[eocd64Position:eocd64Position + 4] != ZIP64_EOCD_SIGNATURE:
+            raise ZipStreamError("ZIP64 EOCD 不在已获取的尾部数据中")
+        _, _, _, _, _, _, _, count, cdSize, cdOffset = ZIP64_EOCD_STRUCT.unpack_from(tail, eocd64Position)
+
+    return cdOffset, cdSize, count
+
+
+def parseCentralDirectory(data: bytes, offset: int, count: int) -> CentralDirectory:
+    """
+    ## 解析中央目录
+        - data: 中央目录的字节
+        - offset: 中央目录在文件中的起始位置
+    """
+    entries = []
+    position = 0
+    for _ in range(count):
+        if data[position:position + 4] != CENTRAL_SIGNATURE:
+            raise ZipStreamError(f"中央目录在 {offset + position} 处损坏")
+        (
+            _, _, _, flags, method, _, _, crc, compressSize, fileSize,
+            nameLength, extraLength, commentLength, _, _, _, headerOffset
+        ) = CENTRAL_STRUCT.unpack_from(data, position)
+        position += CENTRAL_STRUCT.size
+
+        rawName = data[position:position + nameLength]
+        name = rawName.decode("utf-8" if flags & 0x800 else "cp437")
+        extra = data[position + nameLength:position + nameLength + extraLength]
+        position += nameLength + extraLength + commentLength
+
+        fileSize, compressSize, headerOffset = _applyZip64Extra(extra, fileSize, compressSize, headerOffset)
+        entries.append(ZipEntry(name, method, crc, compressSize, fileSize, headerOffset))
+
+    return CentralDirectory(entries, offset, len(data))
+
+
+def _applyZip64Extra(extra: bytes, fileSize: int, compressSize: int, headerOffset: int) -> Tuple[int, int, int]:
+    """
+    ## 取 ZIP64 扩展字段中的真实大小和偏移
+    """
+    position = 0
+    while position + 4 <= len(extra):
+        tag, size = struct.unpack_from("<2H", extra, position)
+        if tag == 0x0001:
+            values = iter(struct.unpack_from(f"<{size // 8}Q", extra, position + 4))
+            if fileSize == 0xFFFFFFFF:
+                fileSize = next(values)
+            if compressSize == 0xFFFFFFFF:
+                compressSize = next(values)
+            if headerOffset == 0xFFFFFFFF:
+                headerOffset = next(values)
+            break
+        position += 4 + size
+    return fileSize, compressSize, headerOffset
+
+
+def safeMemberPath(root: Path, name: str) -> Path:
+    """
+    ## 将成员名转换为 root 下的路径, 拒绝绝对路径和 .. 以防路径穿越
+    """
+    parts = PurePosixPath(name.replace("\\", "/")).parts
+    if not parts or parts[0] == "/" or ".." in parts or ":" in parts[0]:
+        raise ZipStreamError(f"不安全的成员路径: {name}")
+    return root.joinpath(*parts)
+
+
+class StreamReader:
+    """
+    ## 在字节块迭代器上提供按偏移顺序的读取
+    """
+
+    def __init__(self, chunks: Iterable[bytes], start: int = 0) -> None:
+        self._chunks: Iterator[bytes] = iter(chunks)
+        self._buffer = memoryview(b"")
+        self.position = start
+
+    def _fill(self) -> bool:
+        for chunk in self._chunks:
+            if chunk:
+                self._buffer = memoryview(chunk)
+                return True
+        return False
+
+    def iterRead(self, size: int) -> Iterator[memoryview]:
+        """
+        ## 读取 size 字节, 以零拷贝的分片形式返回
+        """
+        while size > 0:
+            if not self._buffer and not self._fill():
+                raise ZipStreamError(f"数据在 {self.position} 处意外结束")
+            piece = self._buffer[:size]
+            self._buffer = self._buffer[len(piece):]
+            self.position += len(piece)
+            size -= len(piece)
+            yield piece
+
+    def read(self, size: int) -> bytes:
+        return b"".join(self.iterRead(size))
+
+    def expectEnd(self) -> None:
+        """
+        ## 确认数据已经全部读完
+        """
+        if self._buffer or self._fill():
+            raise ZipStreamError(f"{self.position} 之后还有多余的数据")
+
+    def skipTo(self, offset: int) -> None:
+        if offset < self.position:
+            raise ZipStreamError(f"无法回退到 {offset}, 当前位置 {self.position}")
+        for _ in self.iterRead(offset - self.position):
+            pass
+
+
+class StreamingExtractor:
+    """
+    ## 按中央目录从顺序字节流中解压成员
+        - 每个成员写入后校验 CRC32, 写入的同时计算 sha256, 结果保存在 hashes 中
+        - shouldExtract(成员) 返回 False 的文件成员只读过不解压, 用于增量更新
+        - onMember(成员, 已完成成员数) 在每个成员处理后调用
+    """
+
+    def __init__(
+            self, directory: CentralDirectory, root: Path,
+            shouldExtract: Optional[Callable[[ZipEntry], bool]] = None
+    ) -> None:
+        self.directory = directory
+        self.root = root
+        self.shouldExtract = shouldExtract
+        self.hashes: Dict[str, str] = {}
+
+        unsupported = {entry.method for entry in directory.entries} - set(SUPPORTED_METHODS)
+        if unsupported:
+            raise ZipStreamError(f"不支持的压缩方式: {unsupported}")
+
+    def extract(self, reader: StreamReader, onMember: Optional[Callable[[ZipEntry, int], None]] = None) -> None:
+        """
+        ## 从 reader 中解压全部成员到 root
+        """
+        entries = sorted(self.directory.entries, key=lambda entry: entry.headerOffset)
+        for index, entry in enumerate(entries, 1):
+            reader.skipTo(entry.headerOffset)
+            self._extractEntry(reader, entry)
+            if onMember is not None:
+                onMember(entry, index)
+
+    def _extractEntry(self, reader: StreamReader, entry: ZipEntry) -> None:
+        header = reader.read(LOCAL_STRUCT.size)
+        if header[:4] != LOCAL_SIGNATURE:
+            raise ZipStreamError(f"{entry.name} 的本地文件头损坏")
+        *_, nameLength, extraLength = LOCAL_STRUCT.unpack(header)
+        reader.read(nameLength + extraLength)
+
+        target = safeMemberPath(self.root, entry.name)
+        if entry.isDir:
+            target.mkdir(parents=True, exist_ok=True)
+            return
+        if self.shouldExtract is not None and not self.shouldExtract(entry):
+            reader.skipTo(reader.position + entry.compressSize)
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS) if entry.method == ZIP_DEFLATED else None
+        crc = 0
+        digest = hashlib.sha256()
+        with open(target, "wb") as file:
+            for piece in reader.iterRead(entry.compressSize):
+                data = decompressor.decompress(piece) if decompressor else piece
+                crc = zlib.crc32(data, crc)
+                digest.update(data)
+                file.write(data)
+            if decompressor is not None:
+                data = decompressor.flush()
+                crc = zlib.crc32(data, crc)
+                digest.update(data)
+                file.write(data)
+
+        if crc != entry.crc:
+            raise ZipStreamError(f"{entry.name} 的 CRC 校验失败")
+        self.hashes[entry.name] = digest.hexdigest()
+
+
+class ParallelExtractor:
+    """
+    ## 多线程解压本地 zip
+        - 每个线程持有自己的 ZipFile 句柄; zlib 解压、sha256 和文件写入期间都会释放 GIL
+        - 写入前按成员大小预分配, 之后以 BUFFER_SIZE 的大块读写, 减少系统调用和碎片
+        - 写入的同时计算 sha256, CRC32 由 zipfile 在读取结束时校验
+        - 大文件优先提交, 避免最后只剩一个大文件在单线程解压
+    """
+    BUFFER_SIZE = 1024 * 1024
+
+    def __init__(self, zipPath: Path, root: Path, workers: Optional[int] = None) -> None:
+        self.zipPath = zipPath
+        self.root = root
+        self.workers = workers or min(8, os.cpu_count() or 1)
+
+    def extract(
+            self, shouldExtract: Optional[Callable[[zipfile.ZipInfo], bool]] = None,
+            onMember: Optional[Callable[[zipfile.ZipInfo, int, int], None]] = None
+    ) -> Dict[str, str]:
+        """
+        ## 解压成员到 root, 返回 {成员名: sha256}
+            - shouldExtract(成员) 返回 False 的文件成员不解压
+            - onMember(成员, 已完成数, 总数) 在每个成员写入后于调用线程中调用
+        """
+        with zipfile.ZipFile(self.zipPath) as zipFile:
+            infos = zipFile.infolist()
+
+        # 目录在提交前统一创建, 避免线程间竞争
+        files = []
+        for info in infos:
+            target = safeMemberPath(self.root, info.filename)
+            if info.is_dir():
+                target.mkdir(parents=True, exist_ok=True)
+            elif shouldExtract is None or shouldExtract(info):
+                target.parent.mkdir(parents=True, exist_ok=True)
+                files.append((info, target))
+        files.sort(key=lambda item: item[0].file_size, reverse=True)
+
+        local = threading.local()
+        handles: List[zipfile.ZipFile] = []
+        handlesLock = threading.Lock()
+
+        def work(info: zipfile.ZipInfo, target: Path) -> Tuple[zipfile.ZipInfo, str]:
+            if (zipFile := getattr(local, "zipFile", None)) is None:
+                zipFile = local.zipFile = zipfile.ZipFile(self.zipPath)
+                with handlesLock:
+                    handles.append(zipFile)
+            return info, self._extractMember(zipFile, info, target)
+
+        hashes = {}
+        pool = ThreadPoolExecutor(self.workers, thread_name_prefix="ParallelExtractor")
+        try:
+            futures = [pool.submit(work, info, target) for info, target in files]
+            for index, future in enumerate(as_completed(futures), 1):
+                info, sha256 = future.result()
+                hashes[info.filename] = sha256
+                if onMember is not None:
+                    onMember(info, index, len(files))
+        finally:
+            # 出错时取消尚未开始的成员
+            pool.shutdown(wait=True, cancel_futures=True)
+            for zipFile in handles:
+                zipFile.close()
+        return hashes
+
+    def _extractMember(self, zipFile: zipfile.ZipFile, info: zipfile.ZipInfo, target: Path) -> str:
+        digest = hashlib.sha256()
+        with zipFile.open(info) as source, open(target, "wb", buffering=0) as file:
+            if info.file_size:
+                # 预分配, 让文件系统一次分配连续空间
+                file.truncate(info.file_size)
+            while chunk := source.read(self.BUFFER_SIZE):
+                digest.update(chunk)
+                file.write(chunk)
+        return digest.hexdigest()
+
+
+if __name__ == "__main__":
+    # 基准测试: 在临时目录中生成由大量小文件组成的 zip, 对比 ParallelExtractor 和 ZipFile.extractall
+    import random
+    import sys
+    import tempfile
+    import time
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rounds = 3
+
+    with tempfile.TemporaryDirectory() as temp:
+        temp = Path(temp)
+        zipPath = temp / "bench.zip"
+        rng = random.Random(0)
+        words = [bytes(rng.choices(b"abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 10))) for _ in range(512)]
+        with zipfile.ZipFile(zipPath, "w", zipfile.ZIP_DEFLATED) as zipFile:
+            for i in range(count):
+                # 1~16KB 的可压缩文本, 分布在多级目录中
+                content = b" ".join(rng.choices(words, k=rng.randint(150, 2500)))
+                zipFile.writestr(f"dir{i % 32}/sub{i % 7}/file{i}.txt", content)
+        print(f"{count} 个文件, zip 大小 {zipPath.stat().st_size / 1024 / 1024:.1f} MiB")
+
+        def bench(name: str, func: Callable[[Path], None]) -> None:
+            times = []
+            for index in range(rounds):
+                root = temp / f"{name}{index}"
+                start = time.perf_counter()
+                func(root)
+                times.append(time.perf_counter() - start)
+            print(f"{name:<20} 最快 {min(times) * 1000:.0f} ms, 平均 {sum(times) / rounds * 1000:.0f} ms")
+
+        def extractAll(root: Path) -> None:
+            with zipfile.ZipFile(zipPath) as zipFile:
+                zipFile.extractall(root)
+
+        bench("extractall", extractAll)
+        bench("ParallelExtractor", lambda root: ParallelExtractor(zipPath, root).extract())
@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 from typing import TYPE_CHECKING
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Slot
 from PySide6.QtWidgets import QWidget
+from creart import it
 from qfluentwidgets import ExpandLayout, FluentIcon, ScrollArea
 
 from src.Core.Config.ConfigModel import BotConfig
+from src.Core.NapCatStore import NapCatStore
 from src.Ui.common.InputCard import (
     ComboBoxConfigCard,
     LineEditConfigCard,
@@ -38,6 +40,9 @@ class BotWidget(ScrollArea):
         self._initWidget()
         self._setLayout()
 
+        # 版本仓库变化时 (包括后台收录完成) 更新版本列表
+        it(NapCatStore).versionsChanged.connect(self._versionsChangedSlot)
+
         if config is not None:
             # 如果传入了 config 则进行解析并填充内部卡片
             self.config = config
@@ -95,6 +100,13 @@ class BotWidget(ScrollArea):
             content=self.tr("Access Token, can be empty"),
             parent=self.view,
         )
+        self.napcatVersionCard = ComboBoxConfigCard(
+            icon=FluentIcon.TAG,
+            title=self.tr("NapCat version"),
+            content=self.tr("Versions in the local store, default is the installed version"),
+            texts=["default", *it(NapCatStore).versions()],
+            parent=self.view,
+        )
 
         self.cards = [
             self.botNameCard,
@@ -104,6 +116,7 @@ class BotWidget(ScrollArea):
             self.musicSignUrl,
             self.heartIntervalCard,
             self.accessTokenCard,
+            self.napcatVersionCard,
         ]
 
     def fillValue(self) -> None:
@@ -117,6 +130,30 @@ class BotWidget(ScrollArea):
         self.musicSignUrl.fillValue(self.config.musicSignUrl)
         self.heartIntervalCard.fillValue(self.config.heartInterval)
         self.accessTokenCard.fillValue(self.config.accessToken)
+        self._setVersionTexts(self.config.napcatVersion or "default")
+
+    def _setVersionTexts(self, current: str) -> None:
+        """
+        ## 用仓库中的版本重新填充版本下拉框, 并选中 current
+            - current 已从仓库中删除时仍然显示, 以免静默修改配置
+        """
+        card = self.napcatVersionCard
+        texts = ["default", *it(NapCatStore).versions()]
+        if current not in texts:
+            texts.append(current)
+        card.texts[:] = texts
+        card.comboBox.blockSignals(True)
+        card.comboBox.clear()
+        card.comboBox.addItems(texts)
+        card.comboBox.blockSignals(False)
+        card.fillValue(current)
+
+    @Slot()
+    def _versionsChangedSlot(self) -> None:
+        """
+        ## 版本仓库变化, 保留当前的选择
+        """
+        self._setVersionTexts(self.napcatVersionCard.getValue() or "default")
 
     def _setLayout(self) -> None:
         """
@@ -142,6 +179,7 @@ class BotWidget(ScrollArea):
             "musicSignUrl": self.musicSignUrl.getValue(),
             "heartInterval": self.heartIntervalCard.getValue(),
             "accessToken": self.accessTokenCard.getValue(),
+            "napcatVersion": "" if self.napcatVersionCard.getValue() == "default" else self.napcatVersionCard.getValue(),
         }
 
     def clearValues(self) -> None:
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
-import json
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING
 
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QHBoxLayout, QVBoxLayout, QWidget
@@ -123,54 +122,33 @@ class ConfigTopCard(QWidget):
     def _addBotListBtnSlot(self) -> None:
         """
         ## 添加到机器人列表
-        先保存到配置文件，然后执行 update 进行刷新
+        保存到配置存储, 机器人列表会自动刷新
         """
-        from src.Core.PathFunc import PathFunc
+        from src.Core.Config.BotConfigStore import BotConfigStore
         from src.Core.Config.ConfigModel import Config
         from src.Ui.AddPage.AddWidget import AddWidget
-        from src.Ui.BotListPage.BotListWidget import BotListWidget
 
-        bot_config_path = it(PathFunc).bot_config_path
         try:
-            # 读取配置文件并追加, 判断是否存在相同的 QQID
+            # 判断是否存在相同的 QQID
             config = Config(**it(AddWidget).getConfig())
-            with open(str(bot_config_path), "r", encoding="utf-8") as f:
-                bot_configs: List[dict] = json.load(f)
-
-            for bot_config in bot_configs:
-                # 遍历验证是否存在相同的机器人
-                _ = Config(**bot_config)
-                if config.bot.QQID == _.bot.QQID:
-                    it(AddWidget).showError(
-                        self.tr("Bots can't be added"),
-                        self.tr(f"{config.bot.QQID} it already exists, please do not add it repeatedly")
-                    )
-                    return
-            # 追加到配置文件, 使用json方法将内部转为json对象, 再用loads方法转为dict对象, 以确保列表内数据一致性
-            # 不可以直接使用 dict方法 转为 dict对象, 内部 WebsocketUrl 和 HttpUrl 不会自动转为 str
-            bot_configs.append(json.loads(config.json()))
-
-            with open(str(bot_config_path), "w", encoding="utf-8") as f:
-                json.dump(bot_configs, f, indent=4)
+            if it(BotConfigStore).contains(config.bot.QQID):
+                it(AddWidget).showError(
+                    self.tr("Bots can't be added"),
+                    self.tr(f"{config.bot.QQID} it already exists, please do not add it repeatedly")
+                )
+                return
+
+            # 写入配置, 机器人列表通过 botAdded 信号刷新
+            it(BotConfigStore).add(config)
 
             # 同时创建bat脚本
             self._createBatScriptSlot()
 
-            # 执行刷新
-            it(BotListWidget).botList.updateList()
-
             it(AddWidget).showSuccess(
                 self.tr("Bot addition success!"),
                 self.tr(f"Bot({config.bot.QQID}) it has been successfully added, you can view it in BotList")
             )
 
-        except FileNotFoundError:
-            # 如果 json 文件没有被创建则创建一个并写入
-            config = Config(**it(AddWidget).getConfig())
-            config = [json.loads(config.json())]
-            with open(str(bot_config_path), "w", encoding="utf-8") as f:
-                json.dump(config, f, indent=4)
-
         except ValueError as e:
             # 如果用户没有输入必须值，则提示
             it(AddWidget).showError(self.tr("Bots can't be added"), str(e))
@@ -1,22 +1,80 @@
 # -*- coding: utf-8 -*-
-import json
-from typing import List
+from typing import Dict, List, Optional, TYPE_CHECKING
 
-from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import QModelIndex, QRect, QRectF, QSize, Qt, Slot
+from PySide6.QtGui import QColor, QPainter
+from PySide6.QtWidgets import QListView, QStyle, QStyledItemDelegate, QStyleOptionViewItem
 from creart import it
-from qfluentwidgets import ScrollArea, FlowLayout
+from qfluentwidgets import ListView, getFont, isDarkTheme
 
-from src.Core.Config.ConfigModel import Config, DEFAULT_CONFIG
-from src.Core.PathFunc import PathFunc
-from src.Ui.BotListPage.BotCard import BotCard
+from src.Core.BotStateRegistry import BotState
+from src.Core.Config.BotConfigStore import BotConfigStore
+from src.Core.Config.ConfigModel import Config
+from src.Ui.common.AvatarCache import AvatarCache, drawAvatar
+from src.Ui.common.BotListModel import BotListModel
 
+if TYPE_CHECKING:
+    from src.Ui.BotListPage.BotWidget import BotWidget
 
-class BotList(ScrollArea):
+
+class BotCardDelegate(QStyledItemDelegate):
+    """
+    ## 以卡片形式绘制机器人, 替代每个机器人一个 CardWidget
+    """
+    CARD_SIZE = QSize(190, 230)
+    AVATAR_SIZE = 115
+    # 右上角状态点的颜色, 未运行时不绘制
+    STATE_COLORS = {
+        BotState.STARTING: QColor(255, 185, 0),
+        BotState.RUNNING: QColor(108, 203, 95),
+        BotState.LOGGED_IN: QColor(108, 203, 95),
+        BotState.CRASHED: QColor(255, 99, 71),
+    }
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return self.CARD_SIZE
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = QRect(option.rect.topLeft(), self.CARD_SIZE)
+        hover = bool(option.state & QStyle.StateFlag.State_MouseOver)
+
+        # 卡片背景
+        if isDarkTheme():
+            background, border = QColor(255, 255, 255, 21 if hover else 13), QColor(0, 0, 0, 48)
+        else:
+            background, border = QColor(255, 255, 255, 255 if hover else 170), QColor(0, 0, 0, 19)
+        painter.setPen(border)
+        painter.setBrush(background)
+        painter.drawRoundedRect(QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), 5, 5)
+
+        # 头像
+        avatarRect = QRect(
+            rect.left() + (rect.width() - self.AVATAR_SIZE) // 2, rect.top() + 30, self.AVATAR_SIZE, self.AVATAR_SIZE
+        )
+        drawAvatar(painter, avatarRect, index.data(Qt.ItemDataRole.DecorationRole))
+
+        # 在右上角显示运行状态
+        if (stateColor := self.STATE_COLORS.get(index.data(BotListModel.StateRole))) is not None:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(stateColor)
+            painter.drawEllipse(QRectF(rect.right() - 20, rect.top() + 10, 8, 8))
+
+        # 名称
+        painter.setFont(getFont(16))
+        painter.setPen(Qt.GlobalColor.white if isDarkTheme() else Qt.GlobalColor.black)
+        nameRect = QRect(rect.left() + 10, avatarRect.bottom() + 25, rect.width() - 20, 30)
+        name = painter.fontMetrics().elidedText(index.data(), Qt.TextElideMode.ElideRight, nameRect.width())
+        painter.drawText(nameRect, Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop, name)
+        painter.restore()
+
+
+class BotList(ListView):
     """
     ## BotListWidget 内部的机器人列表
 
-    自动读取配置文件中已有的的机器人配置
+    数据来自共享的 BotListModel, 只绘制可见的卡片; 点击卡片时才创建对应的 BotWidget
     """
 
     def __init__(self, parent) -> None:
@@ -24,123 +82,116 @@ class BotList(ScrollArea):
         ## 初始化
         """
         super().__init__(parent=parent)
-        # 创建属性
-        self.botList: List[Config] = []
-        self.botCardList: List[BotCard] = []
+        # 创建属性, 已经打开过的机器人页面, 以 QQID 为键
+        self.botWidgets: Dict[str, "BotWidget"] = {}
+        self._loaded = False
 
         # 调用方法
-        self._createView()
         self._initWidget()
 
-    def _initWidget(self) -> None:
+        # 连接配置变化信号
+        it(BotConfigStore).botUpdated.connect(self._botUpdatedSlot)
+        it(BotConfigStore).botRemoved.connect(self._botRemovedSlot)
+
+    @property
+    def botList(self) -> List[Config]:
         """
-        ## 设置 ScrollArea
+        ## 当前所有机器人配置
         """
-        self.setWidget(self.view)
-        self.setWidgetResizable(True)
-        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        return it(BotConfigStore).configs()
 
-    def _createView(self) -> None:
+    def _initWidget(self) -> None:
         """
-        ## 构建并设置 ScrollArea 所需的 widget
+        ## 设置视图
         """
-        self.view = QWidget(self)
-        self.cardLayout = FlowLayout(self.view, True)
-        self.cardLayout.setContentsMargins(0, 0, 0, 0)
-        self.cardLayout.setSpacing(4)
-        self.view.setObjectName("BotListView")
-        self.view.setLayout(self.cardLayout)
+        self.setObjectName("BotListView")
+        self.setModel(it(BotListModel))
+        self.setItemDelegate(BotCardDelegate(self))
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setMovement(QListView.Movement.Static)
+        self.setUniformItemSizes(True)
+        self.setSpacing(2)
+        self.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.setMouseTracking(True)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.clicked.connect(self._clickedSlot)
 
     def updateList(self) -> None:
         """
         ## 更新机器人列表
+            - 首次调用时提示加载结果, 之后重新读取配置仓库, 差异通过模型更新到视图
+            - 获取失败的头像在重绘时重新请求
         """
-        self._parseList()
-
-        if not self.botCardList:
-            # 如果是首次运行, 则直接添加到布局和 botCardList
-            for bot in self.botList:
-                card = BotCard(bot, self)
-                self.cardLayout.addWidget(card)
-                self.botCardList.append(card)
+        it(AvatarCache).retryFailed()
+        self.viewport().update()
+        if self._loaded:
+            it(BotConfigStore).reload()
             return
 
-        QQList = [card.config.bot.QQID for card in self.botCardList]
-        for bot_config in self.botList:
-            # 遍历并判断是否有新增的 bot
-            if bot_config.bot.QQID in QQList:
-                # 如果属于则直接跳过
-                continue
-
-            # 不属于则就属于新增, 创建 card 并 添加到布局
-            card = BotCard(bot_config)
-            self.cardLayout.addWidget(card)
-            self.botCardList.append(card)
-
-        for card in self.botCardList:
-            # 遍历并判断是否有减少的 bot
-            if card.config in self.botList:
-                # 属于则就是没有被删除, 跳过
-                continue
-
-            # 移除出布局并删除
-            self.botCardList.remove(card)
-            self.cardLayout.removeWidget(card)
-            card.deleteLater()
-
-        # 刷新一次布局
-        self.cardLayout.update()
-
-    def _parseList(self) -> None:
-        """
-        ## 解析机器人配置(如果有)
-        """
-        try:
-            # 读取配置列表
-            with open(str(it(PathFunc).bot_config_path), "r", encoding="utf-8") as f:
-                bot_configs = json.load(f)
-
-            if not bot_configs:
-                # 创建信息条
-                self.parent().parent().showInfo(
-                    title=self.tr("There are no bot configuration items"),
-                    content=self.tr("You'll need to add it in the Add bot page"),
-                )
-                self.botList = []
-                return
-
-            # 检查是否有新配置项并配置默认值
-            bot_configs = [self.updateConfig(config, DEFAULT_CONFIG) for config in bot_configs]
-
-            # 如果从文件加载的 bot_config 不为空则执行使用Config和列表表达式解析
-            self.botList: List[Config] = [Config(**config) for config in bot_configs]
-            self.parent().parent().showSuccess(
-                title=self.tr("Load the list of bots"),
-                content=self.tr("The list of bots was successfully loaded"),
+        if it(BotConfigStore).isEmpty():
+            # 创建信息条
+            self.parent().parent().showInfo(
+                title=self.tr("There are no bot configuration items"),
+                content=self.tr("You'll need to add it in the Add bot page"),
             )
+            return
+
+        self._loaded = True
+        self.parent().parent().showSuccess(
+            title=self.tr("Load the list of bots"),
+            content=self.tr("The list of bots was successfully loaded"),
+        )
+
+    def botWidget(self, qqid: str) -> Optional["BotWidget"]:
+        """
+        ## 获取已经创建的机器人页面
+        """
+        return self.botWidgets.get(qqid)
 
-        except FileNotFoundError:
-            # 如果文件不存在则创建一个
-            with open(str(it(PathFunc).bot_config_path), "w", encoding="utf-8") as f:
-                json.dump([], f, indent=4)
-            self.botList = []
-
-        except ValueError as e:
-            # 如果配置文件解析失败则提示错误信息并覆盖原有文件
-            self.parent().parent().showError(self.tr("Unable to load bot list"), str(e))
-            with open(str(it(PathFunc).bot_config_path), "w", encoding="utf-8") as f:
-                json.dump([], f, indent=4)
-            self.botList = []
-
-    def updateConfig(self, user_config, default_config):
-        """
-        ## 这是一个检查是否有新版参数并填入默认值的函数
-        """
-        for key, value in default_config.items():
-            if isinstance(value, dict):
-                # 如果值是字典，则递归调用
-                user_config[key] = self.updateConfig(user_config.get(key, {}), value)
-            else:
-                if key not in user_config:
-                    user_config[key] = value
-        return user_config
+    def openBot(self, qqid: str) -> Optional["BotWidget"]:
+        """
+        ## 打开机器人页面, 第一次打开时创建
+        """
+        from src.Ui.BotListPage.BotListWidget import BotListWidget
+        from src.Ui.BotListPage.BotWidget import BotWidget
+        if (config := it(BotConfigStore).get(qqid)) is None:
+            return None
+
+        it(BotListWidget).topCard.addItem(f"{config.bot.name} ({config.bot.QQID})")
+        it(BotListWidget).topCard.updateListButton.hide()
+        it(BotListWidget).topCard.syncConfigButton.hide()
+        it(BotListWidget).topCard.importButton.hide()
+        it(BotListWidget).topCard.exportButton.hide()
+
+        if (botWidget := self.botWidgets.get(qqid)) is None:
+            botWidget = self.botWidgets[qqid] = BotWidget(config)
+            it(BotListWidget).view.addWidget(botWidget)
+        it(BotListWidget).view.setCurrentWidget(botWidget)
+        return botWidget
+
+    @Slot(QModelIndex)
+    def _clickedSlot(self, index: QModelIndex) -> None:
+        """
+        ## 点击卡片时打开机器人页面
+        """
+        self.openBot(index.data(BotListModel.QQIDRole))
+
+    @Slot(object)
+    def _botUpdatedSlot(self, config: Config) -> None:
+        """
+        ## 机器人配置被修改, 同步到已打开的页面
+        """
+        if (botWidget := self.botWidgets.get(config.bot.QQID)) is not None:
+            botWidget.config = config
+
+    @Slot(str)
+    def _botRemovedSlot(self, qqid: str) -> None:
+        """
+        ## 删除机器人, 同时移除已经创建的机器人页面
+        """
+        if (botWidget := self.botWidgets.pop(qqid, None)) is None:
+            return
+        from src.Ui.BotListPage.BotListWidget import BotListWidget
+        it(BotListWidget).view.removeWidget(botWidget)
+        botWidget.deleteLater()
@@ -4,17 +4,21 @@
 机器人列表
 """
 from abc import ABC
-from typing import TYPE_CHECKING, Self, Optional
+from typing import TYPE_CHECKING, Self, Optional, List, Tuple
 
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QStackedWidget
 from creart import add_creator, exists_module, it
 from creart.creator import AbstractCreator, CreateTargetInfo
 
+from src.Core.BotStateRegistry import BotStateRegistry
+from src.Core.Config.BotConfigStore import BotConfigStore
+from src.Core.RateLimiter import BandwidthShaper
 from src.Ui.BotListPage.BotList import BotList
 from src.Ui.BotListPage.BotTopCard import BotTopCard
 from src.Ui.StyleSheet import StyleSheet
 
 if TYPE_CHECKING:
+    from src.Ui.BotListPage.BotWidget import BotWidget
     from src.Ui.MainWindow import MainWindow
 
 
@@ -47,6 +51,11 @@ class BotListWidget(QWidget):
         # 调用方法
         self._setLayout()
 
+        # 自动限速时探测正在运行的 bot 的连接, 地址快照在运行状态或配置变化时更新
+        it(BotStateRegistry).stateChanged.connect(self._updateEndpointsSlot)
+        it(BotConfigStore).botUpdated.connect(self._updateEndpointsSlot)
+        self._updateEndpointsSlot()
+
         # 应用样式表
         StyleSheet.BOT_LIST_WIDGET.apply(self)
 
@@ -65,22 +74,51 @@ class BotListWidget(QWidget):
         """
         ## 停止所有 bot
         """
-        for bot in self.botList.botCardList:
-            if not bot.botWidget:
-                continue
-            if bot.botWidget.isRun:
-                bot.botWidget.stopButton.click()
+        for botWidget in list(self.botList.botWidgets.values()):
+            if botWidget.isRun:
+                botWidget.stopButton.click()
+
+    def stopRunningBots(self) -> List["BotWidget"]:
+        """
+        ## 停止所有正在运行的 bot, 返回被停止的 bot 以便之后重新启动
+        """
+        bots = [botWidget for botWidget in self.botList.botWidgets.values() if botWidget.isRun]
+        for botWidget in bots:
+            botWidget.stopButton.click()
+        return bots
+
+    @staticmethod
+    def startBots(bots: List["BotWidget"]) -> None:
+        """
+        ## 启动 bot, 与 stopRunningBots 配合使用实现重启
+        """
+        for botWidget in bots:
+            botWidget.runButton.click()
 
     def getBotIsRun(self):
         """
         ## 获取是否有 bot 正在运行
         """
-        for bot in self.botList.botCardList:
-            if not bot.botWidget:
-                # 如果没有创建则表示没有运行
+        return it(BotStateRegistry).anyRunning()
+
+    def getRunningBotEndpoints(self) -> List[Tuple[str, int]]:
+        """
+        ## 获取正在运行的 bot 的上报地址和反向 WS 地址
+        """
+        urls = []
+        for qqid in it(BotStateRegistry).runningBots():
+            if (config := it(BotConfigStore).get(qqid)) is None:
                 continue
-            if bot.botWidget.isRun:
-                return True
+            connect = config.connect
+            urls.extend(url for url in connect.http.postUrls if url)
+            urls.extend(url for url in connect.reverseWs.urls if url)
+        return BandwidthShaper.endpointsFromUrls(urls)
+
+    def _updateEndpointsSlot(self, *_) -> None:
+        """
+        ## 将正在运行的 bot 的连接地址交给 BandwidthShaper
+        """
+        it(BandwidthShaper).setEndpoints(self.getRunningBotEndpoints())
 
     def showInfo(self, title: str, content: str) -> None:
         """
@@ -1,15 +1,17 @@
 # -*- coding: utf-8 -*-
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from PySide6.QtCore import Qt, Slot
 from PySide6.QtGui import QFont
-from PySide6.QtWidgets import QHBoxLayout, QVBoxLayout, QWidget
+from PySide6.QtWidgets import QFileDialog, QHBoxLayout, QVBoxLayout, QWidget
 from creart import it
-from qfluentwidgets import CaptionLabel, ToolTipFilter
+from qfluentwidgets import CaptionLabel, MessageBox, ToolTipFilter
 from qfluentwidgets.common import setFont, FluentIcon
 from qfluentwidgets.components import BreadcrumbBar, TransparentToolButton
 
 if TYPE_CHECKING:
+    from src.Core.Config.FleetIO import ImportReport
     from src.Ui.BotListPage.BotListWidget import BotListWidget
 
 
@@ -27,6 +29,10 @@ class BotTopCard(QWidget):
         self.breadcrumbBar = BreadcrumbBar(self)
         self.subtitleLabel = CaptionLabel(self.tr("All the bots you've added are here"), self)
         self.updateListButton = TransparentToolButton(FluentIcon.SYNC, self)  # 刷新列表按钮
+        self.syncConfigButton = TransparentToolButton(FluentIcon.SAVE_COPY, self)  # 同步 NapCat 配置按钮
+        self.importButton = TransparentToolButton(FluentIcon.FOLDER_ADD, self)  # 批量导入按钮
+        self.exportButton = TransparentToolButton(FluentIcon.SAVE_AS, self)  # 批量导出按钮
+        self.importWorker = None
 
         self.hBoxLayout = QHBoxLayout()
         self.labelLayout = QVBoxLayout()
@@ -37,6 +43,9 @@ class BotTopCard(QWidget):
         self.breadcrumbBar.addItem(routeKey="BotTopCardTitle", text=self.tr("Bot List"))
         self.breadcrumbBar.setSpacing(15)
         self.updateListButton.clicked.connect(self._updateListButtonSlot)
+        self.syncConfigButton.clicked.connect(self._syncConfigButtonSlot)
+        self.importButton.clicked.connect(self._importButtonSlot)
+        self.exportButton.clicked.connect(self._exportButtonSlot)
         self.breadcrumbBar.currentIndexChanged.connect(self._breadcrumbBarSlot)
 
         self._addTooltips()
@@ -55,6 +64,12 @@ class BotTopCard(QWidget):
         # 添加提示
         self.updateListButton.setToolTip(self.tr("Click to refresh the list"))
         self.updateListButton.installEventFilter(ToolTipFilter(self.updateListButton))
+        self.syncConfigButton.setToolTip(self.tr("Sync the NapCat config files of all bots"))
+        self.syncConfigButton.installEventFilter(ToolTipFilter(self.syncConfigButton))
+        self.importButton.setToolTip(self.tr("Import bots from a CSV / JSON / JSONL file"))
+        self.importButton.installEventFilter(ToolTipFilter(self.importButton))
+        self.exportButton.setToolTip(self.tr("Export all bots to a CSV / JSON / JSONL file"))
+        self.exportButton.installEventFilter(ToolTipFilter(self.exportButton))
 
     @Slot()
     def _breadcrumbBarSlot(self, index: int) -> None:
@@ -66,6 +81,9 @@ class BotTopCard(QWidget):
             from src.Ui.BotListPage.BotListWidget import BotListWidget
             it(BotListWidget).view.setCurrentIndex(index)
             self.updateListButton.show()
+            self.syncConfigButton.show()
+            self.importButton.show()
+            self.exportButton.show()
 
     @staticmethod
     @Slot()
@@ -76,6 +94,110 @@ class BotTopCard(QWidget):
         from src.Ui.BotListPage.BotListWidget import BotListWidget
         it(BotListWidget).botList.updateList()
 
+    @Slot()
+    def _syncConfigButtonSlot(self) -> None:
+        """
+        ## 同步 NapCat 配置按钮的槽函数
+            - 先预览差异, 确认后只写入有变化的文件
+        """
+        from src.Core.Config.BotConfigStore import BotConfigStore
+        from src.Core.NapCatConfigSync import NapCatConfigSync
+        from src.Ui.BotListPage.BotListWidget import BotListWidget
+
+        sync = it(NapCatConfigSync)
+        configs = it(BotConfigStore).configs()
+        if not (report := sync.sync(configs, dryRun=True)).changed:
+            it(BotListWidget).showInfo(
+                title=self.tr("Sync NapCat configs"),
+                content=self.tr("All config files are up to date")
+            )
+            return
+
+        # 最多显示 40 行差异
+        lines = report.diff().splitlines()
+        diff = "\n".join(lines[:40] + ([f"... (+{len(lines) - 40})"] if len(lines) > 40 else []))
+        box = MessageBox(self.tr("Sync NapCat configs"), f"{report.summary()}\n\n{diff}", it(BotListWidget))
+        if not box.exec():
+            return
+
+        try:
+            report = sync.sync(configs)
+        except OSError as e:
+            it(BotListWidget).showError(title=self.tr("Sync NapCat configs"), content=str(e))
+            return
+        it(BotListWidget).showSuccess(title=self.tr("Sync NapCat configs"), content=report.summary())
+
+    @Slot()
+    def _importButtonSlot(self) -> None:
+        """
+        ## 批量导入按钮的槽函数
+        """
+        from src.Core.Config.FleetIO import FleetImportWorker
+        from src.Ui.BotListPage.BotListWidget import BotListWidget
+
+        path, _ = QFileDialog.getOpenFileName(
+            self, self.tr("Import bots"), "", self.tr("Bot list (*.csv *.json *.jsonl)")
+        )
+        if not path or self.importWorker is not None:
+            return
+
+        self.importButton.setEnabled(False)
+        self.importWorker = FleetImportWorker(Path(path))
+        self.importWorker.importFinish.connect(self._importFinishSlot)
+        self.importWorker.errorFinish.connect(
+            lambda message: it(BotListWidget).showError(title=self.tr("Import failed"), content=message)
+        )
+        self.importWorker.finished.connect(self._importWorkerFinishedSlot)
+        self.importWorker.start()
+
+    @Slot(object)
+    def _importFinishSlot(self, report: "ImportReport") -> None:
+        """
+        ## 导入文件解析完成, 在一个事务中写入所有有效配置
+        """
+        from src.Core.Config.BotConfigStore import BotConfigStore
+        from src.Ui.BotListPage.BotListWidget import BotListWidget
+
+        if report.configs:
+            it(BotConfigStore).addMany(report.configs)
+
+        content = self.tr(f"{len(report.configs)} bots imported, {len(report.errors)} records failed")
+        if not report.errors:
+            it(BotListWidget).showSuccess(title=self.tr("Import completed"), content=content)
+            return
+
+        # 列出前 5 条错误, 完整列表见日志
+        errors = "\n".join(f"#{error.row} {error.qqid or ''}: {error.message}" for error in report.errors[:5])
+        it(BotListWidget).showError(title=self.tr("Import completed"), content=f"{content}\n{errors}")
+
+    @Slot()
+    def _importWorkerFinishedSlot(self) -> None:
+        self.importWorker.deleteLater()
+        self.importWorker = None
+        self.importButton.setEnabled(True)
+
+    @Slot()
+    def _exportButtonSlot(self) -> None:
+        """
+        ## 批量导出按钮的槽函数
+        """
+        from src.Core.Config.BotConfigStore import BotConfigStore
+        from src.Core.Config.FleetIO import FleetFormatError, exportFleet
+        from src.Ui.BotListPage.BotListWidget import BotListWidget
+
+        path, _ = QFileDialog.getSaveFileName(
+            self, self.tr("Export bots"), "bots.jsonl", self.tr("Bot list (*.csv *.json *.jsonl)")
+        )
+        if not path:
+            return
+
+        try:
+            count = exportFleet(it(BotConfigStore).configs(), Path(path))
+        except (OSError, FleetFormatError) as e:
+            it(BotListWidget).showError(title=self.tr("Export failed"), content=str(e))
+            return
+        it(BotListWidget).showSuccess(title=self.tr("Export completed"), content=self.tr(f"{count} bots exported"))
+
     def _setLayout(self) -> None:
         """
         ## 对内部进行布局
@@ -88,6 +210,9 @@ class BotTopCard(QWidget):
 
         self.buttonLayout.setSpacing(0)
         self.buttonLayout.setContentsMargins(0, 0, 0, 0)
+        self.buttonLayout.addWidget(self.importButton)
+        self.buttonLayout.addWidget(self.exportButton)
+        self.buttonLayout.addWidget(self.syncConfigButton)
         self.buttonLayout.addWidget(self.updateListButton)
         self.buttonLayout.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignBottom)
 
@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import json
 import re
 from pathlib import Path
 
@@ -13,11 +12,14 @@ from qfluentwidgets import (
     SubtitleLabel, ImageLabel, ToolButton, BodyLabel
 )
 
+from src.Core.BotStateRegistry import BotState, BotStateRegistry
+from src.Core.Config.BotConfigStore import BotConfigStore
 from src.Core.Config.ConfigModel import Config
-from src.Core.PathFunc import PathFunc
+from src.Core.NapCatStore import NapCatStore
 from src.Ui.BotListPage.BotWidget.BotSetupPage import BotSetupPage
 from src.Ui.StyleSheet import StyleSheet
 from src.Ui.common import CodeEditor, LogHighlighter
+from src.Ui.common.CodeEditor import LOG_MAX_BLOCKS
 
 
 class BotWidget(QWidget):
@@ -28,8 +30,6 @@ class BotWidget(QWidget):
     def __init__(self, config: Config) -> None:
         super().__init__()
         self.config = config
-        self.isRun = False  # 用于标记机器人是否在运行
-        self.isLogin = False  # 用于标记机器人是否登录
         # 创建所需控件
         self._createView()
         self._createPivot()
@@ -45,6 +45,23 @@ class BotWidget(QWidget):
 
         StyleSheet.BOT_WIDGET.apply(self)
 
+    @property
+    def isRun(self) -> bool:
+        """
+        ## 机器人是否在运行, 状态保存在 BotStateRegistry
+        """
+        return it(BotStateRegistry).isRunning(self.config.bot.QQID)
+
+    @property
+    def isLogin(self) -> bool:
+        """
+        ## 机器人是否登录
+        """
+        return it(BotStateRegistry).isLoggedIn(self.config.bot.QQID)
+
+    def _setState(self, state: BotState) -> None:
+        it(BotStateRegistry).setState(self.config.bot.QQID, state)
+
     def _createPivot(self) -> None:
         """
         ## 创建机器人 Widget 顶部导航栏
@@ -82,6 +99,8 @@ class BotWidget(QWidget):
 
         self.botLogPage = CodeEditor(self)
         self.botLogPage.setObjectName(f"{self.config.bot.QQID}_BotWidgetPivot_BotLog")
+        self.botLogPage.setMaximumBlockCount(LOG_MAX_BLOCKS)
+        self.highlighter = LogHighlighter(self.botLogPage)
 
         # 将页面添加到 view
         # self.view.addWidget(self.botInfoPage)
@@ -168,6 +187,9 @@ class BotWidget(QWidget):
 
         self.env = QProcess.systemEnvironment()
         self.env.append("ELECTRON_RUN_AS_NODE=1")
+        # 修补后的 QQ 从此变量加载 NapCat, 实现每个 bot 使用不同的版本
+        napcatMain = it(NapCatStore).resolve(self.config.bot.napcatVersion) / "napcat.mjs"
+        self.env.append(f"NCD_NAPCAT_MAIN={napcatMain.as_uri()}")
 
         self.process = QProcess(self)
         self.process.setEnvironment(self.env)
@@ -176,9 +198,11 @@ class BotWidget(QWidget):
         self.process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
         self.process.readyReadStandardOutput.connect(self._handle_stdout)
         self.process.readyReadStandardOutput.connect(self._showQRCode)
+        self.process.errorOccurred.connect(self._processErrorSlot)
         self.process.finished.connect(self._processFinishedSlot)
-        self.highlighter = LogHighlighter(self.botLogPage.document())
         self.qrcodeMsgBox = QRCodeMessageBox(self.parent().parent())
+        # 保持 STARTING 直到 NapCat 输出登录二维码或登录成功
+        self._setState(BotState.STARTING)
         self.process.start()
         self.process.waitForStarted()
 
@@ -186,24 +210,22 @@ class BotWidget(QWidget):
             title=self.tr("The run command has been executed"),
             content=self.tr("If there is no output for a long time, check the QQ path and NapCat path")
         )
-        self.isRun = True
         self.view.setCurrentWidget(self.botLogPage)
-        self.runButton.setVisible(False)
-        self.stopButton.setVisible(True)
-        self.rebootButton.setVisible(True)
+        self._updateRunButtons()
 
     @Slot()
     def _stopButtonSlot(self):
         """
         ## 停止按钮槽函数
+            - 先标记为 STOPPED, 进程结束时就不会被当作崩溃
         """
+        self._setState(BotState.STOPPED)
         self.process.kill()
         self.process.waitForFinished()
 
-        self.isRun = False
-        self.isLogin = False
         self.view.setCurrentWidget(self.botLogPage)
         self.showQRCodeButton.hide()
+        self._updateRunButtons()
 
     @Slot()
     def _rebootButtonSlot(self):
@@ -259,6 +281,8 @@ class BotWidget(QWidget):
             # 提取匹配的路径
             qrcodePath = match.group(1).strip()
             self.qrcodeMsgBox.setQRCode(qrcodePath)
+            # NapCat 已经就绪, 等待扫码登录
+            self._setState(BotState.RUNNING)
             self.showQRCodeButton.show()
             self.showQRCodeButton.click()
             return
@@ -267,7 +291,7 @@ class BotWidget(QWidget):
             # 如果登录成功
             self.qrcodeMsgBox.cancelButton.click()
             self.showQRCodeButton.hide()
-            self.isLogin = True
+            self._setState(BotState.LOGGED_IN)
             it(BotListWidget).showSuccess(
                 title=self.tr("Login successful!"),
                 content=self.tr(f"Account {self.config.bot.QQID} login successful!")
@@ -280,39 +304,54 @@ class BotWidget(QWidget):
         cursor.insertText(f"进程结束，退出码为 {exit_code}，状态为 {exit_status}")
         self.botLogPage.setTextCursor(cursor)
 
+        if self.isRun:
+            # 不是通过停止按钮结束的, 正常退出视为停止, 否则视为崩溃
+            crashed = exit_status == QProcess.ExitStatus.CrashExit or exit_code != 0
+            self._setState(BotState.CRASHED if crashed else BotState.STOPPED)
+            self.qrcodeMsgBox.cancelButton.click()
+            self.showQRCodeButton.hide()
+            self._updateRunButtons()
+
+    @Slot(QProcess.ProcessError)
+    def _processErrorSlot(self, error: QProcess.ProcessError) -> None:
+        """
+        ## 进程无法启动时不会发出 finished, 在这里标记为崩溃
+        """
+        if error != QProcess.ProcessError.FailedToStart:
+            return
+        logger.error(f"机器人 {self.config.bot.QQID} 启动失败: {self.process.errorString()}")
+        self._setState(BotState.CRASHED)
+        self._updateRunButtons()
+
+    def _updateRunButtons(self) -> None:
+        """
+        ## 根据运行状态切换启动/停止/重启按钮, 只在日志页面显示
+        """
+        if self.view.currentWidget() is not self.botLogPage:
+            return
+        self.runButton.setVisible(not self.isRun)
+        self.stopButton.setVisible(self.isRun)
+        self.rebootButton.setVisible(self.isRun)
+
     @Slot()
     def _updateButtonSlot(self) -> None:
         """
         ## 更新按钮的槽函数
         """
         from src.Ui.BotListPage import BotListWidget
-        from src.Core.Config.ConfigModel import DEFAULT_CONFIG
         self.newConfig = Config(**self.botSetupPage.getValue())
 
-        # 读取配置列表
-        with open(str(it(PathFunc).bot_config_path), "r", encoding="utf-8") as f:
-            bot_configs = [it(BotListWidget).botList.updateConfig(config, DEFAULT_CONFIG) for config in json.load(f)]
-            bot_configs = [Config(**config) for config in bot_configs]
-
-        if not bot_configs:
-            # 为空报错
-            logger.error(f"机器人列表加载失败 数据为空: {bot_configs}")
+        if not it(BotConfigStore).contains(self.newConfig.bot.QQID):
+            # 仓库中已经没有这个机器人
+            logger.error(f"机器人 {self.newConfig.bot.QQID} 的配置不存在")
             it(BotListWidget).showError(
                 title=self.tr("Update error"),
                 content=self.tr("Data loss within the profile")
             )
             return
 
-        # 如果从文件加载的 bot_config 不为空则进行更新(为空怎么办呢,我能怎么办,崩了呗bushi
-        for index, config in enumerate(bot_configs):
-            # 遍历配置列表,找到一样则替换
-            if config.bot.QQID == self.newConfig.bot.QQID:
-                bot_configs[index] = self.newConfig
-                break
-        # 不可以直接使用 dict方法 转为 dict对象, 内部 WebsocketUrl 和 HttpUrl 不会自动转为 str
-        bot_configs = [json.loads(config.json()) for config in bot_configs]
-        with open(str(it(PathFunc).bot_config_path), "w", encoding="utf-8") as f:
-            json.dump(bot_configs, f, indent=4)
+        # 只更新这一个机器人的配置, 卡片通过信号同步
+        it(BotConfigStore).update(self.newConfig)
         # 更新成功提示
         it(BotListWidget).showSuccess(
             title=self.tr("Update success"),
@@ -338,6 +377,9 @@ class BotWidget(QWidget):
         it(BotListWidget).view.setCurrentIndex(0)
         it(BotListWidget).topCard.breadcrumbBar.setCurrentIndex(0)
         it(BotListWidget).topCard.updateListButton.show()
+        it(BotListWidget).topCard.syncConfigButton.show()
+        it(BotListWidget).topCard.importButton.show()
+        it(BotListWidget).topCard.exportButton.show()
 
     @Slot()
     def _botSetupSubPageReturnButtonSlot(self) -> None:
@@ -503,14 +545,6 @@ class DeleteConfigMessageBox(MessageBoxBase):
         ## 执行删除配置
             - 返回到列表, 删除配置并保存, 刷新列表
         """
-        from src.Ui.BotListPage import BotListWidget
-
-        it(BotListWidget).botList.botList.remove(parent.config)
-
-        bot_configs = [json.loads(config.json()) for config in it(BotListWidget).botList.botList]
-
-        with open(str(it(PathFunc).bot_config_path), "w", encoding="utf-8") as f:
-            json.dump(bot_configs, f, indent=4)
-
         parent.returnListButton.click()
-        it(BotListWidget).botList.updateList()
+        # 卡片通过 botRemoved 信号移除
+        it(BotConfigStore).remove(parent.config.bot.QQID)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+## 主页背景渲染
+    - 窗口缩放过程中使用缩小后的预览图快速绘制, 停止缩放 SETTLE_DELAY 毫秒后在后台线程平滑缩放
+    - 平滑缩放的结果按 (主题, 尺寸档位) 缓存, 切换主题或恢复到之前的尺寸时直接使用缓存
+    - 原图的读取和解码也在后台线程完成, 不占用首屏时间
+"""
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, QRect, QRectF, QSize, Qt, QThread, QTimer, Signal
+from PySide6.QtGui import QImage, QPainter, QPixmap
+
+from src.Ui.ResourceBundle import ResourceBundle
+
+# 尺寸档位 (像素), 缓存的图片尺寸向上取整到该值的倍数
+SIZE_BUCKET = 64
+# 最多缓存的平滑缩放结果数量
+CACHE_SIZE = 8
+# 停止缩放后等待多久开始平滑缩放 (毫秒)
+SETTLE_DELAY = 150
+# 预览图相对原图的缩小倍数
+PREVIEW_SCALE = 4
+
+# (是否深色主题, 宽, 高)
+CacheKey = Tuple[bool, int, int]
+
+
+def backgroundPath(dark: bool) -> str:
+    return f":Global/image/Global/page_bg_{'dark' if dark else 'light'}.png"
+
+
+class ScaleWorker(QThread):
+    """
+    ## 在后台线程中读取原图并平滑缩放
+    """
+    # 缩放完成, 参数为 (CacheKey, 缩放结果, 原图, 预览图), 已有原图时预览图为 None
+    scaleFinish = Signal(object, object, object, object)
+
+    def __init__(self, key: CacheKey, source: Optional[QImage], parent=None) -> None:
+        super().__init__(parent=parent)
+        self.key = key
+        self.source = source
+
+    def run(self) -> None:
+        dark, width, height = self.key
+        preview = None
+        if (source := self.source) is None:
+            source = QImage(backgroundPath(dark))
+            preview = source.scaled(
+                source.size() / PREVIEW_SCALE,
+                Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+            )
+        image = source.scaled(
+            QSize(width, height),
+            Qt.AspectRatioMode.KeepAspectRatioByExpanding,  # 等比缩放
+            Qt.TransformationMode.SmoothTransformation,  # 平滑效果
+        )
+        self.scaleFinish.emit(self.key, image, source, preview)
+
+
+class BackgroundRenderer(QObject):
+    """
+    ## 背景渲染器, 由 HomeWidget 在缩放和切换主题时调用 setTarget, 在 paintEvent 中调用 paint
+    """
+    # 需要重绘
+    updated = Signal()
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent=parent)
+        self.pixmap: Optional[QPixmap] = None
+        self._key: Optional[CacheKey] = None
+        self._sources: Dict[bool, QImage] = {}
+        self._previews: Dict[bool, QPixmap] = {}
+        self._cache: "OrderedDict[CacheKey, QPixmap]" = OrderedDict()
+        self._worker: Optional[ScaleWorker] = None
+
+        self.settleTimer = QTimer(self)
+        self.settleTimer.setSingleShot(True)
+        self.settleTimer.setInterval(SETTLE_DELAY)
+        self.settleTimer.timeout.connect(self._renderSmooth)
+
+    @staticmethod
+    def cacheKey(dark: bool, size: QSize) -> CacheKey:
+        """
+        ## 尺寸向上取整到档位, 相近的尺寸共用同一张缓存
+        """
+        def bucket(value: int) -> int:
+            return max(SIZE_BUCKET, -(-value // SIZE_BUCKET) * SIZE_BUCKET)
+
+        return dark, bucket(size.width()), bucket(size.height())
+
+    def setTarget(self, dark: bool, size: QSize) -> None:
+        """
+        ## 设置需要绘制的主题和尺寸
+            - 有缓存时立即使用, 否则先使用预览图并在缩放停止后平滑缩放
+        """
+        self._key = key = self.cacheKey(dark, size)
+        if (pixmap := self._cache.get(key)) is not None:
+            self._cache.move_to_end(key)
+            self.pixmap = pixmap
+            self.updated.emit()
+            return
+
+        if (preview := self._previews.get(dark)) is not None:
+            self.pixmap = preview
+            self.updated.emit()
+            self.settleTimer.start()
+        else:
+            # 还没有读取过该主题的原图, 没有预览可用, 立即开始读取
+            self._renderSmooth()
+
+    def paint(self, painter: QPainter, rect: QRect) -> None:
+        """
+        ## 以居中裁剪的方式铺满 rect
+        """
+        if self.pixmap is None or self.pixmap.isNull() or rect.isEmpty():
+            return
+        width, height = self.pixmap.width(), self.pixmap.height()
+        scale = max(rect.width() / width, rect.height() / height)
+        sourceWidth, sourceHeight = rect.width() / scale, rect.height() / scale
+        source = QRectF((width - sourceWidth) / 2, (height - sourceHeight) / 2, sourceWidth, sourceHeight)
+        painter.drawPixmap(QRectF(rect), self.pixmap, source)
+
+    def _renderSmooth(self) -> None:
+        """
+        ## 开始平滑缩放, 同一时间只有一个后台任务, 结束后再处理最新的尺寸
+        """
+        if self._worker is not None or self._key is None or self._key in self._cache:
+            return
+        dark = self._key[0]
+        if dark not in self._sources:
+            # 资源包需要在界面线程注册
+            ResourceBundle.forTheme(dark).register()
+
+        self._worker = ScaleWorker(self._key, self._sources.get(dark), self)
+        self._worker.scaleFinish.connect(self._scaleFinishSlot)
+        self._worker.finished.connect(self._worker.deleteLater)
+        self._worker.start()
+
+    def _scaleFinishSlot(self, key: CacheKey, image: QImage, source: QImage, preview: Optional[QImage]) -> None:
+        """
+        ## 缓存缩放结果, 仍是当前尺寸时立即使用
+        """
+        self._worker = None
+        dark = key[0]
+        self._sources.setdefault(dark, source)
+        if preview is not None:
+            self._previews[dark] = QPixmap.fromImage(preview)
+
+        self._cache[key] = QPixmap.fromImage(image)
+        while len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+        if key == self._key:
+            self.pixmap = self._cache[key]
+            self.updated.emit()
+            return
+
+        # 缩放期间尺寸或主题又变了, 先使用预览, 已经停止缩放时继续处理最新的尺寸
+        if (preview := self._previews.get(self._key[0])) is not None:
+            self.pixmap = preview
+            self.updated.emit()
+        if not self.settleTimer.isActive():
+            self._renderSmooth()
@@ -25,6 +25,8 @@ class DisplayViewWidget(QWidget):
         self.logoImage = ImageLabel(self)
         self.logoLabel = TitleLabel("NapCatQQ-Desktop", self)
         self.buttonGroup = ButtonGroup(self)
+        # 当前标题字号
+        self._fontSize: int = 0
 
         # 设置控件
         self.logoImage.setImage(":Global/logo.png")
@@ -62,13 +64,14 @@ class DisplayViewWidget(QWidget):
         重写实现自动缩放
         """
         super().resizeEvent(event)
-        # 缩放 Logo
-        self.logoImage.scaledToWidth(self.width() // 5)
-        # 缩放字体
+        # 缩放 Logo, 宽度不变时跳过
+        if (logo_width := self.width() // 5) != self.logoImage.width():
+            self.logoImage.scaledToWidth(logo_width)
+        # 缩放字体, 字号不变时跳过, 避免每次缩放都重新设置字体
         new_font_size = max(28, self.width() // 30)
-        setFont(self.logoLabel, new_font_size, QFont.Weight.DemiBold)
-        # 重绘页面
-        self.update()
+        if new_font_size != self._fontSize:
+            self._fontSize = new_font_size
+            setFont(self.logoLabel, new_font_size, QFont.Weight.DemiBold)
 
 
 class ButtonGroup(QWidget):
@@ -7,7 +7,7 @@ from abc import ABC
 from typing import TYPE_CHECKING, Self, Optional
 
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap, QPainter
+from PySide6.QtGui import QPainter
 from PySide6.QtWidgets import QStackedWidget
 from creart import add_creator, exists_module, it
 from creart.creator import AbstractCreator, CreateTargetInfo
@@ -15,6 +15,7 @@ from qfluentwidgets import isDarkTheme, InfoBar, InfoBarIcon, InfoBarPosition, P
 
 from src.Core.Config import StartOpenHomePageViewEnum as SEnum
 from src.Core.Config import cfg
+from src.Ui.HomePage.BackgroundRenderer import BackgroundRenderer
 from src.Ui.HomePage.ContentView import ContentViewWidget
 from src.Ui.HomePage.DisplayView import DisplayViewWidget
 from src.Ui.HomePage.DownloadView import DownloadViewWidget
@@ -32,10 +33,9 @@ class HomeWidget(QStackedWidget):
         self.contentView: Optional[ContentViewWidget] = None
         self.downloadView: Optional[DownloadViewWidget] = None
 
-        # 加载背景图片
-        self.bgPixmap = None
-        self._bgPixmapLight = QPixmap(":Global/image/Global/page_bg_light.png")
-        self._bgPixmapDark = QPixmap(":Global/image/Global/page_bg_dark.png")
+        # 背景图片由渲染器在后台缩放并缓存
+        self.bgRenderer = BackgroundRenderer(self)
+        self.bgRenderer.updated.connect(self.update)
 
     def initialize(self, parent: "MainWindow") -> Self:
         """
@@ -104,19 +104,9 @@ class HomeWidget(QStackedWidget):
     def updateBgImage(self) -> None:
         """
         用于更新图片大小
+            - 缩放过程中先绘制预览, 停止缩放后才平滑缩放, 见 BackgroundRenderer
         """
-        # 重新加载图片保证缩放后清晰
-        if not isDarkTheme():
-            self.bgPixmap = self._bgPixmapLight
-        else:
-            self.bgPixmap = self._bgPixmapDark
-
-        self.bgPixmap = self.bgPixmap.scaled(
-            self.size(),
-            aspectMode=Qt.AspectRatioMode.KeepAspectRatioByExpanding,  # 等比缩放
-            mode=Qt.TransformationMode.SmoothTransformation,  # 平滑效果
-        )
-        self.update()
+        self.bgRenderer.setTarget(isDarkTheme(), self.size())
 
     def showInfo(self, title: str, content: str) -> None:
         """
@@ -167,7 +157,7 @@ class HomeWidget(QStackedWidget):
         重写绘制事件绘制背景图片
         """
         painter = QPainter(self)
-        painter.drawPixmap(self.rect(), self.bgPixmap)
+        self.bgRenderer.paint(painter, self.rect())
         super().paintEvent(event)
 
     def resizeEvent(self, event) -> None:
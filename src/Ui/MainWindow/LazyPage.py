@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+## 延迟构建的页面
+    - 侧边栏注册的是轻量的占位控件, 真正的页面在第一次显示或空闲时才构建
+"""
+from typing import Callable, Optional
+
+from PySide6.QtCore import Signal
+from PySide6.QtWidgets import QVBoxLayout, QWidget
+from loguru import logger
+
+from src.Core.StartupTracer import tracer
+
+
+class LazyPage(QWidget):
+    """
+    ## 页面占位控件
+        - factory 返回构建好的页面, 只会被调用一次
+        - 构建完成后页面被放入自身布局并发出 pageLoaded 信号
+    """
+    # 页面构建完成, 参数为真正的页面
+    pageLoaded = Signal(QWidget)
+
+    def __init__(self, routeKey: str, factory: Callable[[], QWidget], parent=None) -> None:
+        super().__init__(parent=parent)
+        self.factory = factory
+        self.page: Optional[QWidget] = None
+
+        self.vBoxLayout = QVBoxLayout(self)
+        self.vBoxLayout.setContentsMargins(0, 0, 0, 0)
+        self.vBoxLayout.setSpacing(0)
+        # objectName 作为侧边栏的 routeKey
+        self.setObjectName(routeKey)
+
+    def isLoaded(self) -> bool:
+        return self.page is not None
+
+    def load(self) -> QWidget:
+        """
+        ## 构建页面, 已经构建过则直接返回
+        """
+        if self.page is None:
+            with tracer.phase(f"page {self.objectName()}"):
+                self.page = self.factory()
+            self.vBoxLayout.addWidget(self.page)
+            self.page.show()
+            logger.debug(f"页面 {self.objectName()} 构建完成")
+            self.pageLoaded.emit(self.page)
+        return self.page
+
+    def showEvent(self, event) -> None:
+        """
+        ## 第一次被导航到时构建页面
+        """
+        self.load()
+        super().showEvent(event)
@@ -4,9 +4,9 @@
 构建主窗体
 """
 from abc import ABC
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
 
-from PySide6.QtCore import QSize, Qt, Slot
+from PySide6.QtCore import QSize, Qt, QTimer, Slot
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import QApplication, QWidget, QSystemTrayIcon
 from creart import it, add_creator, exists_module
@@ -18,31 +18,38 @@ from qfluentwidgets.components import NavigationItemPosition
 from qfluentwidgets.window import MSFluentWindow, SplashScreen
 
 from src.Core.Config import cfg
-from src.Ui.AddPage import AddWidget
-from src.Ui.BotListPage import BotListWidget
-from src.Ui.FixPage import FixWidget
+from src.Core.StartupTracer import tracer
 from src.Ui.HomePage import HomeWidget
 from src.Ui.Icon import NapCatDesktopIcon
+from src.Ui.MainWindow.LazyPage import LazyPage
 from src.Ui.MainWindow.SystemTryIcon import SystemTrayIcon
 from src.Ui.MainWindow.TitleBar import CustomTitleBar
-from src.Ui.SetupPage import SetupWidget
-from src.Ui.UpdatePage import UpdateWidget
+
+if TYPE_CHECKING:
+    # 除主页外的页面模块在页面构建时才导入
+    from src.Ui.AddPage import AddWidget
+    from src.Ui.BotListPage import BotListWidget
+    from src.Ui.FixPage import FixWidget
+    from src.Ui.SetupPage import SetupWidget
+    from src.Ui.UpdatePage import UpdateWidget
 
 
 class MainWindow(MSFluentWindow):
     """
     ## 程序的主窗体
     """
+    # 首屏显示后, 空闲时依次构建其余页面的间隔 (毫秒)
+    PRELOAD_INTERVAL = 50
 
     def __init__(self) -> None:
         super().__init__()
 
-        self.fix_widget: Optional[FixWidget] = None
-        self.update_widget: Optional[UpdateWidget] = None
+        self.fix_widget: Optional["FixWidget"] = None
+        self.update_widget: Optional["UpdateWidget"] = None
         self.splashScreen: Optional[SplashScreen] = None
-        self.setup_widget: Optional[SetupWidget] = None
-        self.add_widget: Optional[AddWidget] = None
-        self.bot_list_widget: Optional[BotListWidget] = None
+        self.setup_widget: Optional["SetupWidget"] = None
+        self.add_widget: Optional["AddWidget"] = None
+        self.bot_list_widget: Optional["BotListWidget"] = None
         self.home_widget: Optional[HomeWidget] = None
 
         self.fix_widget_button: Optional[NavigationBarPushButton] = None
@@ -53,18 +60,28 @@ class MainWindow(MSFluentWindow):
         self.setup_widget_button: Optional[NavigationBarPushButton] = None
 
         self.trayIcon: Optional[SystemTrayIcon] = None
+        # 延迟构建的页面, 以页面类名为键
+        self.lazyPages: Dict[str, LazyPage] = {}
+        # 空闲构建失败的页面, 不再重试, 等用户导航时再构建
+        self._preloadFailed: List[LazyPage] = []
 
     def initialize(self) -> None:
         """
         ## 初始化程序, 并显示窗体
         """
-        self.setWindow()
-        self.setItem()
-        self.setPage()
-        self.setTrayIcon()
+        with tracer.phase("MainWindow.setWindow"):
+            self.setWindow()
+        with tracer.phase("MainWindow.setItem"):
+            self.setItem()
+        with tracer.phase("MainWindow.setTrayIcon"):
+            self.setTrayIcon()
         # 组件加载完成结束 SplashScreen
         self.splashScreen.finish()
+        # 启动追踪从这里开始等待可交互的第一次绘制
+        tracer.watchInteractive(self)
         logger.success("窗体构建完成")
+        # 首屏绘制后在空闲时构建其余页面
+        QTimer.singleShot(self.PRELOAD_INTERVAL, self._preloadPages)
 
         # 检查 EULA
         self.showEULA()
@@ -76,6 +93,8 @@ class MainWindow(MSFluentWindow):
         # 标题栏部分
         self.setTitleBar(CustomTitleBar(self))
         self.setWindowIcon(QIcon(NapCatDesktopIcon.LOGO.path(Theme.LIGHT)))
+        # 启动追踪记录首次绘制 (启动画面)
+        tracer.watchFirstPaint(self)
         # 窗体大小以及设置打开时居中
         self.setMinimumSize(930, 630)
         desktop = QApplication.screens()[0].availableGeometry()
@@ -94,13 +113,10 @@ class MainWindow(MSFluentWindow):
     def setItem(self) -> None:
         """
         设置侧边栏
+            - 只有主页立即构建, 其余页面先注册占位控件, 第一次导航或空闲时再构建
         """
-        self.setup_widget = it(SetupWidget).initialize(self)
-        self.add_widget = it(AddWidget).initialize(self)
-        self.bot_list_widget = it(BotListWidget).initialize(self)
-        self.update_widget = it(UpdateWidget).initialize(self)
-        self.fix_widget = it(FixWidget).initialize(self)
-        self.home_widget = it(HomeWidget).initialize(self)
+        with tracer.phase("page HomePage"):
+            self.home_widget = it(HomeWidget).initialize(self)
 
         # 添加子页面
         self.home_widget_button = self.addSubInterface(
@@ -111,31 +127,31 @@ class MainWindow(MSFluentWindow):
         )
 
         self.add_widget_button = self.addSubInterface(
-            interface=self.add_widget,
+            interface=self._lazyPage("AddWidget", "AddPageHost", self._createAddWidget),
             icon=FluentIcon.ADD_TO,
             text=self.tr("Add Bot"),
             position=NavigationItemPosition.TOP
         )
         self.bot_list_widget_button = self.addSubInterface(
-            interface=self.bot_list_widget,
+            interface=self._lazyPage("BotListWidget", "BotListPageHost", self._createBotListWidget),
             icon=FluentIcon.MENU,
             text=self.tr("Bot List"),
             position=NavigationItemPosition.TOP
         )
         self.update_widget_button = self.addSubInterface(
-            interface=self.update_widget,
+            interface=self._lazyPage("UpdateWidget", "UpdatePageHost", self._createUpdateWidget),
             icon=FluentIcon.UPDATE,
             text=self.tr("Update"),
             position=NavigationItemPosition.TOP
         )
         self.fix_widget_button = self.addSubInterface(
-            interface=self.fix_widget,
+            interface=self._lazyPage("FixWidget", "FixPageHost", self._createFixWidget),
             icon=FluentIcon.DEVELOPER_TOOLS,
             text=self.tr("Fix"),
             position=NavigationItemPosition.TOP
         )
         self.setup_widget_button = self.addSubInterface(
-            interface=self.setup_widget,
+            interface=self._lazyPage("SetupWidget", "SetupPageHost", self._createSetupWidget),
             icon=FluentIcon.SETTING,
             text=self.tr("Setup"),
             position=NavigationItemPosition.BOTTOM
@@ -143,11 +159,66 @@ class MainWindow(MSFluentWindow):
 
         logger.success("侧边栏构建完成")
 
-    def setPage(self) -> None:
+    def _lazyPage(self, pageName: str, routeKey: str, factory: Callable[[], QWidget]) -> LazyPage:
         """
-        ## 窗口创建完成进行一些处理
+        ## 创建页面的占位控件
         """
+        self.lazyPages[pageName] = LazyPage(routeKey, factory, self)
+        return self.lazyPages[pageName]
+
+    def _createAddWidget(self) -> "AddWidget":
+        from src.Ui.AddPage import AddWidget
+        self.add_widget = it(AddWidget).initialize(self)
+        return self.add_widget
+
+    def _createBotListWidget(self) -> "BotListWidget":
+        from src.Ui.BotListPage import BotListWidget
+        self.bot_list_widget = it(BotListWidget).initialize(self)
         self.bot_list_widget.botList.updateList()
+        return self.bot_list_widget
+
+    def _createUpdateWidget(self) -> "UpdateWidget":
+        from src.Ui.UpdatePage import UpdateWidget
+        self.update_widget = it(UpdateWidget).initialize(self)
+        return self.update_widget
+
+    def _createFixWidget(self) -> "FixWidget":
+        from src.Ui.FixPage import FixWidget
+        self.fix_widget = it(FixWidget).initialize(self)
+        return self.fix_widget
+
+    def _createSetupWidget(self) -> "SetupWidget":
+        from src.Ui.SetupPage import SetupWidget
+        self.setup_widget = it(SetupWidget).initialize(self)
+        return self.setup_widget
+
+    def ensurePage(self, pageType: type) -> QWidget:
+        """
+        ## 确保页面已经构建, 供其他页面在访问该页面内部控件前调用
+        """
+        if (page := self.lazyPages.get(pageType.__name__)) is None:
+            return it(pageType)
+        return page.load()
+
+    def _preloadPages(self) -> None:
+        """
+        ## 每次空闲只构建一个页面, 避免长时间阻塞界面
+        """
+        pending: List[LazyPage] = [
+            page for page in self.lazyPages.values() if not page.isLoaded() and page not in self._preloadFailed
+        ]
+        if not pending:
+            logger.success("全部页面构建完成")
+            # 启动过程到此结束
+            tracer.finish()
+            return
+        try:
+            pending[0].load()
+        except Exception as e:
+            # 任何异常都只跳过该页面, 继续构建其余页面, 保证 tracer.finish() 会被调用
+            logger.error(f"页面 {pending[0].objectName()} 构建失败, 引发 {type(e).__name__}: {e}")
+            self._preloadFailed.append(pending[0])
+        QTimer.singleShot(self.PRELOAD_INTERVAL, self._preloadPages)
 
     def setTrayIcon(self):
         """
@@ -161,7 +232,8 @@ class MainWindow(MSFluentWindow):
         """
         ## 检测用户是否同意EULA
         """
-        if cfg.get(cfg.EULA):
+        if cfg.get(cfg.EULA) or (tracer.enabled and tracer.exitAfter):
+            # CI 中检查启动时不弹出对话框
             return
         from src.Core.EULA import EULAMessageBox
         self.home_widget_button.setEnabled(False)
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+## 外部资源包
+    - 资源按用途拆分为多个 .qrc, 编译为二进制 .rcc 后通过 QResource.registerResource 注册
+    - .rcc 由 Qt 直接映射到内存, 不需要像 Python 资源模块那样在导入时把全部数据读入堆中
+    - CORE 在启动时注册, 主题背景和横幅图片在第一次使用时才注册
+    - 从源码运行时 .rcc 不存在或比 .qrc 旧会自动调用 pyside6-rcc 重新编译,
+      也可以手动执行 python -m src.Ui.ResourceBundle 编译全部资源包
+"""
+import shutil
+import subprocess
+import sys
+import threading
+import xml.etree.ElementTree as ElementTree
+from enum import Enum
+from pathlib import Path
+from typing import List
+
+from PySide6.QtCore import QResource
+from loguru import logger
+
+# 资源目录, .qrc 和 .rcc 都放在这里
+RESOURCE_PATH = Path(__file__).parent / "resource"
+
+
+class ResourceBundle(Enum):
+    """资源包"""
+    # logo, 图标, 样式表和翻译
+    CORE = "core"
+    # 浅色/深色主题的主页背景
+    LIGHT = "light"
+    DARK = "dark"
+    # 更新日志和分享弹窗中的图片
+    BANNER = "banner"
+
+    @classmethod
+    def forTheme(cls, dark: bool) -> "ResourceBundle":
+        return cls.DARK if dark else cls.LIGHT
+
+    @property
+    def qrcPath(self) -> Path:
+        return RESOURCE_PATH / f"{self.value}.qrc"
+
+    @property
+    def rccPath(self) -> Path:
+        return RESOURCE_PATH / f"{self.value}.rcc"
+
+    def sources(self) -> List[Path]:
+        """
+        ## .qrc 中列出的源文件
+        """
+        root = ElementTree.parse(self.qrcPath).getroot()
+        return [RESOURCE_PATH / file.text.strip() for file in root.iter("file")]
+
+    def isStale(self) -> bool:
+        """
+        ## .rcc 是否需要重新编译, 没有 .qrc (打包后的程序) 时总是使用现有的 .rcc
+        """
+        if not self.qrcPath.exists():
+            return False
+        if not self.rccPath.exists():
+            return True
+        built = self.rccPath.stat().st_mtime_ns
+        return any(path.stat().st_mtime_ns > built for path in [self.qrcPath, *self.sources()])
+
+    def build(self) -> None:
+        """
+        ## 使用 pyside6-rcc 编译为二进制 .rcc
+        """
+        if (rcc := shutil.which("pyside6-rcc")) is None:
+            raise FileNotFoundError("找不到 pyside6-rcc, 无法编译资源包")
+        tmp = self.rccPath.with_name(f"{self.rccPath.name}.tmp")
+        subprocess.run([rcc, "--binary", "-o", str(tmp), str(self.qrcPath)], check=True, cwd=RESOURCE_PATH)
+        tmp.replace(self.rccPath)
+        logger.info(f"资源包 {self.rccPath.name} 编译完成")
+
+    def register(self) -> bool:
+        """
+        ## 注册资源包, 已注册时直接返回, 返回是否可用
+        """
+        with _lock:
+            if self in _registered:
+                return True
+            try:
+                if self.isStale():
+                    self.build()
+            except (OSError, subprocess.CalledProcessError) as e:
+                logger.error(f"编译资源包 {self.value} 失败: {e}")
+
+            if not QResource.registerResource(str(self.rccPath)):
+                logger.error(f"注册资源包 {self.rccPath} 失败")
+                return False
+            _registered.add(self)
+            logger.debug(f"资源包 {self.value} 注册完成")
+            return True
+
+
+# 已注册的资源包
+_registered = set()
+_lock = threading.Lock()
+
+
+if __name__ == "__main__":
+    # 编译全部资源包
+    for bundle in ResourceBundle:
+        bundle.build()
+    sys.exit(0)
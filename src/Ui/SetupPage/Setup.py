@@ -5,19 +5,29 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Self, Optional
 
 from PySide6.QtWidgets import QWidget, QStackedWidget, QVBoxLayout
-from creart import add_creator, exists_module, it
+from creart import add_creator, exists_module
 from creart.creator import AbstractCreator, CreateTargetInfo
 
 from src.Core import timer
 from src.Ui.SetupPage.SetupScrollArea import SetupScrollArea
 from src.Ui.SetupPage.SetupTopCard import SetupTopCard
+from src.Ui.SetupPage.StallReportView import StallReportView
 from src.Ui.StyleSheet import StyleSheet
 from src.Ui.common import CodeEditor
-from src.Ui.common.CodeEditor import NCDLogHighlighter
+from src.Ui.common.CodeEditor import LOG_MAX_BLOCKS
+from src.Ui.common.LogHighlighter import NCDLogHighlighter
 
 if TYPE_CHECKING:
     from src.Ui.MainWindow import MainWindow
 
+# 匹配 ANSI 转义码
+ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+# 需要从日志中移除的 QFluentWidgets 提示 (单独的一行, 前后各有一个空行)
+QFLUENTWIDGETS_TIPS = (
+    "📢 Tips: QFluentWidgets Pro is now released. Click "
+    "https://qfluentwidgets.com/pages/pro to learn more about it."
+)
+
 
 class SetupWidget(QWidget):
     """
@@ -27,11 +37,14 @@ class SetupWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.log_file_path = Path.cwd() / "log/ALL.log"
+        # 已经读取到的日志文件位置
+        self.logOffset = 0
         self.view: Optional[QStackedWidget] = None
         self.topCard: Optional[SetupTopCard] = None
         self.setupScrollArea: Optional[SetupScrollArea] = None
         self.vBoxLayout: Optional[QVBoxLayout] = None
         self.logWidget: Optional[CodeEditor] = None
+        self.stallReportView: Optional[StallReportView] = None
 
     def initialize(self, parent: "MainWindow") -> Self:
         """
@@ -68,9 +81,12 @@ class SetupWidget(QWidget):
         self.setupScrollArea = SetupScrollArea(self)
         self.logWidget = CodeEditor(self)
         self.logWidget.setObjectName("NCD-LogWidget")
-        self.highlighter = NCDLogHighlighter(self.logWidget.document())
+        self.logWidget.setMaximumBlockCount(LOG_MAX_BLOCKS)
+        self.highlighter = NCDLogHighlighter(self.logWidget)
+        self.stallReportView = StallReportView(self)
         self.view.addWidget(self.setupScrollArea)
         self.view.addWidget(self.logWidget)
+        self.view.addWidget(self.stallReportView)
 
         self.topCard.pivot.addItem(
             routeKey=self.setupScrollArea.objectName(),
@@ -82,6 +98,11 @@ class SetupWidget(QWidget):
             text=self.tr("Log"),
             onClick=lambda: self.view.setCurrentWidget(self.logWidget)
         )
+        self.topCard.pivot.addItem(
+            routeKey=self.stallReportView.objectName(),
+            text=self.tr("Stalls"),
+            onClick=lambda: self.view.setCurrentWidget(self.stallReportView)
+        )
 
         # 连接信号并初始化当前标签页
         self.view.currentChanged.connect(self.onCurrentIndexChanged)
@@ -97,21 +118,48 @@ class SetupWidget(QWidget):
 
     @timer(1000)
     def updateLogContent(self):
+        """
+        ## 读取日志文件新增的内容并追加到日志页面
+            - 只读取上次位置之后的完整行, 文件变小 (重新创建) 时从头读取
+        """
         if not self.log_file_path.exists():
             return
 
-        with open(self.log_file_path, "r", encoding="utf-8") as file:
-            # 匹配并移除 ANSI 转义码
-            ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-            content = ansi_escape.sub('', file.read())
-            # 替换特定字符串
-            content = content.replace(
-                "\n📢 Tips: QFluentWidgets Pro is now released. Click "
-                "https://qfluentwidgets.com/pages/pro to learn more about it.\n\n",
-                ""
-            )
-            # 输出内容
-            it(SetupWidget).logWidget.setPlainText(content)
+        with open(self.log_file_path, "rb") as file:
+            size = file.seek(0, 2)
+            if size < self.logOffset:
+                self.logOffset = 0
+                self.logWidget.clear()
+            if size == self.logOffset:
+                return
+            file.seek(self.logOffset)
+            data = file.read(size - self.logOffset)
+
+        # 不完整的最后一行留到下次读取
+        if not (end := data.rfind(b"\n") + 1):
+            return
+        self.logOffset += end
+
+        # 移除 ANSI 转义码和特定字符串后输出
+        content = ANSI_ESCAPE.sub('', data[:end].decode("utf-8", errors="replace"))
+        self.logWidget.appendText(self._removeTips(content))
+
+    @staticmethod
+    def _removeTips(content: str) -> str:
+        """
+        ## 按行移除 QFluentWidgets 的提示和紧邻的空行
+            - content 只包含完整的行, 提示行不会被拆分到两次读取中
+        """
+        if QFLUENTWIDGETS_TIPS not in content:
+            return content
+        lines = content.splitlines(keepends=True)
+        removed = set()
+        for index, line in enumerate(lines):
+            if line.strip() != QFLUENTWIDGETS_TIPS:
+                continue
+            removed.add(index)
+            removed.update(i for i in (index - 1, index + 1) if 0 <= i < len(lines) and not lines[i].strip())
+        return "".join(line for index, line in enumerate(lines) if index not in removed)
 
 
 class SetupWidgetClassCreator(AbstractCreator, ABC):
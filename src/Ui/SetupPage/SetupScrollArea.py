@@ -2,7 +2,7 @@
 from typing import TYPE_CHECKING
 
 from PySide6.QtCore import Qt, QStandardPaths
-from PySide6.QtWidgets import QWidget, QFileDialog
+from PySide6.QtWidgets import QWidget, QFileDialog, QInputDialog
 from creart import it
 from qfluentwidgets import ScrollArea
 from qfluentwidgets.common import FluentIcon, setTheme, setThemeColor
@@ -14,6 +14,8 @@ from qfluentwidgets.components import (
     CustomColorSettingCard,
     ComboBoxSettingCard,
     PushSettingCard,
+    RangeSettingCard,
+    SwitchSettingCard,
 )
 
 from src.Core.Config import cfg
@@ -97,6 +99,53 @@ class SetupScrollArea(ScrollArea):
             parent=self.personalGroup,
         )
 
+        # 创建组 - 网络
+        self.networkGroup = SettingCardGroup(title=self.tr("Network"), parent=self.view)
+        self.rateLimitModeCard = ComboBoxSettingCard(
+            configItem=cfg.DownloadRateLimitMode,
+            icon=FluentIcon.SPEED_HIGH,
+            title=self.tr("Download rate limit"),
+            content=self.tr("Auto lowers the limit when running bots' connections slow down"),
+            texts=[self.tr("Off"), self.tr("Manual"), self.tr("Auto")],
+            parent=self.networkGroup,
+        )
+        self.globalRateLimitCard = RangeSettingCard(
+            configItem=cfg.GlobalDownloadRateLimit,
+            icon=FluentIcon.DOWNLOAD,
+            title=self.tr("Total download limit (KB/s)"),
+            content=self.tr("Upper limit shared by all downloads"),
+            parent=self.networkGroup,
+        )
+        self.perDownloadRateLimitCard = RangeSettingCard(
+            configItem=cfg.PerDownloadRateLimit,
+            icon=FluentIcon.CLOUD_DOWNLOAD,
+            title=self.tr("Per download limit (KB/s)"),
+            content=self.tr("Upper limit of a single download"),
+            parent=self.networkGroup,
+        )
+
+        self.artifactMirrorCard = PushSettingCard(
+            icon=FluentIcon.CLOUD,
+            title=self.tr("Artifact mirror"),
+            content=cfg.get(cfg.ArtifactMirror) or self.tr("Download from the official source"),
+            text=self.tr("Set mirror"),
+            parent=self.networkGroup,
+        )
+        self.serveArtifactsCard = SwitchSettingCard(
+            icon=FluentIcon.SHARE,
+            title=self.tr("Share downloads on LAN"),
+            content=self.tr("Let other NapCat Desktop instances use this one as their mirror"),
+            configItem=cfg.ServeArtifacts,
+            parent=self.networkGroup,
+        )
+        self.artifactServerPortCard = RangeSettingCard(
+            configItem=cfg.ArtifactServerPort,
+            icon=FluentIcon.IOT,
+            title=self.tr("Share port"),
+            content=self.tr("Port used to share downloads on LAN"),
+            parent=self.networkGroup,
+        )
+
         # 创建组 - 路径
         self.pathGroup = SettingCardGroup(title=self.tr("Path"), parent=self.view)
         self.QQPathCard = PushSettingCard(
@@ -133,6 +182,13 @@ class SetupScrollArea(ScrollArea):
         self.personalGroup.addSettingCard(self.themeColorCard)
         self.personalGroup.addSettingCard(self.languageCard)
 
+        self.networkGroup.addSettingCard(self.rateLimitModeCard)
+        self.networkGroup.addSettingCard(self.globalRateLimitCard)
+        self.networkGroup.addSettingCard(self.perDownloadRateLimitCard)
+        self.networkGroup.addSettingCard(self.artifactMirrorCard)
+        self.networkGroup.addSettingCard(self.serveArtifactsCard)
+        self.networkGroup.addSettingCard(self.artifactServerPortCard)
+
         self.pathGroup.addSettingCard(self.QQPathCard)
         self.pathGroup.addSettingCard(self.NapCatPathCard)
         self.pathGroup.addSettingCard(self.StartScriptPath)
@@ -140,6 +196,7 @@ class SetupScrollArea(ScrollArea):
         # 添加到布局
         self.expand_layout.addWidget(self.startGroup)
         self.expand_layout.addWidget(self.personalGroup)
+        self.expand_layout.addWidget(self.networkGroup)
         self.expand_layout.addWidget(self.pathGroup)
         self.expand_layout.setContentsMargins(0, 0, 0, 0)
         self.view.setLayout(self.expand_layout)
@@ -160,6 +217,9 @@ class SetupScrollArea(ScrollArea):
         self.themeCard.optionChanged.connect(self._themeModeChanged)
         self.themeColorCard.colorChanged.connect(lambda color: setThemeColor(color, save=True, lazy=True))
 
+        # 连接网络相关
+        self.artifactMirrorCard.clicked.connect(self._onArtifactMirrorCardClicked)
+
         # 连接路径相关
         self.QQPathCard.clicked.connect(self._onQQFolderCardClicked)
         self.NapCatPathCard.clicked.connect(self._onNapCatFolderCardClicked)
@@ -192,6 +252,20 @@ class SetupScrollArea(ScrollArea):
             cfg.set(cfg.StartScriptPath, folder, save=True)
             self.StartScriptPath.setContent(folder)
 
+    def _onArtifactMirrorCardClicked(self) -> None:
+        """
+        设置局域网镜像地址的槽函数, 留空则使用官方地址
+        """
+        url, ok = QInputDialog.getText(
+            self,
+            self.tr("Artifact mirror"),
+            self.tr("Mirror address, e.g. http://192.168.1.10:8086 (leave empty to disable)"),
+            text=cfg.get(cfg.ArtifactMirror),
+        )
+        if ok:
+            cfg.set(cfg.ArtifactMirror, url.strip(), save=True)
+            self.artifactMirrorCard.setContent(url.strip() or self.tr("Download from the official source"))
+
     def _selectFolder(self) -> str:
         """
         选择文件夹的槽函数
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from pathlib import Path
+
+from PySide6.QtCore import Qt, Slot
+from PySide6.QtWidgets import QFileDialog, QHBoxLayout, QVBoxLayout, QWidget
+from creart import it
+from qfluentwidgets import FluentIcon, PushButton
+
+from src.Core.StallWatchdog import StallWatchdog
+from src.Ui.common import CodeEditor
+
+
+class StallReportView(QWidget):
+    """
+    ## 设置页面中的卡顿报告
+        - 按总卡顿时间排序显示界面线程的卡顿和对应的调用栈
+        - 只在可见时刷新, 可以导出为文本或 JSON
+    """
+
+    def __init__(self, parent) -> None:
+        super().__init__(parent=parent)
+        self.setObjectName("NCD-StallReportView")
+
+        # 创建控件
+        self.reportWidget = CodeEditor(self)
+        self.exportButton = PushButton(FluentIcon.SAVE_AS, self.tr("Export"), self)
+        self.clearButton = PushButton(FluentIcon.DELETE, self.tr("Clear"), self)
+        self.buttonLayout = QHBoxLayout()
+        self.vBoxLayout = QVBoxLayout()
+
+        # 设置控件
+        self.reportWidget.setReadOnly(True)
+        self.exportButton.clicked.connect(self._exportButtonSlot)
+        self.clearButton.clicked.connect(it(StallWatchdog).clear)
+        it(StallWatchdog).stallDetected.connect(self.updateReport)
+        it(StallWatchdog).reportCleared.connect(self.updateReport)
+
+        # 调用方法
+        self._setLayout()
+
+    def updateReport(self, *_) -> None:
+        """
+        ## 刷新报告, 不可见时跳过, 显示时再刷新
+        """
+        if self.isVisible():
+            self.reportWidget.setPlainText(it(StallWatchdog).formatReport())
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self.updateReport()
+
+    @Slot()
+    def _exportButtonSlot(self) -> None:
+        """
+        ## 导出报告
+        """
+        from src.Ui.SetupPage.Setup import SetupWidget
+        from src.Ui.MainWindow.Window import MainWindow
+
+        path, _ = QFileDialog.getSaveFileName(
+            self, self.tr("Export stall report"), "stall_report.txt", self.tr("Stall report (*.txt *.json)")
+        )
+        if not path:
+            return
+
+        try:
+            it(StallWatchdog).exportReport(Path(path))
+        except OSError as e:
+            it(MainWindow).showError(
+                title=self.tr("Export failed"), content=str(e), showcasePage=it(SetupWidget)
+            )
+            return
+        it(MainWindow).showSuccess(
+            title=self.tr("Export completed"), content=path, showcasePage=it(SetupWidget)
+        )
+
+    def _setLayout(self) -> None:
+        """
+        ## 对内部进行布局
+        """
+        self.buttonLayout.setSpacing(8)
+        self.buttonLayout.setContentsMargins(0, 0, 0, 0)
+        self.buttonLayout.addWidget(self.exportButton)
+        self.buttonLayout.addWidget(self.clearButton)
+        self.buttonLayout.setAlignment(Qt.AlignmentFlag.AlignRight)
+
+        self.vBoxLayout.setSpacing(8)
+        self.vBoxLayout.setContentsMargins(0, 0, 0, 0)
+        self.vBoxLayout.addLayout(self.buttonLayout)
+        self.vBoxLayout.addWidget(self.reportWidget)
+        self.setLayout(self.vBoxLayout)
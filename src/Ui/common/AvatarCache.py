@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+## 共享的 QQ 头像缓存
+    - 首页和机器人列表共用同一份头像, 每个 QQID 只请求一次
+    - 只有被绘制到的条目才会请求头像, 列表再长也只请求可见部分
+    - 头像缩小到 AVATAR_SIZE 后缓存, 不保留 640px 的原图
+"""
+from abc import ABC
+from typing import Dict, Set
+
+from PySide6.QtCore import QObject, QRect, QRectF, QUrl, QUrlQuery, Qt, Signal
+from PySide6.QtGui import QPainter, QPainterPath, QPixmap
+from PySide6.QtNetwork import QNetworkReply
+from creart import AbstractCreator, CreateTargetInfo, add_creator, exists_module, it
+from loguru import logger
+
+from src.Core.NetworkFunc import RequestPriority, RequestScheduler, Urls
+
+# 缓存的头像边长 (像素)
+AVATAR_SIZE = 128
+
+
+def drawAvatar(painter: QPainter, rect: QRect, pixmap: QPixmap, radius: float = 5) -> None:
+    """
+    ## 在 rect 中绘制圆角头像, 供列表的 delegate 使用
+    """
+    painter.save()
+    painter.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform)
+    path = QPainterPath()
+    path.addRoundedRect(QRectF(rect), radius, radius)
+    painter.setClipPath(path)
+    painter.drawPixmap(rect, pixmap)
+    painter.restore()
+
+
+class AvatarCache(QObject):
+    """
+    ## 头像缓存, 未加载完成时返回 logo 作为占位
+    """
+    # 头像加载完成, 参数为 QQID
+    avatarLoaded = Signal(str)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.placeholder = QPixmap(":Global/logo.png")
+        self._avatars: Dict[str, QPixmap] = {}
+        self._pending: Set[str] = set()
+        self._failed: Set[str] = set()
+
+    def avatar(self, qqid: str) -> QPixmap:
+        """
+        ## 获取头像, 没有缓存时发起请求并先返回占位图
+        """
+        if (pixmap := self._avatars.get(qqid)) is not None:
+            return pixmap
+        self.request(qqid)
+        return self.placeholder
+
+    def request(self, qqid: str) -> None:
+        """
+        ## 请求头像, 正在请求或已经失败的不会重复请求
+        """
+        if qqid in self._avatars or qqid in self._pending or qqid in self._failed:
+            return
+        self._pending.add(qqid)
+
+        # 处理 QQ头像 的 Url
+        avatar_url = QUrl(Urls.QQ_AVATAR.value)
+        query = QUrlQuery()
+        query.addQueryItem("spec", "640")
+        query.addQueryItem("dst_uin", qqid)
+        avatar_url.setQuery(query)
+
+        # 通过调度器以批量优先级发起请求
+        it(RequestScheduler).submit(
+            avatar_url, lambda reply: self._setAvatar(qqid, reply), self, RequestPriority.BULK
+        )
+
+    def _setAvatar(self, qqid: str, reply: QNetworkReply) -> None:
+        """
+        ## 缓存头像
+        """
+        self._pending.discard(qqid)
+        avatar = QPixmap()
+        if reply.error() != QNetworkReply.NetworkError.NoError or not avatar.loadFromData(reply.readAll()):
+            # 失败时保持占位图, 大量机器人同时失败时不逐个弹出提示
+            self._failed.add(qqid)
+            logger.warning(f"获取 {qqid} 的 QQ 头像失败: {reply.errorString()}")
+            return
+
+        self._avatars[qqid] = avatar.scaled(
+            AVATAR_SIZE, AVATAR_SIZE,
+            Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+        )
+        self.avatarLoaded.emit(qqid)
+
+    def retryFailed(self) -> None:
+        """
+        ## 清除失败记录, 之后再次绘制时重新请求
+        """
+        self._failed.clear()
+
+
+class AvatarCacheClassCreator(AbstractCreator, ABC):
+    # 定义类方法targets，该方法返回一个元组，元组中包含了一个CreateTargetInfo对象，
+    # 该对象描述了创建目标的相关信息，包括应用程序名称和类名。
+    targets = (CreateTargetInfo("src.Ui.common.AvatarCache", "AvatarCache"),)
+
+    # 静态方法available()，用于检查模块"AvatarCache"是否存在，返回值为布尔型。
+    @staticmethod
+    def available() -> bool:
+        return exists_module("src.Ui.common.AvatarCache")
+
+    # 静态方法create()，用于创建AvatarCache类的实例，返回值为AvatarCache对象。
+    @staticmethod
+    def create(create_type: [AvatarCache]) -> AvatarCache:
+        return AvatarCache()
+
+
+add_creator(AvatarCacheClassCreator)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+## 机器人列表模型
+    - 首页和机器人列表页面共用的 QAbstractListModel, 每行对应一个机器人
+    - 行数据来自 BotConfigStore, 增删改通过其信号转换为对单行的插入/删除/dataChanged
+    - 运行状态 (来自 BotStateRegistry) 和头像变化也只更新对应的一行, 视图只重绘可见部分
+"""
+from abc import ABC
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Slot
+from creart import AbstractCreator, CreateTargetInfo, add_creator, exists_module, it
+
+from src.Core.BotStateRegistry import BotState, BotStateRegistry
+from src.Core.Config.BotConfigStore import BotConfigStore
+from src.Core.Config.ConfigModel import Config
+from src.Ui.common.AvatarCache import AvatarCache
+
+
+class BotListModel(QAbstractListModel):
+    """
+    ## 机器人列表模型
+        - DisplayRole: 机器人名称
+        - ToolTipRole: 名称和 QQID
+        - DecorationRole: 头像 (未加载时为占位图, 第一次读取时发起请求)
+    """
+    # 机器人配置
+    ConfigRole = Qt.ItemDataRole.UserRole + 1
+    # QQID
+    QQIDRole = Qt.ItemDataRole.UserRole + 2
+    # 是否正在运行
+    RunningRole = Qt.ItemDataRole.UserRole + 3
+    # 运行状态 (BotState)
+    StateRole = Qt.ItemDataRole.UserRole + 4
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._configs: List[Config] = it(BotConfigStore).configs()
+        self._rows: Dict[str, int] = {}
+        self._updateRows()
+
+        it(BotConfigStore).botAdded.connect(self._botAddedSlot)
+        it(BotConfigStore).botUpdated.connect(self._botUpdatedSlot)
+        it(BotConfigStore).botRemoved.connect(self._botRemovedSlot)
+        it(AvatarCache).avatarLoaded.connect(self._avatarLoadedSlot)
+        it(BotStateRegistry).stateChanged.connect(self._stateChangedSlot)
+
+    def _updateRows(self) -> None:
+        self._rows = {config.bot.QQID: row for row, config in enumerate(self._configs)}
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._configs)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or not 0 <= index.row() < len(self._configs):
+            return None
+        config = self._configs[index.row()]
+        match role:
+            case Qt.ItemDataRole.DisplayRole:
+                return config.bot.name
+            case Qt.ItemDataRole.ToolTipRole:
+                return f"{config.bot.name} ({config.bot.QQID})"
+            case Qt.ItemDataRole.DecorationRole:
+                return it(AvatarCache).avatar(config.bot.QQID)
+            case self.ConfigRole:
+                return config
+            case self.QQIDRole:
+                return config.bot.QQID
+            case self.RunningRole:
+                return it(BotStateRegistry).isRunning(config.bot.QQID)
+            case self.StateRole:
+                return it(BotStateRegistry).state(config.bot.QQID)
+        return None
+
+    def indexOf(self, qqid: str) -> QModelIndex:
+        """
+        ## 根据 QQID 获取行索引, 不存在时返回无效索引
+        """
+        if (row := self._rows.get(qqid)) is None:
+            return QModelIndex()
+        return self.index(row, 0)
+
+    def configAt(self, index: QModelIndex) -> Optional[Config]:
+        return self.data(index, self.ConfigRole)
+
+    @Slot(object)
+    def _botAddedSlot(self, config: Config) -> None:
+        if config.bot.QQID in self._rows:
+            self._botUpdatedSlot(config)
+            return
+        row = len(self._configs)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._configs.append(config)
+        self._rows[config.bot.QQID] = row
+        self.endInsertRows()
+
+    @Slot(object)
+    def _botUpdatedSlot(self, config: Config) -> None:
+        if (row := self._rows.get(config.bot.QQID)) is None:
+            return
+        self._configs[row] = config
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index)
+
+    @Slot(str)
+    def _botRemovedSlot(self, qqid: str) -> None:
+        if (row := self._rows.get(qqid)) is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._configs[row]
+        self._updateRows()
+        self.endRemoveRows()
+
+    @Slot(str)
+    def _avatarLoadedSlot(self, qqid: str) -> None:
+        if (index := self.indexOf(qqid)).isValid():
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+    @Slot(str, object)
+    def _stateChangedSlot(self, qqid: str, state: BotState) -> None:
+        if (index := self.indexOf(qqid)).isValid():
+            self.dataChanged.emit(index, index, [self.RunningRole, self.StateRole])
+
+
+class BotListModelClassCreator(AbstractCreator, ABC):
+    # 定义类方法targets，该方法返回一个元组，元组中包含了一个CreateTargetInfo对象，
+    # 该对象描述了创建目标的相关信息，包括应用程序名称和类名。
+    targets = (CreateTargetInfo("src.Ui.common.BotListModel", "BotListModel"),)
+
+    # 静态方法available()，用于检查模块"BotListModel"是否存在，返回值为布尔型。
+    @staticmethod
+    def available() -> bool:
+        return exists_module("src.Ui.common.BotListModel")
+
+    # 静态方法create()，用于创建BotListModel类的实例，返回值为BotListModel对象。
+    @staticmethod
+    def create(create_type: [BotListModel]) -> BotListModel:
+        return BotListModel()
+
+
+add_creator(BotListModelClassCreator)
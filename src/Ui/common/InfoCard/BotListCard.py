@@ -1,21 +1,14 @@
 # -*- coding: utf-8 -*-
-from typing import Optional, List
-
-from PySide6.QtCore import Qt, QTimer, QUrl, QUrlQuery, Slot
-from PySide6.QtGui import QPixmap
-from PySide6.QtNetwork import QNetworkRequest, QNetworkReply
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QFrame
+from PySide6.QtCore import QEvent, QModelIndex, QRect, QRectF, QSize, Qt, Signal, Slot
+from PySide6.QtGui import QColor, QPainter
+from PySide6.QtWidgets import QListView, QStyle, QStyledItemDelegate, QStyleOptionViewItem, QVBoxLayout
 from creart import it
-from qfluentwidgets import (
-    HeaderCardWidget, FluentIcon, TransparentToolButton, ImageLabel, TransparentPushButton, BodyLabel, ScrollArea
-)
-from qfluentwidgets.common.animation import BackgroundAnimationWidget
+from qfluentwidgets import HeaderCardWidget, FluentIcon, TransparentToolButton, BodyLabel, ListView, getFont, isDarkTheme
 
-from src.Core import timer
-from src.Core.Config.ConfigModel import Config
-from src.Core.NetworkFunc import Urls, NetworkFunc
-from src.Ui.BotListPage import BotListWidget
+from src.Core.Config.BotConfigStore import BotConfigStore
 from src.Ui.StyleSheet import StyleSheet
+from src.Ui.common.AvatarCache import drawAvatar
+from src.Ui.common.BotListModel import BotListModel
 
 
 class BotListCard(HeaderCardWidget):
@@ -39,9 +32,13 @@ class BotListCard(HeaderCardWidget):
         self.botList.hide()
         self.toAddBot.clicked.connect(self._toAddBotSlot)
 
+        # 配置变化时更新显示
+        it(BotConfigStore).botAdded.connect(self.updateVisibility)
+        it(BotConfigStore).botRemoved.connect(self.updateVisibility)
+
         # 调用方法
         self._setLayout()
-        self.monitorBots()
+        self.updateVisibility()
 
     @staticmethod
     @Slot()
@@ -52,22 +49,19 @@ class BotListCard(HeaderCardWidget):
         from src.Ui.MainWindow.Window import MainWindow
         it(MainWindow).add_widget_button.click()
 
-    @timer(2000)
-    def monitorBots(self) -> None:
+    def updateVisibility(self, *_) -> None:
         """
-        ## 监控机器人列表
+        ## 根据是否有机器人切换列表和提示
         """
-        if not it(BotListWidget).botList.botCardList:
+        if it(BotConfigStore).isEmpty():
             # 如果为空则代表没有机器人, 显示提示
             self.botList.hide()
             self.noBotLabel.show()
             self.toAddBot.show()
         else:
-            # 不为空则刷新一次列表检查是否有变化
             self.botList.show()
             self.noBotLabel.hide()
             self.toAddBot.hide()
-            self.botList.updateList()
 
     def _setLayout(self) -> None:
         """
@@ -83,11 +77,90 @@ class BotListCard(HeaderCardWidget):
         self.viewLayout.setContentsMargins(0, 0, 0, 0)
 
 
-class BotList(ScrollArea):
+class BotRowDelegate(QStyledItemDelegate):
+    """
+    ## 以行的形式绘制首页的机器人, 右侧为启动/停止按钮
+    """
+    # 点击启动/停止按钮, 参数为 QQID
+    runClicked = Signal(str)
+    stopClicked = Signal(str)
+
+    ROW_HEIGHT = 44
+    AVATAR_SIZE = 28
+    BUTTON_SIZE = QSize(80, 32)
+    MARGIN = 15
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def buttonRect(self, rect: QRect) -> QRect:
+        return QRect(
+            rect.right() - self.MARGIN - self.BUTTON_SIZE.width(),
+            rect.top() + (rect.height() - self.BUTTON_SIZE.height()) // 2,
+            self.BUTTON_SIZE.width(), self.BUTTON_SIZE.height()
+        )
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = option.rect
+        color = Qt.GlobalColor.white if isDarkTheme() else Qt.GlobalColor.black
+
+        # 头像
+        avatarRect = QRect(
+            rect.left() + self.MARGIN, rect.top() + (rect.height() - self.AVATAR_SIZE) // 2,
+            self.AVATAR_SIZE, self.AVATAR_SIZE
+        )
+        drawAvatar(painter, avatarRect, index.data(Qt.ItemDataRole.DecorationRole))
+
+        # 启动/停止按钮, 鼠标所在的行绘制按钮背景
+        buttonRect = self.buttonRect(rect)
+        if option.state & QStyle.StateFlag.State_MouseOver:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(255, 255, 255, 15) if isDarkTheme() else QColor(0, 0, 0, 9))
+            painter.drawRoundedRect(QRectF(buttonRect), 5, 5)
+        running = index.data(BotListModel.RunningRole)
+        text = self.tr("Stop") if running else self.tr("Start")
+        painter.setFont(getFont(14))
+        textWidth = painter.fontMetrics().horizontalAdvance(text)
+        iconLeft = buttonRect.left() + (buttonRect.width() - 16 - 8 - textWidth) // 2
+        FluentIcon.POWER_BUTTON.render(painter, QRectF(iconLeft, buttonRect.center().y() - 7, 16, 16))
+        painter.setPen(color)
+        painter.drawText(
+            QRect(iconLeft + 24, buttonRect.top(), textWidth + 1, buttonRect.height()),
+            Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, text
+        )
+
+        # 名称和 QQID
+        nameRect = QRect(
+            avatarRect.right() + 12, rect.top(), buttonRect.left() - avatarRect.right() - 24, rect.height()
+        )
+        name = painter.fontMetrics().elidedText(
+            f"{index.data()}({index.data(BotListModel.QQIDRole)})", Qt.TextElideMode.ElideRight, nameRect.width()
+        )
+        painter.drawText(nameRect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, name)
+        painter.restore()
+
+    def editorEvent(self, event, model, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+        """
+        ## 处理按钮点击
+        """
+        if (
+                event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and self.buttonRect(option.rect).contains(event.position().toPoint())
+        ):
+            qqid = index.data(BotListModel.QQIDRole)
+            (self.stopClicked if index.data(BotListModel.RunningRole) else self.runClicked).emit(qqid)
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+class BotList(ListView):
     """
-    ## BotListWidget 内部的机器人列表
+    ## 首页展示的机器人列表
 
-    自动读取配置文件中已有的的机器人配置
+    与机器人列表页面共用 BotListModel, 运行状态变化时只重绘对应的一行
     """
 
     def __init__(self, parent) -> None:
@@ -95,196 +168,42 @@ class BotList(ScrollArea):
         ## 初始化
         """
         super().__init__(parent=parent)
-        # 创建属性
-        self.botCardList: List[BotCard] = []
-
-        # 调用方法
-        self._createView()
-        self._initWidget()
-
-        StyleSheet.BOT_LIST_WIDGET.apply(self)
-
-    def _createView(self) -> None:
-        """
-        ## 构建并设置 ScrollArea 所需的 widget
-        """
-        self.view = QWidget(self)
-        self.cardLayout = QVBoxLayout(self.view)
-        self.cardLayout.setContentsMargins(15, 8, 15, 10)
-        self.cardLayout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.cardLayout.setSpacing(6)
-        self.view.setObjectName("BotListView")
-        self.view.setLayout(self.cardLayout)
-
-    def _initWidget(self) -> None:
-        """
-        ## 设置 ScrollArea
-        """
-        self.setWidget(self.view)
-        self.setWidgetResizable(True)
-        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.delegate = BotRowDelegate(self)
 
-    def updateList(self) -> None:
-        """
-        ## 刷新机器人列表
-        """
-        if not self.botCardList:
-            # 如果是首次运行,直接添加到 botCardList
-            for bot_config in it(BotListWidget).botList.botList:
-                card = BotCard(bot_config, self)
-                self.cardLayout.addWidget(card, 0, Qt.AlignmentFlag.AlignTop)
-                self.botCardList.append(card)
-
-        QQList = [card.config.bot.QQID for card in self.botCardList]
-        for bot_config in it(BotListWidget).botList.botList:
-            # 遍历并判断是否有新增的 bot
-            if bot_config.bot.QQID in QQList:
-                # 如果属于则直接跳过
-                continue
-
-            # 不属于则就属于新增, 创建 card 并 添加到布局
-            card = BotCard(bot_config)
-            self.cardLayout.addWidget(card, 0, Qt.AlignmentFlag.AlignTop)
-            self.botCardList.append(card)
-
-        for card in self.botCardList:
-            # 遍历并判断是否有减少的 bot
-            if card.config in it(BotListWidget).botList.botList:
-                # 属于则就是没有被删除, 跳过
-                continue
-
-            # 移除出布局并删除
-            self.botCardList.remove(card)
-            self.cardLayout.removeWidget(card)
-            card.deleteLater()
-
-        # 刷新一次布局
-        self.cardLayout.update()
+        # 设置视图
+        self.setObjectName("BotListView")
+        self.setModel(it(BotListModel))
+        self.setItemDelegate(self.delegate)
+        self.setUniformItemSizes(True)
+        self.setSpacing(3)
+        self.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.setMouseTracking(True)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
 
+        self.delegate.runClicked.connect(self._runSlot)
+        self.delegate.stopClicked.connect(self._stopSlot)
 
-class BotCard(BackgroundAnimationWidget, QFrame):
-    """
-    ## BotListCard 中展示的 BotCard
-    """
-
-    def __init__(self, config: Config, parent=None) -> None:
-        """
-        ## 初始化机器人
-        """
-        super().__init__(parent=parent)
-        self.timer: Optional[QTimer] = None
-        self.config = config
-
-        # 创建布局和标签
-        self.hBoxLayout = QHBoxLayout()
-        self.QQAvatarLabel = ImageLabel(":Global/logo.png", self)
-        self.botNameLabel = BodyLabel(f"{self.config.bot.name}({self.config.bot.QQID})", self)
-        self.runButton = TransparentPushButton(FluentIcon.POWER_BUTTON, self.tr("Start"), self)
-        self.stopButton = TransparentPushButton(FluentIcon.POWER_BUTTON, self.tr("Stop"), self)
-
-        # 连接信号以及设置控件
-        self.runButton.clicked.connect(self._runButtonSlot)
-        self.stopButton.clicked.connect(self._stopButtonSlot)
-        self.stopButton.hide()
-
-        # 调用方法
-        self._QQAvatar()
-        self._setLayout()
-        self.monitorBots()
-
-    @timer(2000)
-    def monitorBots(self) -> None:
-        """
-        ## 监控机器人列表
-        """
-        from src.Ui.BotListPage.BotListWidget import BotListWidget
-        for card in it(BotListWidget).botList.botCardList:
-            if self.config.bot.QQID != card.config.bot.QQID:
-                continue
-            else:
-                if card.botWidget is None:
-                    return
-                if card.botWidget.isRun:
-                    self.runButton.hide()
-                    self.stopButton.show()
-                else:
-                    self.runButton.show()
-                    self.stopButton.hide()
+        StyleSheet.BOT_LIST_WIDGET.apply(self)
 
-    @Slot()
-    def _runButtonSlot(self) -> None:
+    @Slot(str)
+    def _runSlot(self, qqid: str) -> None:
         """
-        ## 运行按钮
+        ## 启动按钮, 跳转到机器人页面并启动
         """
         from src.Ui.MainWindow import MainWindow
         from src.Ui.BotListPage.BotListWidget import BotListWidget
-        for card in it(BotListWidget).botList.botCardList:
-            if self.config.bot.QQID == card.config.bot.QQID:
-                it(MainWindow).bot_list_widget_button.click()
-                card.clicked.emit()
-                card.botWidget.runButton.click()
-                break
-        self.runButton.hide()
-        self.stopButton.show()
+        botList = it(MainWindow).ensurePage(BotListWidget).botList
+        it(MainWindow).bot_list_widget_button.click()
+        if (botWidget := botList.openBot(qqid)) is not None and not botWidget.isRun:
+            botWidget.runButton.click()
 
-    @Slot()
-    def _stopButtonSlot(self) -> None:
+    @Slot(str)
+    def _stopSlot(self, qqid: str) -> None:
         """
         ## 停止按钮
         """
+        from src.Ui.MainWindow import MainWindow
         from src.Ui.BotListPage.BotListWidget import BotListWidget
-        for card in it(BotListWidget).botList.botCardList:
-            if self.config.bot.QQID == card.config.bot.QQID:
-                card.botWidget.stopButton.click()
-            self.runButton.show()
-            self.stopButton.hide()
-
-    def _QQAvatar(self) -> None:
-        """
-        ## 创建展示 QQ头像 的 ImageLabel
-        """
-        self.QQAvatarLabel.scaledToHeight(28)
-        self.QQAvatarLabel.setBorderRadius(5, 5, 5, 5)
-
-        # 处理 QQ头像 的 Url
-        avatar_url: QUrl = Urls.QQ_AVATAR.value
-        query = QUrlQuery()
-        query.addQueryItem("spec", "640")
-        query.addQueryItem("dst_uin", self.config.bot.QQID)
-        avatar_url.setQuery(query)
-
-        # 创建请求并链接槽函数
-        request = QNetworkRequest(avatar_url)
-        replay = it(NetworkFunc).manager.get(request)
-        replay.finished.connect(lambda: self._setAvatar(replay))
-
-    def _setAvatar(self, replay: QNetworkReply) -> None:
-        """
-        ## 设置头像
-        """
-        if replay.error() == QNetworkReply.NetworkError.NoError:
-            # 如果请求成功则设置反之显示错误提示
-            avatar = QPixmap()
-            avatar.loadFromData(replay.readAll())
-            self.QQAvatarLabel.setImage(avatar)
-            self.QQAvatarLabel.scaledToHeight(28)
-            self.QQAvatarLabel.setBorderRadius(5, 5, 5, 5)
-        else:
-            from src.Ui.HomePage import HomeWidget
-            it(HomeWidget).showError(
-                title=self.tr("Failed to get the QQ avatar"),
-                content=replay.errorString()
-            )
-
-    def _setLayout(self) -> None:
-        """
-        ## 对控件进行布局
-        """
-
-        self.hBoxLayout.addWidget(self.QQAvatarLabel)
-        self.hBoxLayout.addWidget(self.botNameLabel)
-        self.hBoxLayout.addStretch(1)
-        self.hBoxLayout.addWidget(self.runButton)
-        self.hBoxLayout.addWidget(self.stopButton)
-
-        self.setLayout(self.hBoxLayout)
+        botWidget = it(MainWindow).ensurePage(BotListWidget).botList.botWidget(qqid)
+        if botWidget is not None and botWidget.isRun:
+            botWidget.stopButton.click()
@@ -3,10 +3,10 @@ import sys
 import time
 from typing import Optional
 
-import psutil
-from PySide6.QtCore import Qt, QRectF, QPoint, QTimer
+from PySide6.QtCore import Qt, QRectF, QPoint, QTimer, Slot
 from PySide6.QtGui import QPainter, QColor, QPen
 from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QFormLayout
+from creart import it
 from qfluentwidgets import (
     BodyLabel, setFont, SimpleCardWidget, HeaderCardWidget, InfoBadgeManager,
     IconInfoBadge, FluentIcon, ToolTipFilter, themeColor, isDarkTheme
@@ -14,6 +14,7 @@ from qfluentwidgets import (
 
 from src.Core import timer
 from src.Core.Config import cfg
+from src.Core.SystemMonitor import SystemMonitor, SystemSnapshot
 
 
 class DashboardBase(QWidget):
@@ -43,9 +44,49 @@ class DashboardBase(QWidget):
         # 调用方法
         self._setLayout()
 
+        # 订阅后台采样, 已有采样时立即显示
+        self._snapshot: Optional[SystemSnapshot] = it(SystemMonitor).subscribe(self._snapshotSlot)
+        if self._snapshot is not None:
+            self.applySnapshot(self._snapshot)
+
     def setValue(self, value: int | float) -> None:
         self.progressBar.setValue(value)
 
+    def applySnapshot(self, snapshot: SystemSnapshot) -> None:
+        """
+        ## 将采样结果显示到仪表盘, 由子类重写, 默认不显示
+        """
+
+    def toolTipText(self, snapshot: SystemSnapshot) -> str:
+        """
+        ## 根据采样结果生成提示文本, 由子类重写, 默认没有提示
+        """
+        return ""
+
+    @Slot(object)
+    def _snapshotSlot(self, snapshot: SystemSnapshot) -> None:
+        """
+        ## 收到新的采样
+            - 不可见时只记录, 重新显示时再刷新
+            - 提示文本只在鼠标悬停时生成
+        """
+        self._snapshot = snapshot
+        if not self.isVisible():
+            return
+        self.applySnapshot(snapshot)
+        if self.underMouse():
+            self.setToolTip(self.toolTipText(snapshot))
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        if self._snapshot is not None:
+            self.applySnapshot(self._snapshot)
+
+    def enterEvent(self, event) -> None:
+        if self._snapshot is not None:
+            self.setToolTip(self.toolTipText(self._snapshot))
+        super().enterEvent(event)
+
     def _setLayout(self) -> None:
         """
         ## 将控件添加到布局
@@ -136,16 +177,15 @@ class CPUDashboard(DashboardBase):
         ## 初始化
         """
         super().__init__("CPU", parent)
-        self.monitor()
 
-    @timer(1000)
-    def monitor(self) -> None:
+    def applySnapshot(self, snapshot: SystemSnapshot) -> None:
+        self.setValue(snapshot.cpuPercent)
+
+    def toolTipText(self, snapshot: SystemSnapshot) -> str:
         """
-        ## 实现监控 CPU 信息
+        ## 每个 CPU 核心的使用率
         """
-        self.setValue(psutil.cpu_percent(interval=0))
-        # 获取每个 CPU 核心的使用率
-        cpu_usages = psutil.cpu_percent(interval=0, percpu=True)
+        cpu_usages = snapshot.cpuPerCore
         # 获取总 CPU 数
         total_cpus = len(cpu_usages)
         max_rows = (total_cpus + 8 - 1) // 8
@@ -162,7 +202,7 @@ class CPUDashboard(DashboardBase):
                 else:
                     line.append(f"CPU {core_num:03d} Usage rate:{usage:5.0f}%")
             lines.append(str(" " * 10).join(line))
-        self.setToolTip(self.tr("CPU Occupancy:\n\n{}".format('\n'.join(lines))))
+        return self.tr("CPU Occupancy:\n\n{}".format('\n'.join(lines)))
 
 
 class MemoryDashboard(DashboardBase):
@@ -175,28 +215,22 @@ class MemoryDashboard(DashboardBase):
         ## 初始化
         """
         super().__init__("Memory", parent)
-        self.monitor()
 
-    @timer(3000)
-    def monitor(self) -> None:
+    def applySnapshot(self, snapshot: SystemSnapshot) -> None:
+        self.setValue(snapshot.memoryPercent)
+
+    def toolTipText(self, snapshot: SystemSnapshot) -> str:
         """
-        ## 实现监控 Memory 信息
+        ## 系统内存和本程序占用的内存
         """
-        self.setValue(psutil.virtual_memory().percent)
-        # 获取系统内存信息
-        virtual_mem = psutil.virtual_memory()
-        total_mem = virtual_mem.total / (1024 ** 3)
-        used_mem = virtual_mem.used / (1024 ** 3)
-
-        # 构建输出字符串
-        toolTipStr = self.tr(
+        total_mem = snapshot.memoryTotal / (1024 ** 3)
+        used_mem = snapshot.memoryUsed / (1024 ** 3)
+        return self.tr(
             f"Memory Size: {used_mem:.0f}G/{total_mem:.0f}G\n"
             f"Memory Usage: \n"
-            f"{' ' * 8}NapCat Desktop: {psutil.Process().memory_info().rss / (1024 ** 2):.2f} MB"
+            f"{' ' * 8}NapCat Desktop: {snapshot.processRss / (1024 ** 2):.2f} MB"
         )
 
-        self.setToolTip(toolTipStr)
-
     def paintEvent(self, event) -> None:
         """
         ## 调整 infoLabel 大小
@@ -5,7 +5,6 @@ from qfluentwidgets import SmoothScrollDelegate, setFont
 from qfluentwidgets.components.widgets.menu import TextEditMenu
 
 from src.Ui.StyleSheet import StyleSheet
-from src.Ui.resource import resource
 
 
 class UpdateLogCard(QTextEdit):
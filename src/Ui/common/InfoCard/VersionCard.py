@@ -75,6 +75,10 @@ class NapCatVersionCard(VersionCardBase):
         super().__init__(NCIcon.LOGO, "NapCat Version", "Unknown Version", parent)
         self.updateSate = False  # 是否有更新标记
         self.isInstall = False  # 检查是否有安装 NapCat 的标记, False 表示没有安装
+        # 本地或远程版本变化时更新显示
+        it(GetVersion).napcatLocalVersionChanged.connect(self.getLocalVersion)
+        it(GetVersion).napcatLocalVersionChanged.connect(self.checkUpdates)
+        it(GetVersion).napcatRemoteVersionChanged.connect(self.checkUpdates)
         # 启动时触发一次检查更新
         self.getLocalVersion()
         self._onTimer()
@@ -86,8 +90,7 @@ class NapCatVersionCard(VersionCardBase):
         """
         self.checkUpdates()
 
-    @timer(3000)
-    def checkUpdates(self) -> None:
+    def checkUpdates(self, *_) -> None:
         """
         ## 检查更新逻辑
         """
@@ -114,8 +117,7 @@ class NapCatVersionCard(VersionCardBase):
         else:
             self.warningBadge.hide()
 
-    @timer(3000)
-    def getLocalVersion(self) -> None:
+    def getLocalVersion(self, *_) -> None:
         """
         ## 获取本地版本
         """
@@ -127,6 +129,7 @@ class NapCatVersionCard(VersionCardBase):
         else:
             self.isInstall = True
             self.setToolTip("")
+            self.errorBadge.hide()
             self.contentsLabel.setText(version)
 
     def mousePressEvent(self, event):
@@ -161,12 +164,12 @@ class QQVersionCard(VersionCardBase):
 
     def __init__(self, parent=None) -> None:
         super().__init__(NCIcon.QQ, "QQ Version", "Unknown Version", parent)
-        self.contentsLabel.setText(self.getLocalVersion())
+        it(GetVersion).QQLocalVersionChanged.connect(self.getLocalVersion)
+        self.getLocalVersion()
 
-    @timer(3000)
-    def getLocalVersion(self) -> str:
+    def getLocalVersion(self, *_) -> None:
         """
-        ## 获取本地版本
+        ## 获取本地版本并显示
         """
         version = it(GetVersion).QQLocalVersion
 
@@ -174,8 +177,11 @@ class QQVersionCard(VersionCardBase):
             # 如果没有获取到文件就会返回None, 也就代表QQ没有安装
             self.setToolTip(self.tr("No QQ path found, please install it"))
             self.errorBadge.show()
+        else:
+            self.setToolTip("")
+            self.errorBadge.hide()
 
-        return version if version else "Unknown version"
+        self.contentsLabel.setText(version if version else "Unknown version")
 
 
 @InfoBadgeManager.register('Version')
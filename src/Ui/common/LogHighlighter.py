@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+## 日志高亮
+    - 不使用 QSyntaxHighlighter, 自行把格式写入每个文本块的 QTextLayout, 从而可以控制高亮的时机
+    - 格式和 FormatRange 在创建时按日志级别预先生成, 高亮时不再创建任何格式对象
+    - 行首的时间戳和日志级别由类属性生成的正则表达式匹配, 每个实例只编译一次
+    - 文本变化时只立即处理少量新增的块和可见的块, 一次追加或重新加载大量内容时, 其余的块在空闲时分批处理
+    - 基准测试: python -m src.Ui.common.LogHighlighter [行数], 默认 1000000 行
+"""
+import re
+import sys
+import time
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, QTimer, Qt, Slot
+from PySide6.QtGui import QColor, QTextBlock, QTextCharFormat, QTextLayout
+from PySide6.QtWidgets import QPlainTextEdit
+
+# 文本块状态 (QTextBlock.userState), 新建的块默认为 -1
+UNPROCESSED = -1
+NO_MATCH = 0
+HIGHLIGHTED = 1
+
+# 一次变化中新增的块少于该数量时立即全部高亮
+APPEND_LIMIT = 500
+# 空闲时每次处理的时间预算 (毫秒)
+IDLE_BUDGET = 8
+# 每处理多少个块检查一次时间
+IDLE_CHECK_EVERY = 64
+
+
+class IncrementalLogHighlighter(QObject):
+    """
+    ## 增量日志高亮的基类
+        - 子类通过类属性描述行首格式: 时间戳, 时间戳和级别之间的分隔符, 级别之后的结束符
+    """
+    # 时间戳模板, 数字位置为 0
+    TIMESTAMP_TEMPLATE = "0000-00-00 00:00:00"
+    LEVEL_PREFIX = " ["
+    LEVEL_SUFFIX = "]"
+    TIMESTAMP_COLOR = QColor(Qt.GlobalColor.lightGray)
+    LEVEL_COLORS: Dict[str, QColor] = {}
+
+    def __init__(self, editor: QPlainTextEdit) -> None:
+        super().__init__(editor)
+        self.editor = editor
+        self.document = editor.document()
+        self._applying = False
+        self._idleFrom: Optional[int] = None
+
+        # 预先生成格式, 每个级别的 FormatRange 位置固定, 可以直接复用
+        timestampFormat = QTextCharFormat()
+        timestampFormat.setForeground(self.TIMESTAMP_COLOR)
+        self.formats: Dict[str, QTextCharFormat] = {}
+        self._ranges: Dict[str, List[QTextLayout.FormatRange]] = {}
+        for level, color in self.LEVEL_COLORS.items():
+            self.formats[level] = QTextCharFormat()
+            self.formats[level].setForeground(color)
+            self._ranges[level] = [
+                self._formatRange(0, len(self.TIMESTAMP_TEMPLATE), timestampFormat),
+                self._formatRange(self.levelStart(), len(level), self.formats[level]),
+            ]
+        self._match = self.compilePattern().match
+
+        # 空闲时分批高亮
+        self.idleTimer = QTimer(self)
+        self.idleTimer.setInterval(0)
+        self.idleTimer.timeout.connect(self._idleSlot)
+
+        self.document.contentsChange.connect(self._contentsChangeSlot)
+        self.editor.updateRequest.connect(self._highlightVisible)
+
+    @staticmethod
+    def _formatRange(start: int, length: int, charFormat: QTextCharFormat) -> QTextLayout.FormatRange:
+        formatRange = QTextLayout.FormatRange()
+        formatRange.start = start
+        formatRange.length = length
+        formatRange.format = charFormat
+        return formatRange
+
+    @classmethod
+    def levelStart(cls) -> int:
+        return len(cls.TIMESTAMP_TEMPLATE) + len(cls.LEVEL_PREFIX)
+
+    @classmethod
+    def compilePattern(cls) -> re.Pattern:
+        """
+        ## 由时间戳模板、分隔符和级别生成行首的正则表达式, 第 1 组为日志级别
+        """
+        timestamp = "".join(r"\d" if char == "0" else re.escape(char) for char in cls.TIMESTAMP_TEMPLATE)
+        levels = "|".join(map(re.escape, sorted(cls.LEVEL_COLORS, key=len, reverse=True)))
+        return re.compile(
+            f"{timestamp}{re.escape(cls.LEVEL_PREFIX)}({levels}){re.escape(cls.LEVEL_SUFFIX)}", re.ASCII
+        )
+
+    def parseLevel(self, text: str) -> Optional[str]:
+        """
+        ## 解析行首的日志级别, 格式不符时返回 None
+        """
+        return match[1] if (match := self._match(text)) else None
+
+    def isPending(self) -> bool:
+        """
+        ## 是否还有等待空闲时处理的块
+        """
+        return self._idleFrom is not None
+
+    def _highlight(self, block: QTextBlock) -> None:
+        """
+        ## 高亮单个块, 只写入格式, 由调用方统一标记重绘
+        """
+        layout = block.layout()
+        if (level := self.parseLevel(block.text())) is None:
+            layout.clearFormats()
+            block.setUserState(NO_MATCH)
+        else:
+            layout.setFormats(self._ranges[level])
+            block.setUserState(HIGHLIGHTED)
+
+    def _markDirty(self, first: Optional[QTextBlock], last: Optional[QTextBlock]) -> None:
+        """
+        ## 通知文档重新排版 first 到 last 之间的块, 忽略由此引起的 contentsChange
+        """
+        if first is None:
+            return
+        self._applying = True
+        try:
+            self.document.markContentsDirty(first.position(), last.position() + last.length() - first.position())
+        finally:
+            self._applying = False
+
+    @Slot(int, int, int)
+    def _contentsChangeSlot(self, position: int, removed: int, added: int) -> None:
+        """
+        ## 文本变化
+            - 被修改的首尾两个块重置状态, 新建的块状态本来就是 UNPROCESSED
+            - 新增的块较少时立即高亮, 否则只高亮可见部分, 其余交给空闲处理
+        """
+        if self._applying:
+            return
+        first = self.document.findBlock(position)
+        last = self.document.findBlock(position + added)
+        if not first.isValid():
+            first = self.document.lastBlock()
+        if not last.isValid():
+            last = self.document.lastBlock()
+        first.setUserState(UNPROCESSED)
+        last.setUserState(UNPROCESSED)
+
+        if last.blockNumber() - first.blockNumber() < APPEND_LIMIT:
+            block, end = first, last.next()
+            while block.isValid() and block != end:
+                self._highlight(block)
+                block = block.next()
+            self._markDirty(first, last)
+            return
+
+        self._highlightVisible()
+        firstNumber = first.blockNumber()
+        self._idleFrom = firstNumber if self._idleFrom is None else min(self._idleFrom, firstNumber)
+        self.idleTimer.start()
+
+    def _highlightVisible(self, *_) -> None:
+        """
+        ## 高亮可见范围内尚未处理的块
+        """
+        block = self.editor.firstVisibleBlock()
+        offset = self.editor.contentOffset()
+        bottom = self.editor.viewport().height()
+        first = last = None
+        while block.isValid() and self.editor.blockBoundingGeometry(block).translated(offset).top() <= bottom:
+            if block.userState() == UNPROCESSED:
+                self._highlight(block)
+                first = block if first is None else first
+                last = block
+            block = block.next()
+        self._markDirty(first, last)
+
+    @Slot()
+    def _idleSlot(self) -> None:
+        """
+        ## 空闲时从 _idleFrom 开始分批高亮, 每次不超过 IDLE_BUDGET 毫秒
+        """
+        if self._idleFrom is None:
+            self.idleTimer.stop()
+            return
+        deadline = time.perf_counter() + IDLE_BUDGET / 1000
+        block = self.document.findBlockByNumber(self._idleFrom)
+        first = last = None
+        count = 0
+        while block.isValid():
+            if block.userState() == UNPROCESSED:
+                self._highlight(block)
+                first = block if first is None else first
+                last = block
+            block = block.next()
+            count += 1
+            if count % IDLE_CHECK_EVERY == 0 and time.perf_counter() >= deadline:
+                break
+        self._markDirty(first, last)
+
+        if block.isValid():
+            self._idleFrom = block.blockNumber()
+        else:
+            self._idleFrom = None
+            self.idleTimer.stop()
+
+
+class LogHighlighter(IncrementalLogHighlighter):
+    """
+    ## NapCat 日志高亮, 格式: 2024-01-01 00:00:00 [INFO] ...
+    """
+    TIMESTAMP_TEMPLATE = "0000-00-00 00:00:00"
+    LEVEL_PREFIX = " ["
+    LEVEL_SUFFIX = "]"
+    TIMESTAMP_COLOR = QColor(Qt.GlobalColor.lightGray)
+    LEVEL_COLORS = {
+        'DEBUG': QColor(Qt.GlobalColor.darkRed),
+        'INFO': QColor(Qt.GlobalColor.green),
+        'WARN': QColor(Qt.GlobalColor.darkYellow),
+        'ERROR': QColor(Qt.GlobalColor.red),
+    }
+
+
+class NCDLogHighlighter(IncrementalLogHighlighter):
+    """
+    ## NapCat Desktop 日志高亮, 格式: 2024-01-01 00:00:00.000 | INFO | ...
+    """
+    TIMESTAMP_TEMPLATE = "0000-00-00 00:00:00.000"
+    LEVEL_PREFIX = " | "
+    LEVEL_SUFFIX = " |"
+    TIMESTAMP_COLOR = QColor(Qt.GlobalColor.darkGreen)
+    LEVEL_COLORS = {
+        'SUCCESS': QColor(Qt.GlobalColor.darkGreen),
+        'DEBUG': QColor(Qt.GlobalColor.darkRed),
+        'INFO': QColor(Qt.GlobalColor.darkBlue),
+        'WARN': QColor(Qt.GlobalColor.darkYellow),
+        'ERROR': QColor(Qt.GlobalColor.red),
+    }
+
+
+if __name__ == "__main__":
+    # 基准测试: 解析速度与正则表达式对比, 以及一次加载大量日志时界面线程的阻塞时间
+    from PySide6.QtCore import QRegularExpression
+    from PySide6.QtWidgets import QApplication
+
+    from src.Ui.common.CodeEditor import CodeEditor
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    levels = list(NCDLogHighlighter.LEVEL_COLORS) + [None]
+    lines = [
+        f"2024-05-01 12:{i // 60 % 60:02d}:{i % 60:02d}.{i % 1000:03d} | {level} | src.Core:run:{i} - message {i}"
+        if level else f"    continuation line {i}"
+        for i, level in zip(range(count), levels * (count // len(levels) + 1))
+    ]
+
+    app = QApplication(sys.argv)
+    editor = CodeEditor()
+    editor.resize(900, 700)
+    editor.show()
+    highlighter = NCDLogHighlighter(editor)
+
+    # 解析速度
+    pattern = QRegularExpression(
+        r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3}) \| (SUCCESS|DEBUG|INFO|WARN|ERROR) \|'
+    )
+    start = time.perf_counter()
+    for line in lines:
+        pattern.match(line).hasMatch()
+    regexTime = time.perf_counter() - start
+    start = time.perf_counter()
+    for line in lines:
+        highlighter.parseLevel(line)
+    parseTime = time.perf_counter() - start
+    print(f"解析 {count} 行: QRegularExpression {regexTime * 1000:.0f} ms, parseLevel {parseTime * 1000:.0f} ms")
+
+    # 一次加载全部内容
+    text = "\n".join(lines)
+    start = time.perf_counter()
+    editor.setPlainText(text)
+    loadTime = time.perf_counter() - start
+
+    # 空闲处理, 记录每次事件循环的最长耗时
+    start = time.perf_counter()
+    longest = 0.0
+    while highlighter.isPending():
+        tick = time.perf_counter()
+        app.processEvents()
+        longest = max(longest, time.perf_counter() - tick)
+    idleTime = time.perf_counter() - start
+    print(
+        f"setPlainText {count} 行 (含可见部分高亮): {loadTime * 1000:.0f} ms, "
+        f"空闲高亮总计 {idleTime * 1000:.0f} ms, 单次事件循环最长 {longest * 1000:.1f} ms"
+    )
+
+    # 追加少量内容
+    start = time.perf_counter()
+    editor.appendPlainText("\n".join(lines[:100]))
+    print(f"追加 100 行: {(time.perf_counter() - start) * 1000:.1f} ms")
+    sys.exit(0)
@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
 import shutil
+import threading
 import zipfile
 from pathlib import Path
-from typing import Optional
+from queue import Full, Queue
+from typing import Dict, Optional
 
 from PySide6.QtCore import Qt, QSize, QUrl, Slot, QThread, Signal, QProcess, QCoreApplication
 from PySide6.QtGui import QFont, QColor, QPixmap, QDesktopServices
@@ -18,11 +23,25 @@ from src.Core import timer
 from src.Core.Config import cfg
 # from src.Core.BootWay import FixQQ
 from src.Core.GetVersion import GetVersion
-from src.Core.NetworkFunc import Urls, NapCatDownloader
+from src.Core.LazyImport import lazyImport
+from src.Core.ArtifactCache import ArtifactCache
+from src.Core.NetworkFunc import (
+    Urls, Downloader, DOWNLOAD_CHUNK_SIZE, artifactSources, downloadArtifact, githubReachable
+)
+from src.Core.NapCatStore import NapCatStore
 from src.Core.PathFunc import PathFunc
+from src.Core.RateLimiter import BandwidthShaper
+from src.Core.ZipStream import (
+    EOCD_SEARCH_SIZE, ParallelExtractor, StreamingExtractor, StreamReader, ZipStreamError, locateCentralDirectory,
+    parseCentralDirectory
+)
 from src.Ui.Icon import NapCatDesktopIcon as NCDIcon
+from src.Ui.ResourceBundle import ResourceBundle
 from src.Ui.common.Netwrok.DownloadButton import ProgressBarButton
 
+# 只在下载安装时使用, 延迟到第一次使用时导入
+httpx = lazyImport("httpx")
+
 
 class DownloadCardBase(SimpleCardWidget):
     """
@@ -139,17 +158,19 @@ class NapCatDownloadCard(DownloadCardBase):
         self.isInstall = False
 
         # 创建控件
-        self.downloader = NapCatDownloader(Urls.NAPCAT_DOWNLOAD.value, it(PathFunc).tmp_path)
+        self.installer = NapCatPipelineInstaller(Urls.NAPCAT_DOWNLOAD.value)
         self.versionWidget = InfoWidget(self.tr("Version"), self.tr("Unknown"), self)
         self.platformWidget = InfoWidget(self.tr("Platform"), cfg.get(cfg.PlatformType), self)
         self.systemWidget = InfoWidget(self.tr("System"), cfg.get(cfg.SystemType), self)
 
         # 调整控件
-        self.installButton.clicked.connect(self.downloader.start)
-        self.downloader.progressBarToggle.connect(self.switchProgressBar)
-        self.downloader.downloadProgress.connect(self.installButton.setValue)
-        self.downloader.errorFinsh.connect(self.showErrorTips)
-        self.downloader.downloadFinish.connect(self._downloadFinishSlot)
+        self.installButton.clicked.connect(self.installer.start)
+        self.installer.progressBarToggle.connect(self.switchProgressBar)
+        self.installer.downloadProgress.connect(self.installButton.setValue)
+        self.installer.extractProgress.connect(self.installButton.setValue)
+        self.installer.errorFinished.connect(self.showErrorTips)
+        self.installer.installFinished.connect(self._installationFinished)
+        self.installer.staged.connect(self.installer.activate)
         self.nameLabel.setText("NapCatQQ")
         self.companyLabel.setUrl(Urls.NAPCATQQ_REPO.value)
         self.companyLabel.setText(self.tr("Project repositories"))
@@ -173,6 +194,7 @@ class NapCatDownloadCard(DownloadCardBase):
         self.infoLayout.addStretch(1)
         self.versionWidget.vBoxLayout.setContentsMargins(0, 0, 8, 0)
 
+        it(GetVersion).napcatLocalVersionChanged.connect(self.checkInstall)
         self.checkInstall()
         self._setLayout()
         self._onTimer()
@@ -191,10 +213,9 @@ class NapCatDownloadCard(DownloadCardBase):
         """
         self.versionWidget.setValue(it(GetVersion).napcatRemoteVersion)
 
-    @timer(3000)
-    def checkInstall(self) -> None:
+    def checkInstall(self, *_) -> None:
         """
-        ## 检查是否安装
+        ## 检查是否安装, 本地版本变化时调用
         """
         if not it(GetVersion).napcatLocalVersion is None:
             self.installButton.hide()
@@ -205,17 +226,6 @@ class NapCatDownloadCard(DownloadCardBase):
             self.openInstallPathButton.hide()
             self.isInstall = False
 
-    @Slot()
-    def _downloadFinishSlot(self) -> None:
-        """
-        ## 下载完成后的安装操作
-        """
-        self.installWorker = NapCatInstallWorker(it(PathFunc).tmp_path / self.downloader.url.fileName())
-        self.installWorker.installFinished.connect(self._installationFinished)
-        self.installWorker.errorFinished.connect(self.showErrorTips)
-        self.installWorker.progressBarToggle.connect(self.switchProgressBar)
-        self.installWorker.start()
-
     @Slot()
     def _installationFinished(self) -> None:
         """
@@ -273,6 +283,7 @@ class NapCatDownloadCard(DownloadCardBase):
         """
         ## 分享按钮的槽函数
         """
+        ResourceBundle.BANNER.register()
         shareView = FlyoutView(
             title=self.tr("What are you doing ?"),
             content=self.tr(
@@ -290,9 +301,21 @@ class NapCatDownloadCard(DownloadCardBase):
 class NapCatInstallWorker(QThread):
     """
     ## NapCat 安装任务
+        - 新版在与安装目录同级的暂存目录中组装完整, 此时正在运行的 bot 不受影响
+        - 安装目录中的 MANIFEST_NAME 记录了每个文件的 CRC32 和大小, 只解压有变化的文件,
+          未变化的文件从当前版本硬链接过来, 不产生额外写入
+        - 组装完成后发出 staged 信号, 由调用方在合适的时机 (如停止 bot 后) 调用 activate,
+          通过目录重命名完成切换, 旧版保留为 previousPath, rollback 同样只是重命名
     """
+    # 已安装文件清单
+    MANIFEST_NAME = ".ncd_manifest.json"
+
     # 进度条模式切换 (进度模式: 0 \ 未知进度模式: 1 \ 文字模式: 2)
     progressBarToggle = Signal(int)
+    # 解压进度
+    extractProgress = Signal(int)
+    # 新版已在暂存目录中组装完成, 等待 activate
+    staged = Signal()
     # 安装结束信号
     installFinished = Signal()
     # 发送错误退出信号
@@ -301,49 +324,414 @@ class NapCatInstallWorker(QThread):
     def __init__(self, zipFilePath, parent=None):
         super().__init__(parent)
         self.ncInstallPath = it(PathFunc).getNapCatPath()
+        self.stagingPath = self.ncInstallPath.with_name(f"{self.ncInstallPath.name}.staging")
+        self.previousPath = self.ncInstallPath.with_name(f"{self.ncInstallPath.name}.previous")
         self.zipFilePath = zipFilePath  # it(PathFunc).tmp_path / self.downloader.url.fileName()
 
+        # 增量更新使用的清单 {成员名: {"crc": CRC32, "size": 大小, "sha256": 哈希}}
+        self.installedManifest: Dict[str, Dict[str, int]] = {}
+        self.newManifest: Dict[str, Dict[str, int]] = {}
+        # 实际写入和因未变化而跳过的字节数
+        self.bytesWritten = 0
+        self.bytesSaved = 0
+
     def run(self) -> None:
         try:
-            logger.info(f"{'-' * 10} 开始移除旧版 NapCat {'-' * 10}")
             self.progressBarToggle.emit(1)
             self.progressBarToggle.emit(3)
-            if not self.ncInstallPath.exists():
-                # 检查路径是否存在, 不存在则创建
-                self.ncInstallPath.mkdir(parents=True, exist_ok=True)
-                logger.warning(f"路径 {self.ncInstallPath} 不存在, 已创建")
-
-            # 遍历 NapCat 文件夹中旧版文件并删除
-            for item in self.ncInstallPath.iterdir():
-                # 跳过 config 目录保证配置文件不丢失
-                if item.is_dir() and item.name == 'config':
-                    continue
-
-                # 移除旧版文件
-                shutil.rmtree(item) if item.is_dir() else item.unlink()
-                logger.info(f"删除文件 {item}")
-            logger.info(f"{'-' * 10} 成功移除旧版 NapCat {'-' * 10}")
-            logger.info(f"{'-' * 10} 开始解压新版 NapCat {'-' * 10}")
-
-            # 直接解包到 NapCat 目录
-            with zipfile.ZipFile(str(self.zipFilePath), 'r') as zip_ref:
-                zip_ref.extractall(str(self.ncInstallPath))
-
-            # 删除包释放空间
-            self.zipFilePath.unlink()
-            logger.info(f"{'-' * 10} 成功解压新版 NapCat {'-' * 10}")
-
+            self._stage()
         except (zipfile.BadZipFile, PermissionError, FileNotFoundError, Exception) as e:
             logger.error(f"安装 NapCat 时引发 {type(e).__name__}: {e}")
+            shutil.rmtree(self.stagingPath, ignore_errors=True)
             self.errorFinished.emit()
         else:
             # 没有引发异常
-            self.installFinished.emit()
+            self.staged.emit()
         finally:
             # 无论是否出错,都会重置进度条
             self.progressBarToggle.emit(2)
             self.progressBarToggle.emit(4)
 
+    def _stage(self) -> None:
+        """
+        ## 在暂存目录中组装新版
+        """
+        self._prepareStaging()
+        self._extract()
+        self._completeStaging()
+
+        # 删除包释放空间
+        self.zipFilePath.unlink()
+
+    def _prepareStaging(self) -> None:
+        """
+        ## 创建空的暂存目录, 并读取已安装文件的清单
+        """
+        shutil.rmtree(self.stagingPath, ignore_errors=True)
+        self.stagingPath.mkdir(parents=True)
+        self.installedManifest = self._loadManifest(self.ncInstallPath)
+        self.newManifest = {}
+        self.bytesWritten = 0
+        self.bytesSaved = 0
+
+    def _loadManifest(self, root: Path) -> Dict[str, Dict[str, int]]:
+        """
+        ## 读取 root 中的文件清单, 没有或损坏时返回空字典 (即全量安装)
+        """
+        try:
+            return json.loads((root / self.MANIFEST_NAME).read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _isUnchanged(self, name: str, crc: int, size: int) -> bool:
+        """
+        ## 判断成员与已安装的文件是否相同
+            - CRC32 和大小与清单一致, 且磁盘上的文件仍然存在且大小未被修改
+        """
+        installed = self.installedManifest.get(name, {})
+        if installed.get("crc") != crc or installed.get("size") != size:
+            return False
+        installed = self.ncInstallPath / name
+        return installed.is_file() and installed.stat().st_size == size
+
+    def _shouldExtract(self, name: str, crc: int, size: int) -> bool:
+        """
+        ## 记录新版清单, 并判断成员是否需要写入
+        """
+        if self._isUnchanged(name, crc, size):
+            # 沿用已安装文件的记录 (包括 sha256)
+            self.newManifest[name] = dict(self.installedManifest[name])
+            self.bytesSaved += size
+            return False
+        self.newManifest[name] = {"crc": crc, "size": size}
+        self.bytesWritten += size
+        return True
+
+    def _recordHashes(self, hashes: Dict[str, str]) -> None:
+        """
+        ## 将解压时计算的 sha256 写入新版清单
+        """
+        for name, sha256 in hashes.items():
+            self.newManifest[name]["sha256"] = sha256
+
+    def _extract(self) -> None:
+        """
+        ## 将 zip 中有变化的成员解压到暂存目录
+        """
+        logger.info(f"{'-' * 10} 开始解压新版 NapCat {'-' * 10}")
+        self.progressBarToggle.emit(0)
+
+        def onMember(info: zipfile.ZipInfo, done: int, total: int) -> None:
+            logger.debug(f"解压 {info.filename} ({done}/{total})")
+            self.extractProgress.emit(int(done / total * 100))
+
+        hashes = ParallelExtractor(self.zipFilePath, self.stagingPath).extract(
+            lambda info: self._shouldExtract(info.filename, info.CRC, info.file_size), onMember
+        )
+        self._recordHashes(hashes)
+        self.extractProgress.emit(0)
+        logger.info(f"{'-' * 10} 成功解压新版 NapCat {'-' * 10}")
+
+    def _completeStaging(self) -> None:
+        """
+        ## 把未变化的文件从当前版本硬链接到暂存目录, 并写入新版清单
+        """
+        for name in self.newManifest:
+            target = self.stagingPath / name
+            if target.exists():
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(self.ncInstallPath / name, target)
+            except OSError:
+                # 不支持硬链接的文件系统退化为复制
+                shutil.copy2(self.ncInstallPath / name, target)
+
+        tmp = self.stagingPath / f"{self.MANIFEST_NAME}.tmp"
+        tmp.write_text(json.dumps(self.newManifest), encoding="utf-8")
+        tmp.replace(self.stagingPath / self.MANIFEST_NAME)
+        logger.info(
+            f"{'-' * 10} 新版 NapCat 组装完成, 写入 {self.bytesWritten / 1024 ** 2:.2f}MB, "
+            f"节省 {self.bytesSaved / 1024 ** 2:.2f}MB {'-' * 10}"
+        )
+
+    def activate(self) -> bool:
+        """
+        ## 切换到暂存目录中的新版, 需在 bot 停止后于主线程调用
+            - 只有几次目录重命名, 耗时与包大小无关
+        """
+        try:
+            self._swap(self.stagingPath)
+        except OSError as e:
+            logger.error(f"切换 NapCat 版本时引发 {type(e).__name__}: {e}")
+            self.errorFinished.emit()
+            return False
+        logger.info(f"{'-' * 10} 成功切换到新版 NapCat {'-' * 10}")
+        # 收录到版本仓库, 之后可以为 bot 单独选择此版本
+        it(NapCatStore).importTreeAsync(self.ncInstallPath)
+        self.installFinished.emit()
+        return True
+
+    def canRollback(self) -> bool:
+        return self.previousPath.is_dir()
+
+    def rollback(self) -> bool:
+        """
+        ## 回滚到上一个版本, 需在 bot 停止后于主线程调用
+            - 当前版本会成为新的 previous, 因此可以再次回滚回来
+        """
+        if not self.canRollback():
+            return False
+        try:
+            self._swap(self.previousPath)
+        except OSError as e:
+            logger.error(f"回滚 NapCat 时引发 {type(e).__name__}: {e}")
+            return False
+        logger.info(f"{'-' * 10} 成功回滚 NapCat {'-' * 10}")
+        return True
+
+    def _swap(self, incoming: Path) -> None:
+        """
+        ## 让 incoming 成为安装目录, 当前安装目录成为 previousPath
+            - 切换期间释放对安装目录及其上级目录的监听, 否则 Windows 上重命名会失败
+        """
+        with it(GetVersion).unwatched(self.ncInstallPath.parent):
+            self._swapDirectories(incoming)
+
+    def _swapDirectories(self, incoming: Path) -> None:
+        """
+        ## 重命名目录完成切换
+            - config 目录跟随安装目录, 不会因为切换版本而丢失
+            - 重命名失败时恢复原状
+        """
+        outgoing = self.ncInstallPath.with_name(f"{self.ncInstallPath.name}.outgoing")
+        trash = self.ncInstallPath.with_name(f"{self.ncInstallPath.name}.trash")
+        shutil.rmtree(outgoing, ignore_errors=True)
+
+        config = self.ncInstallPath / "config"
+        if config.is_dir():
+            self._moveConfig(config, incoming / "config")
+
+        try:
+            if self.ncInstallPath.exists():
+                self.ncInstallPath.rename(outgoing)
+            incoming.rename(self.ncInstallPath)
+        except OSError:
+            # 恢复原来的安装目录和配置
+            if outgoing.exists():
+                outgoing.rename(self.ncInstallPath)
+            if (incoming / "config").is_dir():
+                self._moveConfig(incoming / "config", self.ncInstallPath / "config")
+            raise
+
+        # 更早的版本退役, 在后台删除
+        if self.previousPath.exists():
+            shutil.rmtree(trash, ignore_errors=True)
+            self.previousPath.rename(trash)
+            threading.Thread(target=shutil.rmtree, args=(trash, True), daemon=True).start()
+        if outgoing.exists():
+            outgoing.rename(self.previousPath)
+
+    @staticmethod
+    def _moveConfig(source: Path, target: Path) -> None:
+        """
+        ## 将用户的 config 目录移动到 target
+            - target 中已有的 (包内自带的) 文件只在用户没有同名文件时保留
+        """
+        if target.exists():
+            for item in target.iterdir():
+                if not (source / item.name).exists():
+                    item.rename(source / item.name)
+            shutil.rmtree(target)
+        source.rename(target)
+
+
+class NapCatPipelineInstaller(NapCatInstallWorker):
+    """
+    ## 边下载边安装 NapCat
+        - 先用 Range 请求获取 zip 尾部的中央目录, 然后只请求成员数据部分
+        - 下载在后台线程中进行, 每个成员的数据一到达就解压进暂存目录, 总耗时接近 max(下载, 解压)
+        - 服务器不支持 Range 或 zip 无法流式解压时, 回退为先完整下载再解压
+    """
+    # 下载进度
+    downloadProgress = Signal(int)
+
+    # 下载线程与解压线程之间最多缓存的块数
+    QUEUE_SIZE = 256
+
+    def __init__(self, url: QUrl, parent=None):
+        super().__init__(it(PathFunc).tmp_path / url.fileName(), parent)
+        self.url = url
+        # 要安装的版本, url 是 latest 地址, 只接受镜像中版本一致的文件
+        self.version: Optional[str] = None
+
+    def run(self) -> None:
+        super().run()
+        self.downloadProgress.emit(0)  # 重置进度条进度
+
+    def _stage(self) -> None:
+        """
+        ## 边下载边解压到暂存目录, 不行则先下载再解压
+        """
+        url = self.url
+        # 远程版本未知时无法判断镜像中的文件是否为最新版, 不使用镜像
+        self.version = it(GetVersion).napcatRemoteVersion
+        if not githubReachable():
+            # 如果网络环境不好, 则调整下载链接
+            url = QUrl(f"https://gh.ddlc.top/{self.url.url()}")
+
+        self._prepareStaging()
+        if not self._pipelineInstall(url):
+            logger.info("无法边下载边解压, 回退为先下载再解压")
+            self._prepareStaging()
+            self.progressBarToggle.emit(0)
+            if not downloadArtifact(
+                    url, self.zipFilePath, self._onProgress, version=self.version, useMirror=self.version is not None
+            ):
+                raise ConnectionError("所有下载来源均失败")
+            self.progressBarToggle.emit(1)
+            self._extract()
+
+        self._completeStaging()
+        self.zipFilePath.unlink(missing_ok=True)
+
+    def _onProgress(self, received: int, total: int) -> None:
+        if total:
+            self.downloadProgress.emit(int((received / total) * 100))
+
+    def _pipelineInstall(self, url: QUrl) -> bool:
+        """
+        ## 依次尝试各个下载来源进行流式安装, 全部失败返回 False
+        """
+        for source, sha256 in artifactSources(url, self.version, self.version is not None):
+            try:
+                self._pipelineFrom(source, sha256)
+                return True
+            except (ZipStreamError, httpx.HTTPError, ValueError) as e:
+                logger.warning(f"从 {source} 流式安装失败, {type(e).__name__}: {e}")
+                self._prepareStaging()
+        return False
+
+    def _pipelineFrom(self, source: str, sha256: Optional[str]) -> None:
+        """
+        ## 从 source 边下载边解压到暂存目录
+        """
+        with httpx.Client(follow_redirects=True, timeout=15) as client:
+            directory, suffix, resolvedUrl, etag = self._fetchCentralDirectory(client, source)
+            extractor = StreamingExtractor(
+                directory, self.stagingPath,
+                lambda entry: self._shouldExtract(entry.name, entry.crc, entry.fileSize)
+            )
+            logger.info(f"{'-' * 10} 开始边下载边解压 NapCat, 共 {len(directory.entries)} 个文件 {'-' * 10}")
+
+            chunks: Queue = Queue(self.QUEUE_SIZE)
+            stop = threading.Event()
+            digest = hashlib.sha256()
+            producer = threading.Thread(
+                target=self._produce,
+                args=(client, resolvedUrl, etag, directory.offset, suffix, chunks, stop, digest),
+                name="NapCatPipelineDownload",
+                daemon=True,
+            )
+            self.progressBarToggle.emit(0)
+            producer.start()
+
+            def received():
+                # 取出下载线程放入的块, None 表示结束, 异常表示下载失败
+                while (item := chunks.get()) is not None:
+                    if isinstance(item, BaseException):
+                        raise item
+                    yield item
+
+            try:
+                reader = StreamReader(received())
+                extractor.extract(reader)
+                # 读完最后一个成员之后可能还有数据描述符, 需要读完并确认下载线程正常结束
+                reader.skipTo(directory.offset)
+                reader.expectEnd()
+                self._recordHashes(extractor.hashes)
+            finally:
+                stop.set()
+                producer.join()
+
+        if sha256 is not None and digest.hexdigest() != sha256:
+            raise ZipStreamError(f"sha256 ({digest.hexdigest()}) 与清单 ({sha256}) 不符")
+
+        it(ArtifactCache).store(self.zipFilePath, self.url.fileName(), digest.hexdigest(), self.version)
+        logger.info(f"{'-' * 10} 边下载边解压 NapCat 完成 {'-' * 10}")
+
+    @staticmethod
+    def _fetchCentralDirectory(client: "httpx.Client", url: str):
+        """
+        ## 通过 Range 请求获取中央目录
+            - 返回 (中央目录, 从中央目录开始到文件末尾的字节, 重定向后的地址, ETag)
+        """
+        response = client.get(url, headers={"Range": f"bytes=-{EOCD_SEARCH_SIZE}"})
+        response.raise_for_status()
+        if response.status_code != 206 or "content-range" not in response.headers:
+            raise ZipStreamError("服务器不支持 Range 请求")
+
+        total = int(response.headers["content-range"].rsplit("/", 1)[1])
+        tail = response.content
+        tailOffset = total - len(tail)
+        cdOffset, cdSize, count = locateCentralDirectory(tail, tailOffset)
+
+        # 中央目录超出了尾部数据, 再请求一次缺少的部分
+        resolvedUrl = str(response.url)
+        etag = response.headers.get("etag")
+        if cdOffset < tailOffset:
+            response = client.get(resolvedUrl, headers={"Range": f"bytes={cdOffset}-{tailOffset - 1}"})
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise ZipStreamError("服务器不支持 Range 请求")
+            tail = response.content + tail
+            tailOffset = cdOffset
+
+        suffix = tail[cdOffset - tailOffset:]
+        return parseCentralDirectory(suffix[:cdSize], cdOffset, count), suffix, resolvedUrl, etag
+
+    def _produce(
+            self, client: "httpx.Client", url: str, etag: Optional[str], length: int,
+            suffix: bytes, chunks: Queue, stop: threading.Event, digest
+    ) -> None:
+        """
+        ## 下载线程: 请求成员数据部分, 同时写入 tmp 中的 zip 供缓存和分享
+        """
+        def put(item) -> bool:
+            # 解压线程出错后不再阻塞
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.2)
+                    return True
+                except Full:
+                    continue
+            return False
+
+        headers = {"Range": f"bytes=0-{length - 1}"}
+        if etag:
+            # 文件在两次请求之间发生变化时服务器会返回 200, 避免拼接出错误的包
+            headers["If-Range"] = etag
+
+        limiter = it(BandwidthShaper).createLimiter()
+        try:
+            with client.stream("GET", url, headers=headers) as response, open(self.zipFilePath, "wb") as file:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise ZipStreamError("服务器未按 Range 返回数据, 文件可能已更新")
+                for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    if limiter is not None:
+                        limiter.consume(len(chunk))
+                    file.write(chunk)
+                    digest.update(chunk)
+                    if not put(chunk):
+                        return
+                    self._onProgress(file.tell(), length)
+                file.write(suffix)
+                digest.update(suffix)
+            put(None)
+        except Exception as e:
+            put(e)
+
 
 class QQDownloadCard(DownloadCardBase):
     """
@@ -368,7 +756,7 @@ class QQDownloadCard(DownloadCardBase):
         # 调整控件
         self.installButton.clicked.connect(self._installButtonSlot)
         self.downloader.downloadProgress.connect(self.installButton.setValue)
-        self.downloader.finished.connect(self._install)
+        self.downloader.downloadFinish.connect(self._install)
         self.nameLabel.setText("NTQQ")
         self.iconLabel.setImage(QPixmap(NCDIcon.QQ.path()))
         self.iconLabel.scaledToWidth(100)
@@ -379,6 +767,9 @@ class QQDownloadCard(DownloadCardBase):
             "so you will need to install it."
         ))
         self.shareButton.clicked.connect(self._shareButtonSlot)
+        self.openInstallPathButton.clicked.connect(
+            lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(str(it(PathFunc).getQQPath())))
+        )
 
         # 设置布局
         self.infoLayout.addWidget(self.versionWidget)
@@ -389,6 +780,7 @@ class QQDownloadCard(DownloadCardBase):
         self.infoLayout.addStretch(1)
         self.versionWidget.vBoxLayout.setContentsMargins(0, 0, 8, 0)
 
+        it(GetVersion).QQLocalVersionChanged.connect(self.checkInstall)
         self.checkInstall()
         self._setLayout()
         self._onTimer()
@@ -412,16 +804,12 @@ class QQDownloadCard(DownloadCardBase):
             # 解析失败跳过本次解析
             return
 
-    @timer(3000)
-    def checkInstall(self) -> None:
+    def checkInstall(self, *_) -> None:
         """
-        ## 检查是否安装
+        ## 检查是否安装, 本地版本变化时调用
         """
         if not it(GetVersion).QQLocalVersion is None:
             # 如果获取得到版本则表示已安装
-            self.openInstallPathButton.clicked.connect(
-                lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(str(it(PathFunc).getQQPath())))
-            )
             self.installButton.hide()
             self.openInstallPathButton.show()
             self.isInstall = True
@@ -490,13 +878,11 @@ class QQDownloadCard(DownloadCardBase):
         """
         self.installButton.setEnabled(True)
         self.installButton.setProgressBarState(False)
-        if exit_status == QProcess.ExitStatus.NormalExit and not (QQPath := it(PathFunc).getQQPath()) is None:
+        if exit_status == QProcess.ExitStatus.NormalExit and it(PathFunc).getQQPath() is not None:
             # 如果进程正常退出, 则检查一次路径是否存在QQ, 存在则发送成功, 否则失败
+            # 打开路径按钮在初始化时已经连接
             self.installButton.hide()
             self.openInstallPathButton.show()
-            self.openInstallPathButton.clicked.connect(
-                lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(str(QQPath)))
-            )
         else:
             logger.error(f"QQ installation failed, exit code: {exit_code}, exit status: {exit_status}")
             self.installButton.setTestVisible(True)
@@ -511,6 +897,7 @@ class QQDownloadCard(DownloadCardBase):
         """
         ## 分享按钮的槽函数
         """
+        ResourceBundle.BANNER.register()
         shareView = FlyoutView(
             title=self.tr("What are you doing ?"),
             content=self.tr(
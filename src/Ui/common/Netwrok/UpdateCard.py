@@ -9,17 +9,19 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout
 from creart import it
 from qfluentwidgets import (
     SimpleCardWidget, ImageLabel, TitleLabel, HyperlinkLabel, FluentIcon, CaptionLabel, BodyLabel, setFont,
-    TransparentToolButton, Flyout, VerticalSeparator, FlyoutViewBase, FlyoutAnimationType, MessageBox
+    TransparentToolButton, Flyout, VerticalSeparator, FlyoutViewBase, FlyoutAnimationType, MessageBox,
+    ToolTipFilter
 )
 
 from src.Core import timer
 from src.Core.Config import cfg
 from src.Core.GetVersion import GetVersion
-from src.Core.NetworkFunc import Urls, NapCatDownloader
+from src.Core.NetworkFunc import Urls
 from src.Core.PathFunc import PathFunc
+from src.Ui.ResourceBundle import ResourceBundle
 from src.Ui.common.InfoCard.UpdateLogCard import UpdateLogCard
 from src.Ui.common.Netwrok.DownloadButton import ProgressBarButton
-from src.Ui.common.Netwrok.DownloadCard import NapCatInstallWorker
+from src.Ui.common.Netwrok.DownloadCard import NapCatPipelineInstaller
 
 
 class UpdateCardBase(SimpleCardWidget):
@@ -139,17 +141,24 @@ class NapCatUpdateCard(UpdateCardBase):
         self.ncInstallPath = it(PathFunc).getNapCatPath()
 
         # 创建控件
-        self.downloader = NapCatDownloader(Urls.NAPCAT_DOWNLOAD.value, it(PathFunc).tmp_path)
+        self.installer = NapCatPipelineInstaller(Urls.NAPCAT_DOWNLOAD.value)
         self.versionWidget = InfoWidget(self.tr("Version"), self.tr("Unknown"), self)
         self.platformWidget = InfoWidget(self.tr("Platform"), cfg.get(cfg.PlatformType), self)
         self.systemWidget = InfoWidget(self.tr("System"), cfg.get(cfg.SystemType), self)
 
         # 调整控件
         self.updateButton.clicked.connect(self._updateButtonSlot)
-        self.downloader.progressBarToggle.connect(self.switchProgressBar)
-        self.downloader.downloadProgress.connect(self.updateButton.setValue)
-        self.downloader.errorFinsh.connect(self.showErrorTips)
-        self.downloader.downloadFinish.connect(self._downloadFinishSlot)
+        self.installer.progressBarToggle.connect(self.switchProgressBar)
+        self.installer.downloadProgress.connect(self.updateButton.setValue)
+        self.installer.extractProgress.connect(self.updateButton.setValue)
+        self.installer.errorFinished.connect(self.showErrorTips)
+        self.installer.installFinished.connect(self._installationFinished)
+        self.installer.staged.connect(self._stagedSlot)
+        self.rollbackButton = TransparentToolButton(FluentIcon.HISTORY, self)
+        self.rollbackButton.setToolTip(self.tr("Roll back to the previous version"))
+        self.rollbackButton.installEventFilter(ToolTipFilter(self.rollbackButton))
+        self.rollbackButton.clicked.connect(self._rollbackButtonSlot)
+        self.rollbackButton.setVisible(self.installer.canRollback())
         self.nameLabel.setText("NapCatQQ")
         self.companyLabel.setUrl(Urls.NAPCATQQ_REPO.value)
         self.companyLabel.setText(self.tr("Project repositories"))
@@ -167,6 +176,7 @@ class NapCatUpdateCard(UpdateCardBase):
         # 调用方法
         self._onTimer()
         self._setLayout()
+        self.buttonLayout.insertWidget(0, self.rollbackButton)
 
     @Slot()
     def _updateButtonSlot(self):
@@ -175,42 +185,86 @@ class NapCatUpdateCard(UpdateCardBase):
         """
         from src.Ui.BotListPage.BotListWidget import BotListWidget
         from src.Ui.HomePage.Home import HomeWidget
+        from src.Ui.MainWindow import MainWindow
+
+        it(MainWindow).ensurePage(BotListWidget)
         # 检查是否有 bot 正在运行, 如果有则提示
         if it(BotListWidget).getBotIsRun():
             box = MessageBox(
-                self.tr("Stop NapCat"),
+                self.tr("Restart NapCat"),
                 self.tr(
                     "A robot sample has been detected to be running, "
-                    "and you will need to stop all robots to update NapCat"
+                    "running robots will be restarted once the new version is ready"
                 ),
                 it(HomeWidget)
             )
             if not box.exec():
                 return
-            it(BotListWidget).stopAllBot()
 
-        # 开始下载操作
-        self.downloader.start()
+        # 开始下载并组装新版, bot 在此期间继续运行
+        self.installer.start()
 
-    @Slot(bool)
-    def _downloadFinishSlot(self):
+    @Slot()
+    def _stagedSlot(self):
         """
-        ## 下载完成后的安装操作
+        ## 新版组装完成, 停止 bot 后切换版本再重新启动, bot 只中断一次重启的时间
         """
-        self.installWorker = NapCatInstallWorker(it(PathFunc).tmp_path / self.downloader.url.fileName())
-        self.installWorker.installFinished.connect(self._installationFinished)
-        self.installWorker.errorFinished.connect(self.showErrorTips)
-        self.installWorker.progressBarToggle.connect(self.switchProgressBar)
-        self.installWorker.start()
+        from src.Ui.BotListPage.BotListWidget import BotListWidget
+        from src.Ui.MainWindow import MainWindow
+
+        it(MainWindow).ensurePage(BotListWidget)
+        bots = it(BotListWidget).stopRunningBots()
+        self.installer.activate()
+        it(BotListWidget).startBots(bots)
+
+    @Slot()
+    def _rollbackButtonSlot(self):
+        """
+        ## 回滚按钮槽函数
+        """
+        from src.Ui.BotListPage.BotListWidget import BotListWidget
+        from src.Ui.HomePage.Home import HomeWidget
+        from src.Ui.MainWindow import MainWindow
+
+        it(MainWindow).ensurePage(BotListWidget)
+        box = MessageBox(
+            self.tr("Roll back NapCat"),
+            self.tr("Switch back to the previous NapCat version? Running robots will be restarted"),
+            it(HomeWidget)
+        )
+        if not box.exec():
+            return
+
+        bots = it(BotListWidget).stopRunningBots()
+        success = self.installer.rollback()
+        it(BotListWidget).startBots(bots)
+
+        if success:
+            it(HomeWidget).showSuccess(self.tr("Rollback successful"), self.tr("NapCat has been switched back"))
+            self._refreshUpdateState()
+        else:
+            it(HomeWidget).showError(
+                self.tr("Rollback failed"), self.tr("Please go to Setup > log for details")
+            )
 
     @Slot(bool)
     def _installationFinished(self) -> None:
         """
         ## 下载完成后的安装操作
         """
+        from src.Ui.HomePage.Home import HomeWidget
         self.updateButton.hide()
         self.updateLogButton.hide()
         self.latestVersionLabel.show()
+        self.rollbackButton.setVisible(self.installer.canRollback())
+
+        # 提示增量更新节省的写入量
+        it(HomeWidget).showSuccess(
+            self.tr("Update successful!"),
+            self.tr("Wrote {0:.2f} MB, skipped {1:.2f} MB of unchanged files").format(
+                self.installer.bytesWritten / 1024 ** 2, self.installer.bytesSaved / 1024 ** 2
+            )
+        )
 
     @Slot()
     def _updateLogButtonSlot(self):
@@ -229,7 +283,14 @@ class NapCatUpdateCard(UpdateCardBase):
     @timer(86_400_000)
     def checkForUpdates(self):
         """
-        ## 检查是否有更新
+        ## 检查是否有更新, 每天一次
+            - timer 每次调用都会创建新的计时器, 只在 _onTimer 中调用一次, 其他地方使用 _refreshUpdateState
+        """
+        self._refreshUpdateState()
+
+    def _refreshUpdateState(self):
+        """
+        ## 根据本地和远程版本刷新更新状态
         """
         local_version = it(GetVersion).napcatLocalVersion
         remote_version = it(GetVersion).napcatRemoteVersion
@@ -297,6 +358,7 @@ class UpdateFlyoutView(FlyoutViewBase):
         super().__init__(parent)
 
         # 创建属性
+        ResourceBundle.BANNER.register()
         self.logTest = log
         self.images = [f":1920_540/image/1920_540/image_{index}.png" for index in range(1, 7)]
 
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+## 局域网产物镜像测试
+    - 在本机启动 ArtifactServer 作为镜像, 另一个 http.server 作为原地址
+    - 检查 downloadArtifact 优先使用镜像, 以及 sha256 或版本不符时回退到原地址
+"""
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+
+import pytest
+
+pytest.importorskip("PySide6")
+pytest.importorskip("creart")
+pytest.importorskip("loguru")
+pytest.importorskip("qfluentwidgets")
+pytest.importorskip("httpx")
+
+from PySide6.QtCore import QUrl  # noqa: E402
+
+import src.Core.NetworkFunc as NetworkFunc  # noqa: E402
+from src.Core.ArtifactCache import ArtifactServer  # noqa: E402
+from src.Core.Config import cfg  # noqa: E402
+
+NAME = "NapCat.Shell.zip"
+ORIGIN_DATA = b"origin " * 4096
+MIRROR_DATA = b"mirror " * 4096
+
+
+class _Cache:
+    """
+    ## 只提供 ArtifactServer 需要的 manifest/get, 内容由测试指定
+    """
+
+    def __init__(self, root: Path, data: bytes, sha256: str, version: Optional[str]) -> None:
+        self.root = root
+        (root / NAME).write_bytes(data)
+        self.entry = {"sha256": sha256, "size": len(data), "version": version}
+
+    def manifest(self) -> Dict[str, Dict]:
+        return {NAME: dict(self.entry)}
+
+    def get(self, name: str) -> Optional[Path]:
+        return self.root / name if name == NAME else None
+
+
+class _StoreRecorder:
+    """
+    ## 代替 ArtifactCache, 记录 downloadArtifact 放入缓存的内容
+    """
+
+    def __init__(self) -> None:
+        self.stored = []
+
+    def store(self, file: Path, name: str, sha256: str, version: Optional[str] = None) -> str:
+        self.stored.append((name, sha256, version))
+        return sha256
+
+
+class _OriginHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(ORIGIN_DATA)))
+        self.end_headers()
+        self.wfile.write(ORIGIN_DATA)
+
+    def log_message(self, *_) -> None:
+        pass
+
+
+@pytest.fixture
+def origin():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OriginHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield QUrl(f"http://127.0.0.1:{server.server_address[1]}/latest/{NAME}")
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    from src.Core.ArtifactCache import ArtifactCache
+
+    recorder = _StoreRecorder()
+    realIt = NetworkFunc.it
+    monkeypatch.setattr(NetworkFunc, "it", lambda cls: recorder if cls is ArtifactCache else realIt(cls))
+    return recorder
+
+
+@pytest.fixture
+def mirror(tmp_path, monkeypatch):
+    """
+    ## 启动镜像, 返回设置镜像内容的函数
+    """
+    servers = []
+
+    def start(data: bytes, sha256: str, version: Optional[str] = None) -> None:
+        server = ArtifactServer(_Cache(tmp_path, data, sha256, version), 0)
+        server.start()
+        servers.append(server)
+        monkeypatch.setattr(cfg.ArtifactMirror, "value", f"http://127.0.0.1:{server.server_port}")
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_download_from_mirror(tmp_path, origin, recorder, mirror) -> None:
+    mirror(MIRROR_DATA, _sha256(MIRROR_DATA), "v4.1.0")
+    target = tmp_path / "download.zip"
+
+    assert NetworkFunc.downloadArtifact(origin, target, version="v4.1.0")
+    assert target.read_bytes() == MIRROR_DATA
+    assert recorder.stored == [(NAME, _sha256(MIRROR_DATA), "v4.1.0")]
+
+
+def test_sha256_mismatch_falls_back_to_origin(tmp_path, origin, recorder, mirror) -> None:
+    # 镜像清单中的 sha256 与实际内容不符
+    mirror(MIRROR_DATA, _sha256(b"something else"))
+    target = tmp_path / "download.zip"
+
+    assert NetworkFunc.downloadArtifact(origin, target)
+    assert target.read_bytes() == ORIGIN_DATA
+    assert recorder.stored == [(NAME, _sha256(ORIGIN_DATA), None)]
+
+
+def test_version_mismatch_skips_mirror(tmp_path, origin, recorder, mirror) -> None:
+    mirror(MIRROR_DATA, _sha256(MIRROR_DATA), "v4.0.0")
+
+    assert NetworkFunc.artifactSources(origin, "v4.1.0") == [(origin.url(), None)]
+    target = tmp_path / "download.zip"
+    assert NetworkFunc.downloadArtifact(origin, target, version="v4.1.0")
+    assert target.read_bytes() == ORIGIN_DATA
+
+
+def test_unreadable_manifest_skips_mirror(origin, monkeypatch) -> None:
+    # 没有服务监听的端口, 清单读取失败时不能使用未经校验的镜像
+    monkeypatch.setattr(cfg.ArtifactMirror, "value", "http://127.0.0.1:9")
+    assert NetworkFunc.artifactSources(origin) == [(origin.url(), None)]
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+## 机器人批量导入/导出测试
+    - 只有 QQID 的最简记录使用默认值补全
+    - 结构错误的记录只记为该条的错误, 不影响其他记录
+    - JSON 数组中无法解析的元素只记为该元素的错误, 之后的元素继续解析
+    - CSV / JSON / JSONL 导出后再导入得到相同的配置
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6")
+pytest.importorskip("creart")
+pytest.importorskip("loguru")
+pytest.importorskip("qfluentwidgets")
+pytest.importorskip("pydantic")
+# BotRepository 依赖 PathFunc, 后者读取 Windows 注册表
+pytest.importorskip("winreg")
+
+from src.Core.Config.BotRepository import dumpConfig, mergeDefaults  # noqa: E402
+from src.Core.Config.ConfigModel import Config, DEFAULT_CONFIG  # noqa: E402
+from src.Core.Config import FleetIO  # noqa: E402
+from src.Core.Config.FleetIO import FleetFormatError, exportFleet, importFleet  # noqa: E402
+
+
+def _writeJsonl(path: Path, records) -> Path:
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n", encoding="utf-8")
+    return path
+
+
+def _config(qqid: str) -> Config:
+    record = {"bot": {"name": f"bot{qqid}", "QQID": qqid}, "connect": {"http": {"enable": True, "port": "3000"}}}
+    return Config(**mergeDefaults(record, DEFAULT_CONFIG))
+
+
+def test_minimal_record(tmp_path) -> None:
+    report = importFleet(_writeJsonl(tmp_path / "bots.jsonl", [{"bot": {"QQID": "123456"}}]))
+
+    assert report.errors == []
+    assert len(report.configs) == 1
+    config = report.configs[0]
+    assert config.bot.QQID == "123456"
+    assert config.connect.ws.port == "3001"
+    assert config.connect.reverseWs.urls == []
+
+
+@pytest.mark.parametrize("record, message", [
+    ({"bot": "x"}, "bot 必须是对象"),
+    ({"bot": {"QQID": "1"}, "connect": None}, "connect 必须是对象"),
+    ({"bot": {"QQID": "1"}, "connect": {"http": []}}, "connect.http 必须是对象"),
+    ({"bot": {"QQID": "1"}, "advanced": {"GroupLocalTime": 1}}, "advanced.GroupLocalTime 必须是对象"),
+    (["not", "an", "object"], "记录必须是对象"),
+])
+def test_malformed_record(tmp_path, record, message) -> None:
+    path = _writeJsonl(tmp_path / "bots.jsonl", [{"bot": {"QQID": "10001"}}, record, {"bot": {"QQID": "10002"}}])
+    report = importFleet(path)
+
+    assert [config.bot.QQID for config in report.configs] == ["10001", "10002"]
+    assert len(report.errors) == 1
+    assert report.errors[0].row == 2
+    assert report.errors[0].message == message
+
+
+def test_invalid_values(tmp_path) -> None:
+    path = tmp_path / "bots.jsonl"
+    path.write_text(
+        '{"bot": {"QQID": ""}}\n'
+        '{"bot": {"QQID": "10001"}, "connect": {"http": {"port": "abc"}}}\n'
+        "{broken\n"
+        '{"bot": {"QQID": "10001"}}\n'
+        '{"bot": {"QQID": "10001"}}\n',
+        encoding="utf-8"
+    )
+    report = importFleet(path)
+
+    assert [config.bot.QQID for config in report.configs] == ["10001"]
+    assert [error.row for error in report.errors] == [1, 2, 3, 5]
+    assert report.errors[1].qqid == "10001"
+    assert report.errors[2].message.startswith("JSON 解析失败")
+    assert report.errors[3].message == "QQID 在文件中重复"
+
+
+@pytest.mark.parametrize("readSize", [7, FleetIO.READ_SIZE])
+def test_json_array_resync(tmp_path, monkeypatch, readSize) -> None:
+    monkeypatch.setattr(FleetIO, "READ_SIZE", readSize)
+    path = tmp_path / "bots.json"
+    path.write_text(
+        '[{"bot": {"QQID": "10001"}},\n'
+        ' {"bot": {"QQID": "10002", "name": "a, b}"} "connect": {}},\n'
+        ' {"bot": {"QQID": tru}},\n'
+        ' {"bot": {"QQID": "10003"}}\n'
+        ']\n',
+        encoding="utf-8"
+    )
+    report = importFleet(path)
+
+    assert [config.bot.QQID for config in report.configs] == ["10001", "10003"]
+    assert [error.row for error in report.errors] == [2, 3]
+    assert all(error.message.startswith("JSON 解析失败") for error in report.errors)
+
+
+def test_json_array_truncated(tmp_path) -> None:
+    path = tmp_path / "bots.json"
+    path.write_text('[{"bot": {"QQID": "10001"}}, {"bot": {"QQ', encoding="utf-8")
+
+    with pytest.raises(FleetFormatError):
+        importFleet(path)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".json", ".jsonl"])
+def test_round_trip(tmp_path, suffix) -> None:
+    configs = [_config(str(10000 + index)) for index in range(300)]
+    path = tmp_path / f"bots{suffix}"
+
+    assert exportFleet(configs, path) == len(configs)
+    report = importFleet(path)
+
+    assert report.errors == []
+    assert [dumpConfig(config) for config in report.configs] == [dumpConfig(config) for config in configs]
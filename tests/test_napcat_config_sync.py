@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+## NapCat 配置同步测试
+    - 新建/更新/未变化三种动作, 未变化的文件依靠哈希缓存跳过读取
+    - dryRun 只生成报告, 不写入任何文件
+    - 300 个机器人的同步在毫秒级完成
+"""
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6")
+pytest.importorskip("creart")
+pytest.importorskip("loguru")
+pytest.importorskip("qfluentwidgets")
+pytest.importorskip("pydantic")
+# PathFunc 读取 Windows 注册表
+pytest.importorskip("winreg")
+
+from src.Core.Config.BotRepository import mergeDefaults  # noqa: E402
+from src.Core.Config.ConfigModel import Config, DEFAULT_CONFIG  # noqa: E402
+from src.Core.NapCatConfigSync import NapCatConfigSync, SyncAction, renderFiles  # noqa: E402
+
+# 300 个机器人的同步时间上限 (秒)
+SYNC_LIMIT = 0.5
+
+
+def _config(qqid: str, wsPort: str = "3001") -> Config:
+    return Config(**mergeDefaults({"bot": {"QQID": qqid}, "connect": {"ws": {"port": wsPort}}}, DEFAULT_CONFIG))
+
+
+def _actions(report) -> list:
+    return [(entry.path.name, entry.action) for entry in report.entries]
+
+
+@pytest.fixture
+def configPath(tmp_path) -> Path:
+    return tmp_path / "config"
+
+
+def test_create_then_unchanged(configPath, monkeypatch) -> None:
+    configs = [_config("10001"), _config("10002")]
+    sync = NapCatConfigSync(configPath)
+
+    report = sync.sync(configs)
+    assert {entry.action for entry in report.entries} == {SyncAction.CREATE}
+    for config in configs:
+        for name, data in renderFiles(config).items():
+            assert (configPath / name).read_bytes() == data
+
+    # 文件的 stat 签名没有变化, 第二次同步不读取文件内容
+    reads = []
+    readBytes = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda path: reads.append(path) or readBytes(path))
+    report = sync.sync(configs)
+    assert {entry.action for entry in report.entries} == {SyncAction.UNCHANGED}
+    assert report.changed == []
+    assert reads == []
+
+
+def test_update(configPath) -> None:
+    sync = NapCatConfigSync(configPath)
+    sync.sync([_config("10001")])
+    oneBotPath = configPath / "onebot11_10001.json"
+    old = oneBotPath.read_bytes()
+
+    report = sync.sync([_config("10001", wsPort="3002")])
+
+    assert _actions(report) == [
+        ("onebot11_10001.json", SyncAction.UPDATE),
+        ("napcat_10001.json", SyncAction.UNCHANGED),
+    ]
+    entry = report.changed[0]
+    assert entry.old == old
+    assert entry.new == oneBotPath.read_bytes()
+    assert '"port": "3002"' in oneBotPath.read_text("utf-8")
+    assert f"--- {oneBotPath}" in report.diff()
+
+
+def test_external_edit(configPath) -> None:
+    config = _config("10001")
+    NapCatConfigSync(configPath).sync([config])
+    oneBotPath = configPath / "onebot11_10001.json"
+    oneBotPath.write_text("{}", encoding="utf-8")
+
+    # 新的实例没有哈希缓存, 按文件内容判断
+    report = NapCatConfigSync(configPath).sync([config])
+
+    assert _actions(report)[0] == ("onebot11_10001.json", SyncAction.UPDATE)
+    assert oneBotPath.read_bytes() == renderFiles(config)["onebot11_10001.json"]
+
+
+def test_dry_run(configPath) -> None:
+    sync = NapCatConfigSync(configPath)
+
+    report = sync.sync([_config("10001")], dryRun=True)
+    assert report.dryRun
+    assert {entry.action for entry in report.entries} == {SyncAction.CREATE}
+    assert "+++ " in report.diff()
+    assert not configPath.exists()
+
+    sync.sync([_config("10001")])
+    before = {path.name: path.read_bytes() for path in configPath.iterdir()}
+    report = sync.sync([_config("10001", wsPort="3002")], dryRun=True)
+    assert [entry.action for entry in report.changed] == [SyncAction.UPDATE]
+    assert {path.name: path.read_bytes() for path in configPath.iterdir()} == before
+
+
+def test_sync_300_bots(configPath) -> None:
+    configs = [_config(str(10000 + index)) for index in range(300)]
+    sync = NapCatConfigSync(configPath)
+    sync.sync(configs)
+
+    start = time.perf_counter()
+    report = sync.sync(configs)
+    elapsed = time.perf_counter() - start
+
+    assert len(report.filter(SyncAction.UNCHANGED)) == 600
+    assert elapsed < SYNC_LIMIT, f"同步 300 个机器人耗时 {elapsed * 1000:.0f} ms"
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+## 下载限速测试
+    - 在本机用 http.server 提供 N MiB 的数据, 按下载函数的方式分块读取并调用 limiter.consume
+    - 检查全局上限和单个下载上限下的耗时
+"""
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("PySide6")
+pytest.importorskip("creart")
+pytest.importorskip("loguru")
+
+from src.Core.RateLimiter import DownloadLimiter, TokenBucket  # noqa: E402
+
+MIB = 1024 * 1024
+# 提供的数据大小
+SIZE = 2 * MIB
+# 每次读取的块大小, 与下载函数一致
+CHUNK_SIZE = 64 * 1024
+
+
+class _Handler(BaseHTTPRequestHandler):
+    payload = bytes(SIZE)
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.payload)))
+        self.end_headers()
+        self.wfile.write(self.payload)
+
+    def log_message(self, *_) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def _download(url: str, limiter: DownloadLimiter) -> int:
+    received = 0
+    with urllib.request.urlopen(url) as response:
+        while chunk := response.read(CHUNK_SIZE):
+            limiter.consume(len(chunk))
+            received += len(chunk)
+    return received
+
+
+def _expected(size: int, rate: float) -> float:
+    """
+    ## 理论耗时, 桶初始是满的, 这部分不需要等待
+    """
+    return (size - TokenBucket(rate)._burst) / rate
+
+
+def test_global_cap_shared_by_downloads(url) -> None:
+    """
+    ## 两个下载同时进行, 总速率不超过全局上限
+    """
+    rate = 4 * MIB
+    globalBucket = TokenBucket(rate)
+    results = []
+
+    def worker() -> None:
+        results.append(_download(url, DownloadLimiter(globalBucket, 0)))
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+
+    assert results == [SIZE, SIZE]
+    expected = _expected(2 * SIZE, rate)
+    assert expected * 0.9 <= elapsed <= expected * 1.5 + 0.5
+
+
+def test_per_download_cap(url) -> None:
+    """
+    ## 全局不限速时, 单个下载受自身上限约束
+    """
+    rate = 2 * MIB
+    start = time.monotonic()
+    received = _download(url, DownloadLimiter(TokenBucket(0), rate))
+    elapsed = time.monotonic() - start
+
+    assert received == SIZE
+    expected = _expected(SIZE, rate)
+    assert expected * 0.9 <= elapsed <= expected * 1.5 + 0.5
+
+
+def test_per_download_cap_changed_during_download(url) -> None:
+    """
+    ## 下载过程中调整单个下载上限, 立即生效
+    """
+    limiter = DownloadLimiter(TokenBucket(0), 1 * MIB)
+    # 约 0.3 秒后把上限提高到 8 MiB/s, 剩余部分很快完成
+    timer = threading.Timer(0.3, limiter.setRate, args=(8 * MIB,))
+    timer.start()
+    start = time.monotonic()
+    received = _download(url, limiter)
+    elapsed = time.monotonic() - start
+    timer.join()
+
+    assert received == SIZE
+    # 始终为 1 MiB/s 时需要约 1.9 秒
+    assert elapsed < 1.0
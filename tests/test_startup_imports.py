@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+## 启动导入预算测试
+    - 在新的解释器中按 main.py 的顺序导入并执行 MainWindow.initialize(), 统计 sys.modules 中的模块数量
+    - 除主页外的页面和 httpx 应在空闲预加载或第一次使用时才导入
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+if sys.platform != "win32":
+    pytest.skip("程序只支持 Windows", allow_module_level=True)
+
+pytest.importorskip("PySide6")
+pytest.importorskip("creart")
+pytest.importorskip("loguru")
+pytest.importorskip("qfluentwidgets")
+
+# MainWindow.initialize() 结束时允许导入的模块数量, 实测约 553 个
+IMPORT_BUDGET = 600
+# 启动时不应导入的模块
+DEFERRED_MODULES = (
+    "httpx",
+    "src.Ui.AddPage",
+    "src.Ui.BotListPage",
+    "src.Ui.FixPage",
+    "src.Ui.SetupPage",
+    "src.Ui.UpdatePage",
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 与 main.py 相同的导入顺序, 不进入事件循环, 因此空闲预加载不会开始
+STARTUP_SCRIPT = f"""
+import json
+import os
+import sys
+
+from src.Core.StartupTracer import tracer
+from src.Core import stdout
+from src.Core.Config import cfg
+from src.Ui.MainWindow import MainWindow
+from qfluentwidgets import FluentTranslator
+from PySide6.QtCore import QTranslator, QLocale
+from PySide6.QtWidgets import QApplication
+from creart import it
+from src.Ui.ResourceBundle import ResourceBundle
+
+app = QApplication(sys.argv)
+ResourceBundle.CORE.register()
+from src.Core.StallWatchdog import StallWatchdog
+
+# 不弹出 EULA 对话框
+MainWindow.showEULA = lambda self: None
+it(MainWindow).initialize()
+print(json.dumps({{
+    "modules": len(sys.modules),
+    "loaded": [name for name in {DEFERRED_MODULES!r} if name in sys.modules],
+}}), flush=True)
+# 主页启动的后台线程仍在运行, 直接退出, 避免销毁 QThread 时中止进程
+os._exit(0)
+"""
+
+
+@pytest.fixture(scope="module")
+def startup(tmp_path_factory):
+    """
+    ## 在临时目录中启动, 配置和日志不写入仓库
+    """
+    env = dict(os.environ, PYTHONPATH=str(ROOT), QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT], cwd=tmp_path_factory.mktemp("startup"), env=env,
+        capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_budget(startup) -> None:
+    assert startup["modules"] <= IMPORT_BUDGET, f"已导入 {startup['modules']} 个模块, 超出预算 {IMPORT_BUDGET}"
+
+
+def test_deferred_modules(startup) -> None:
+    assert startup["loaded"] == []